@@ -0,0 +1,178 @@
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from data_cache import local_index_to_epoch
+
+
+@dataclass
+class AlertConfig:
+    """Thresholds for wallet token alerts"""
+    price_drop_threshold: float = 0.20  # 20% drop over the window
+    liquidity_drop_threshold: float = 0.30  # 30% of liquidity pulled
+    volume_spike_threshold: float = 3.0  # 3x the window's mean volume
+    cooldown: float = 900.0  # seconds before the same alert may fire again
+    hysteresis: float = 0.25  # re-arm once back below 75% of the threshold
+
+
+class RollingWindow:
+    """Per-token ring buffer over the last ``window`` seconds, updated O(1) per tick
+
+    Ticks are folded into ``resolution``-second slots the same way the 5m
+    rollups in the cache are built: a slot keeps the first and last price and
+    liquidity and the last volume seen. A running volume sum over the live
+    slots gives the window mean without rescanning it, and the oldest and
+    newest live slots give the window's first and last values.
+    """
+
+    def __init__(self, window: float = 86400, resolution: float = 300):
+        self.resolution = resolution
+        self.size = max(1, int(window // resolution))
+        self._bucket = [None] * self.size
+        self._open = [0.0] * self.size
+        self._close = [0.0] * self.size
+        self._volume = [0.0] * self.size
+        self._open_liquidity = [0.0] * self.size
+        self._liquidity = [0.0] * self.size
+        self._head: Optional[int] = None  # oldest live bucket
+        self._tail: Optional[int] = None  # newest live bucket
+        self._volume_sum = 0.0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def _evict(self, bucket: int):
+        slot = bucket % self.size
+        if self._bucket[slot] == bucket:
+            self._bucket[slot] = None
+            self._volume_sum -= self._volume[slot]
+            self._count -= 1
+
+    def advance(self, timestamp: float):
+        """Drop slots that have fallen out of the window ending at ``timestamp``"""
+        if self._tail is None:
+            return
+        oldest = int(timestamp // self.resolution) - self.size + 1
+        if oldest <= self._head:
+            return
+        # Each slot is visited at most once per lap, however long the gap
+        for bucket in range(self._head, min(oldest, self._head + self.size)):
+            self._evict(bucket)
+        if self._count == 0:
+            self._head = self._tail = None
+            self._volume_sum = 0.0
+            return
+        self._head = max(self._head, oldest)
+        while self._bucket[self._head % self.size] != self._head:
+            self._head += 1
+
+    def push(self, timestamp: float, price: float, volume: float, liquidity: float):
+        bucket = int(timestamp // self.resolution)
+        if self._tail is not None and bucket < self._tail:
+            # Late tick: fold it into the newest slot rather than rewrite history
+            bucket = self._tail
+        self.advance(timestamp)
+        slot = bucket % self.size
+        if self._bucket[slot] != bucket:
+            self._bucket[slot] = bucket
+            self._open[slot] = price
+            self._open_liquidity[slot] = liquidity
+            self._volume[slot] = 0.0
+            self._count += 1
+            if self._head is None:
+                self._head = bucket
+        self._close[slot] = price
+        self._volume_sum += volume - self._volume[slot]
+        self._volume[slot] = volume
+        self._liquidity[slot] = liquidity
+        self._tail = bucket
+
+    def seed(self, candles):
+        """Load history from an OHLCV frame (cold start only)"""
+        epochs = local_index_to_epoch(candles.index).tolist() if len(candles) else []
+        for epoch, open_, close, volume, liquidity in zip(
+            epochs, candles['open'], candles['close'], candles['volume'], candles['liquidity']
+        ):
+            self.push(epoch, open_, volume, liquidity)
+            self.push(epoch, close, volume, liquidity)
+
+    @property
+    def first_price(self) -> Optional[float]:
+        return self._open[self._head % self.size] if self._count else None
+
+    @property
+    def last_price(self) -> Optional[float]:
+        return self._close[self._tail % self.size] if self._count else None
+
+    @property
+    def first_liquidity(self) -> Optional[float]:
+        return self._open_liquidity[self._head % self.size] if self._count else None
+
+    @property
+    def last_liquidity(self) -> Optional[float]:
+        return self._liquidity[self._tail % self.size] if self._count else None
+
+    @property
+    def last_volume(self) -> Optional[float]:
+        return self._volume[self._tail % self.size] if self._count else None
+
+    @property
+    def mean_volume(self) -> Optional[float]:
+        return self._volume_sum / self._count if self._count else None
+
+
+@dataclass
+class _GateState:
+    active: bool = False
+    last_fired: float = float('-inf')
+
+
+class AlertGate:
+    """Cooldown and hysteresis per (token, alert type)
+
+    An alert fires when its magnitude crosses the threshold while the gate is
+    armed. It then stays latched, however long the condition holds, until
+    the magnitude falls back below ``threshold * (1 - hysteresis)``. A
+    re-armed gate still waits out ``cooldown`` seconds from the last firing.
+    """
+
+    def __init__(self, cooldown: float = 900.0, hysteresis: float = 0.25):
+        self.cooldown = cooldown
+        self.hysteresis = hysteresis
+        self._states: Dict[Tuple[str, str], _GateState] = {}
+        self.suppressed = 0
+
+    def should_fire(self, token_address: str, alert_type: str, magnitude: float,
+                    threshold: float, now: float) -> bool:
+        # NaN compares false against any threshold; a missing reading (e.g.
+        # liquidity on a backfilled candle) must neither fire nor re-arm
+        if not math.isfinite(magnitude):
+            return False
+        state = self._states.get((token_address, alert_type))
+        if state is None:
+            if magnitude <= threshold:
+                return False
+            state = self._states[(token_address, alert_type)] = _GateState()
+
+        if state.active:
+            if magnitude < threshold * (1 - self.hysteresis):
+                state.active = False
+            elif magnitude > threshold:
+                self.suppressed += 1
+            return False
+
+        if magnitude <= threshold:
+            return False
+        if now - state.last_fired < self.cooldown:
+            # Stays armed, so it fires once the cooldown ends if still crossed
+            self.suppressed += 1
+            return False
+        state.active = True
+        state.last_fired = now
+        return True
+
+    def forget(self, token_address: str):
+        """Drop state for a token that is no longer monitored"""
+        for key in [k for k in self._states if k[0] == token_address]:
+            del self._states[key]
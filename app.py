@@ -5,26 +5,49 @@ import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import plotly.graph_objects as go
-from textblob import TextBlob
 import solana
 from solana.rpc.api import Client
-from solana.transaction import Transaction
-from solders.system_program import TransferParams, transfer
-from solana.rpc.types import TxOpts
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+from solders.instruction import Instruction
+from solders.transaction import Transaction
 from streamlit.components.v1 import components
 from TikTokApi import TikTokApi
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 import asyncio
 import aiohttp
 import time
 import sqlite3
 from datetime import datetime, timedelta
 import numpy as np
-from scipy.signal import find_peaks
-import talib
 import json
+import logging
+import os
+import threading
 from typing import Dict, List
 from wallet_component import wallet_connect, buy_token, SolanaWallet
+from background_runtime import BackgroundRuntime
+from dexscreener_client import DexscreenerClient, most_liquid_pair
+from symbol_index import SymbolIndex
+from data_cache import ROLLUP_RESOLUTIONS, DataCache, local_index_to_epoch
+from candles import CANDLE_BASE_URL, OHLCV_COLUMNS, fetch_candles
+from price_feed import PriceFeed
+from trigger_book import TriggerBook
+from solana_rpc import DEFAULT_RPC_URL, TOKEN_2022_PROGRAM_ID, TOKEN_PROGRAM_ID, RpcError, SolanaRPC
+from holders import Holders, aggregate_holders, decode_token_accounts, distribution_metrics, holder_accounts_params
+from holder_store import HolderSnapshotStore
+from alerts import AlertConfig, AlertGate, RollingWindow
+from risk_scoring import metrics_dict, pairs_to_frame, score_pairs, score_risk
+from pair_health import RUG_INDICATORS, detect_drops, pairs_to_health_frame, risk_factors, screen_pairs
+from patterns import PatternDetector
+from sentiment import SCORERS, SentimentService
+from social_aggregator import SocialAggregator, SocialSource, combined_social_score
+from social_store import SocialMetricsStore
+from execution import ExecutionPipeline
+from notifications import DEFAULT_ALERT_LOG, EmailSink, FileSink, Notification, NotificationDispatcher, WebhookSink
+
+logger = logging.getLogger(__name__)
 
 # Initialize session state for wallet
 if 'wallet_connected' not in st.session_state:
@@ -32,26 +55,160 @@ if 'wallet_connected' not in st.session_state:
 if 'wallet_address' not in st.session_state:
     st.session_state.wallet_address = None
 
+@st.cache_resource
+def get_background_runtime():
+    """Event-loop thread that outlives reruns; monitors and traders run here"""
+    return BackgroundRuntime()
+
+@st.cache_resource
+def get_dexscreener_client():
+    """Shared Dexscreener client, kept alive across reruns and sessions"""
+    return DexscreenerClient(loop=get_background_runtime().loop)
+
+@st.cache_resource
+def get_candle_client():
+    """Client for the OHLCV candle API; CANDLE_API_URL can point it at a local fixture"""
+    return DexscreenerClient(
+        base_url=os.environ.get("CANDLE_API_URL", CANDLE_BASE_URL),
+        ttl=60,
+        loop=get_background_runtime().loop
+    )
+
+@st.cache_resource
+def get_data_cache():
+    """Shared price cache; one connection pool and write buffer per process"""
+    return DataCache()
+
+@st.cache_resource
+def get_price_feed():
+    """Shared price feed; every trader and monitor subscribes here"""
+    return PriceFeed(get_dexscreener_client(), get_data_cache())
+
+@st.cache_resource
+def get_solana_rpc():
+    """Shared async Solana RPC pool
+
+    SOLANA_RPC_URLS lists weighted endpoints as ``url|weight|rps`` entries
+    separated by commas; SOLANA_RPC_URL sets a single node.
+    """
+    rpc = SolanaRPC(os.environ.get("SOLANA_RPC_URLS") or os.environ.get("SOLANA_RPC_URL", DEFAULT_RPC_URL))
+    get_background_runtime().submit(rpc.monitor_health(), name="rpc-health", key="rpc-health")
+    return rpc
+
+@st.cache_resource
+def get_solana_client():
+    """Blocking solana-py client for transaction building, on the pool's primary endpoint"""
+    return Client(get_solana_rpc().url)
+
+@st.cache_resource
+def get_notification_dispatcher():
+    """Alert delivery; sinks are enabled by environment variables"""
+    sinks = [FileSink(os.environ.get("ALERT_LOG_FILE") or DEFAULT_ALERT_LOG)]
+    if os.environ.get("ALERT_WEBHOOK_URL"):
+        sinks.append(WebhookSink(os.environ["ALERT_WEBHOOK_URL"]))
+    if os.environ.get("SMTP_HOST") and os.environ.get("ALERT_EMAIL_TO"):
+        sinks.append(EmailSink(
+            host=os.environ["SMTP_HOST"],
+            port=int(os.environ.get("SMTP_PORT", 587)),
+            sender=os.environ.get("ALERT_EMAIL_FROM", os.environ.get("SMTP_USER", "")),
+            recipients=os.environ["ALERT_EMAIL_TO"].split(","),
+            username=os.environ.get("SMTP_USER"),
+            password=os.environ.get("SMTP_PASSWORD")
+        ))
+    return NotificationDispatcher(sinks)
+
+@st.cache_resource
+def get_wallet_monitor():
+    """Single wallet monitor; its scan loop runs on the background runtime"""
+    return WalletMonitor(get_data_cache(), AlertConfig(), rpc=get_solana_rpc(),
+                         price_feed=get_price_feed(), notifier=get_notification_dispatcher())
+
+@st.cache_resource
+def get_sentiment_service():
+    """Shared sentiment scorer; SENTIMENT_SCORER=lexicon swaps in the fast lexicon scorer"""
+    scorer = SCORERS[os.environ.get("SENTIMENT_SCORER", "textblob")]()
+    return SentimentService(scorer, db_path=get_data_cache().db_path)
+
+@st.cache_resource
+def get_social_store():
+    """Per-ticker social cursors and rolling aggregates, kept next to the price cache"""
+    return SocialMetricsStore(get_data_cache().db_path)
+
+@st.cache_resource
+def get_holder_store():
+    """Per-mint holder snapshots and concentration history, kept next to the price cache"""
+    return HolderSnapshotStore(get_data_cache().db_path)
+
+@st.cache_resource
+def get_pattern_detector():
+    """Shared pattern engine; per-token indicator state survives reruns"""
+    return PatternDetector(get_data_cache())
+
+@st.cache_resource
+def get_execution_pipeline():
+    """Shared send path: one blockhash prefetcher and confirmation tracker for every trader"""
+    return ExecutionPipeline(get_solana_rpc())
+
+@st.cache_resource
+def get_trade_signer(wallet_address):
+    """The connected wallet's keypair, from the Solana CLI keypair file at TRADER_KEYPAIR
+
+    Background trades cannot go through the browser wallet, so they are only
+    signed when the server holds the key of the wallet that is connected.
+    """
+    path = os.environ.get("TRADER_KEYPAIR")
+    if not path:
+        return None
+    with open(os.path.expanduser(path)) as f:
+        keypair = Keypair.from_json(f.read())
+    if str(keypair.pubkey()) != wallet_address:
+        logger.warning("TRADER_KEYPAIR is not the connected wallet %s; trading disabled", wallet_address)
+        return None
+    return keypair
+
+@st.cache_resource
+def get_trader(wallet_address, _client, _wallet):
+    """One trader per wallet so levels and history survive reruns"""
+    # No DEX swap integration exists yet, so no swap builder: the trader
+    # refuses to arm or send until one is passed in
+    return AutomatedTrader(_client, _wallet, pipeline=get_execution_pipeline(),
+                           signer=get_trade_signer(wallet_address), swap=None)
+
 class MemecoinAnalyzer:
-    def __init__(self, twitter_api=None):
+    def __init__(self, twitter_api=None, dex_client=None, cache=None, sentiment=None):
         self.twitter_api = twitter_api
+        self.sentiment = sentiment or get_sentiment_service()
+        self.cache = cache
+        self.dex_client = dex_client or get_dexscreener_client()
+        self.symbol_index = SymbolIndex()
+        self._indexed_pairs = None
         
     def fetch_dexscreener_data(self):
         """Fetch memecoin data from Dexscreener"""
         try:
-            url = "https://api.dexscreener.com/latest/dex/tokens/solana"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = self.dex_client.get_json_sync("tokens/solana")
             
             if not data or 'pairs' not in data:
                 st.error("Invalid response from Dexscreener API")
                 return {'pairs': []}
                 
             return data
-        except requests.exceptions.RequestException as e:
+        except Exception as e:
             st.error(f"Error fetching data: {str(e)}")
             return {'pairs': []}
+
+    def fetch_pairs_batch(self, token_addresses: List[str], concurrency: int = 4) -> Dict[str, List[Dict]]:
+        """Fetch pairs for a watchlist of token addresses, keyed by address"""
+        try:
+            # Chunks run `concurrency` at a time, so allow one timeout per wave
+            waves = -(-len(token_addresses) // (30 * concurrency))
+            return self.dex_client.run_sync(
+                self.dex_client.get_token_pairs(token_addresses, concurrency=concurrency),
+                timeout=self.dex_client.timeout * max(waves, 1) + 5
+            )
+        except Exception as e:
+            st.error(f"Error fetching batch data: {str(e)}")
+            return {}
     
     def filter_memecoins(self, data, ticker):
         """Filter memecoins based on ticker"""
@@ -59,20 +216,13 @@ class MemecoinAnalyzer:
             if not data or not isinstance(data, dict) or 'pairs' not in data:
                 st.warning("No data available to filter")
                 return []
-                
-            memecoins = []
-            for token in data['pairs']:
-                if not isinstance(token, dict) or 'baseToken' not in token:
-                    continue
-                    
-                base_token = token.get('baseToken', {})
-                if not isinstance(base_token, dict) or 'symbol' not in base_token:
-                    continue
-                    
-                if ticker.upper() in base_token['symbol'].upper():
-                    memecoins.append(token)
+            
+            # Only re-index when a new pair list arrives, not on every keystroke
+            if data['pairs'] is not self._indexed_pairs:
+                self.symbol_index.sync(data['pairs'])
+                self._indexed_pairs = data['pairs']
                     
-            return memecoins
+            return self.symbol_index.search(ticker)
         except Exception as e:
             st.error(f"Error filtering memecoins: {str(e)}")
             return []
@@ -94,14 +244,10 @@ class MemecoinAnalyzer:
             query = f"#{ticker}"
             tweets = self.twitter_api.search_tweets(q=query, count=count, lang='en')
             
-            tweet_sentiments = []
+            tweet_sentiments = self.sentiment.score([tweet.text for tweet in tweets])
             tweet_data = []
             
-            for tweet in tweets:
-                analysis = TextBlob(tweet.text)
-                sentiment_score = analysis.sentiment.polarity
-                tweet_sentiments.append(sentiment_score)
-                
+            for tweet, sentiment_score in zip(tweets, tweet_sentiments):
                 tweet_data.append({
                     'user': tweet.user.screen_name,
                     'text': tweet.text,
@@ -124,47 +270,31 @@ class MemecoinAnalyzer:
 
     def cache_price_data(self, token_address: str, price_data: dict):
         """Cache new price data"""
-        with self.conn:
-            self.conn.execute("""
-                INSERT OR REPLACE INTO price_history 
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                token_address,
-                datetime.now(),
-                price_data['price'],
-                price_data['volume'],
-                price_data['liquidity']
-            ))
+        (self.cache or get_data_cache()).cache_price_data(token_address, price_data)
 
 class RiskManager:
     @staticmethod
     def calculate_risk_metrics(memecoin_data, sentiment_data):
         """Calculate risk metrics for the trade"""
-        try:
-            liquidity = float(memecoin_data['liquidity']['usd'])
-            volume = float(memecoin_data['volume']['h24'])
-            price_change = float(memecoin_data.get('priceChange', {}).get('h24', 0))
-            
-            risk_metrics = {
-                'liquidity_score': min(liquidity / 1000000, 1),
-                'volume_score': min(volume / 100000, 1),
-                'price_volatility': abs(price_change) / 100,
-                'sentiment_risk': abs(sentiment_data['sentiment_volatility']),
-                'social_volume': min(sentiment_data['total_tweets'] / 1000, 1)
-            }
-            
-            risk_score = (
-                (1 - risk_metrics['liquidity_score']) * 30 +
-                (1 - risk_metrics['volume_score']) * 20 +
-                risk_metrics['price_volatility'] * 25 +
-                risk_metrics['sentiment_risk'] * 15 +
-                (1 - risk_metrics['social_volume']) * 10
-            )
-            
-            return risk_score, risk_metrics
-        except Exception as e:
-            st.error(f"Error calculating risk metrics: {str(e)}")
+        scored = score_risk(pairs_to_frame([memecoin_data], [sentiment_data])).iloc[0]
+        if not scored['valid']:
+            st.error("Error calculating risk metrics: missing liquidity, volume or sentiment data")
             return 100, {}
+        return float(scored['risk_score']), metrics_dict(scored)
+
+    @staticmethod
+    def calculate_risk_metrics_batch(pairs_by_address, sentiment_by_address=None):
+        """Score every token in a batch fetch result in one vectorized pass
+
+        Returns a DataFrame indexed by token address with the sub-scores,
+        ``risk_score`` and ``valid``; tokens without pairs are left out.
+        """
+        best_pairs = {}
+        for address, pairs in pairs_by_address.items():
+            pair = most_liquid_pair(pairs)
+            if pair is not None:
+                best_pairs[address] = pair
+        return score_pairs(best_pairs, sentiment_by_address)
 
 # Streamlit UI
 st.title("Enhanced Solana Trading")
@@ -198,203 +328,378 @@ except Exception as e:
     st.warning("Twitter API configuration failed. Social sentiment analysis will be disabled.")
 
 class WalletMonitor:
-    def __init__(self, cache: DataCache, alert_config: AlertConfig):
+    def __init__(self, cache: DataCache, alert_config: AlertConfig, rpc: SolanaRPC = None,
+                 price_feed: PriceFeed = None, scan_interval: float = 60,
+                 token_refresh_interval: float = 300, max_concurrency: int = 10,
+                 check_timeout: float = 20, alert_window: float = 86400,
+                 notifier: NotificationDispatcher = None):
         self.cache = cache
         self.alert_config = alert_config
+        self.rpc = rpc or SolanaRPC(os.environ.get("SOLANA_RPC_URL", DEFAULT_RPC_URL))
+        self.price_feed = price_feed
+        self.notifier = notifier
+        self.alert_window = alert_window
+        # Rolling alert state per held token, fed by price feed ticks
+        self._windows: Dict[str, RollingWindow] = {}
+        self._subscription = None
+        self._consumer: Optional[asyncio.Task] = None
+        self.alert_gate = AlertGate(alert_config.cooldown, alert_config.hysteresis)
+        # Added from the script thread while the loop scans; snapshot under the lock
+        self._wallets_lock = threading.Lock()
         self.monitored_wallets = set()
+        self.scan_interval = scan_interval
+        # Holdings change far less often than prices, so each wallet's token
+        # list is only re-read from chain once it is this many seconds old
+        self.token_refresh_interval = token_refresh_interval
+        self.max_concurrency = max_concurrency
+        self.check_timeout = check_timeout
+        self._wallet_tokens: Dict[str, tuple] = {}
 
     def add_wallet(self, wallet_address: str):
         """Add wallet to monitoring"""
-        self.monitored_wallets.add(wallet_address)
+        with self._wallets_lock:
+            self.monitored_wallets.add(wallet_address)
 
-    def get_wallet_tokens(self, wallet_address: str) -> List[str]:
+    async def get_wallet_tokens(self, wallet_address: str) -> List[str]:
         """Get tokens in wallet"""
-        # Implement Solana token account lookup
-        pass
+        # One batched request covers both the SPL Token and Token-2022 programs
+        results = await self.rpc.batch([
+            ('getTokenAccountsByOwner', [
+                wallet_address,
+                {'programId': program_id},
+                {'encoding': 'jsonParsed', 'commitment': 'confirmed'}
+            ])
+            for program_id in (TOKEN_PROGRAM_ID, TOKEN_2022_PROGRAM_ID)
+        ])
+        
+        tokens = set()
+        for result in results:
+            if isinstance(result, RpcError):
+                raise result
+            for account in (result or {}).get('value', []):
+                info = account['account']['data']['parsed']['info']
+                if float(info['tokenAmount'].get('uiAmount') or 0) > 0:
+                    tokens.add(info['mint'])
+        return sorted(tokens)
+
+    async def _tokens_for(self, wallet_address: str, semaphore: asyncio.Semaphore) -> List[str]:
+        cached = self._wallet_tokens.get(wallet_address)
+        now = time.monotonic()
+        if cached and now - cached[0] < self.token_refresh_interval:
+            return cached[1]
+        async with semaphore:
+            try:
+                tokens = await self.get_wallet_tokens(wallet_address)
+            except Exception as e:
+                # Keep scanning with the last known holdings
+                logger.warning("Error fetching tokens for %s: %s", wallet_address, e)
+                return cached[1] if cached else []
+        self._wallet_tokens[wallet_address] = (now, tokens)
+        return tokens
+
+    async def _check_bounded(self, token_address: str, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            try:
+                await asyncio.wait_for(self.check_token_alerts(token_address), self.check_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Alert check for %s timed out", token_address)
+
+    async def scan_once(self):
+        """Scan all wallets concurrently and check each held token once"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        with self._wallets_lock:
+            wallets = list(self.monitored_wallets)
+        token_lists = await asyncio.gather(*(self._tokens_for(w, semaphore) for w in wallets))
+        
+        # A token held by several wallets is evaluated once per cycle
+        tokens = set().union(*token_lists) if token_lists else set()
+        await self._follow(tokens)
+        await asyncio.gather(*(self._check_bounded(t, semaphore) for t in tokens))
+        return tokens
+
+    async def _load_window(self, token_address: str) -> RollingWindow:
+        """Build a token's rolling window from cached 5-minute candles (cold path)"""
+        window = RollingWindow(self.alert_window)
+        candles = await asyncio.to_thread(
+            self.cache.get_ohlcv, token_address,
+            days=self.alert_window / 86400, resolution='5m'
+        )
+        window.seed(candles)
+        return window
+
+    async def _follow(self, tokens: set):
+        """Keep one feed subscription covering exactly the held tokens"""
+        for token in set(self._windows) - tokens:
+            del self._windows[token]
+            self.alert_gate.forget(token)
+        if self.price_feed is None:
+            return
+        new_tokens = tokens - set(self._windows)
+        windows = await asyncio.gather(*(self._load_window(t) for t in new_tokens))
+        self._windows.update(zip(new_tokens, windows))
+        
+        if self._subscription is not None and self._subscription.tokens == tokens:
+            return
+        if self._subscription is not None:
+            self._subscription.close()
+        # One subscription carries every held token, so its queue must hold a
+        # full poll's worth of updates or ticks for one token would evict another's
+        self._subscription = (
+            self.price_feed.subscribe(*tokens, maxsize=2 * len(tokens)) if tokens else None
+        )
+        if self._subscription is not None and (self._consumer is None or self._consumer.done()):
+            self._consumer = asyncio.get_running_loop().create_task(
+                self._consume(), name="wallet-monitor-ticks"
+            )
+
+    async def _consume(self):
+        """Fold every feed tick into its token's window"""
+        while self._subscription is not None:
+            subscription = self._subscription
+            async for update in subscription:
+                window = self._windows.get(update.token_address)
+                pair = update.pair
+                # An update without pair data has no volume or liquidity; zeros
+                # would read as a full liquidity pull
+                if window is None or not pair:
+                    continue
+                window.push(
+                    update.timestamp, update.price,
+                    float((pair.get('volume') or {}).get('h24') or 0),
+                    float((pair.get('liquidity') or {}).get('usd') or 0)
+                )
 
     async def monitor_wallet_tokens(self):
         """Monitor tokens in watched wallets"""
+        loop = asyncio.get_running_loop()
         while True:
-            for wallet in self.monitored_wallets:
-                tokens = self.get_wallet_tokens(wallet)
-                for token in tokens:
-                    await self.check_token_alerts(token)
-            await asyncio.sleep(60)  # Check every minute
+            started = loop.time()
+            await self.scan_once()
+            # Keep a steady cadence however long the scan took
+            await asyncio.sleep(max(0.0, self.scan_interval - (loop.time() - started)))
 
     async def check_token_alerts(self, token_address: str):
         """Check for alert conditions"""
         try:
-            # Get latest data
-            price_data = self.cache.get_price_history(token_address, days=1)
-            if price_data.empty:
+            window = self._windows.get(token_address)
+            if window is None or self.price_feed is None:
+                # No ticks are streaming in for this token; read its state from the cache
+                window = await self._load_window(token_address)
+            window.advance(time.time())
+            if not len(window):
                 return
 
-            alerts = []
+            config = self.alert_config
+            price_change = (window.last_price / window.first_price) - 1 if window.first_price else 0.0
+            liq_change = (window.last_liquidity / window.first_liquidity) - 1 if window.first_liquidity else 0.0
+            volume_ratio = window.last_volume / window.mean_volume if window.mean_volume else 0.0
+            checks = [
+                # (type, severity, magnitude, threshold, message)
+                ('PRICE_DROP', 'HIGH', -price_change, config.price_drop_threshold,
+                 f'Price dropped by {-price_change:.1%}'),
+                ('LIQUIDITY_DROP', 'CRITICAL', -liq_change, config.liquidity_drop_threshold,
+                 f'Liquidity dropped by {-liq_change:.1%}'),
+                ('VOLUME_SPIKE', 'MEDIUM', volume_ratio, config.volume_spike_threshold,
+                 f'Volume {volume_ratio:.1f}x above average'),
+            ]
             
-            # Price drop alert
-            price_change = (price_data['price'].iloc[-1] / price_data['price'].iloc[0]) - 1
-            if price_change < -self.alert_config.price_drop_threshold:
-                alerts.append({
-                    'type': 'PRICE_DROP',
-                    'severity': 'HIGH',
-                    'message': f'Price dropped by {-price_change:.1%}'
-                })
-
-            # Liquidity drop alert
-            liq_change = (price_data['liquidity'].iloc[-1] / price_data['liquidity'].iloc[0]) - 1
-            if liq_change < -self.alert_config.liquidity_drop_threshold:
-                alerts.append({
-                    'type': 'LIQUIDITY_DROP',
-                    'severity': 'CRITICAL',
-                    'message': f'Liquidity dropped by {-liq_change:.1%}'
-                })
-
-            # Volume spike alert
-            avg_volume = price_data['volume'].mean()
-            current_volume = price_data['volume'].iloc[-1]
-            if current_volume > avg_volume * self.alert_config.volume_spike_threshold:
-                alerts.append({
-                    'type': 'VOLUME_SPIKE',
-                    'severity': 'MEDIUM',
-                    'message': f'Volume {current_volume/avg_volume:.1f}x above average'
-                })
+            # Every check goes through the gate, even when below threshold,
+            # so a latched alert can re-arm once the market recovers
+            now = time.time()
+            alerts = [
+                {'type': alert_type, 'severity': severity, 'message': message}
+                for alert_type, severity, magnitude, threshold, message in checks
+                if self.alert_gate.should_fire(token_address, alert_type, magnitude, threshold, now)
+            ]
 
             # Save and notify alerts
             for alert in alerts:
                 self.save_alert(token_address, alert)
                 await self.notify_alert(token_address, alert)
 
-        except Exception as e:
-            st.error(f"Error checking alerts: {e}")
+        except Exception:
+            logger.exception("Error checking alerts for %s", token_address)
 
     def save_alert(self, token_address: str, alert: Dict):
-        """Save alert to database"""
-        with self.cache.conn:
-            self.cache.conn.execute("""
-                INSERT INTO alert_history 
-                VALUES (?, ?, ?, ?, ?)
-            """, (
-                token_address,
-                alert['type'],
-                datetime.now(),
-                alert['severity'],
-                alert['message']
-            ))
+        """Queue alert for the cache's next batched write"""
+        self.cache.record_alert(token_address, alert['type'], alert['severity'], alert['message'])
 
     async def notify_alert(self, token_address: str, alert: Dict):
         """Notify user of alert"""
-        # You can implement different notification methods here
-        # For now, we'll just show in Streamlit
-        st.warning(f"Alert for {token_address}: {alert['message']} ({alert['severity']})")
+        if self.notifier is None:
+            logger.warning("Alert for %s: %s (%s)", token_address, alert['message'], alert['severity'])
+            return
+        # Only queues the alert; sink workers deliver it in the background
+        self.notifier.publish(Notification(
+            token_address, alert['type'], alert['severity'], alert['message']
+        ))
 
 
 class WalletAnalyzer:
-    def __init__(self):
+    def __init__(self, rpc: Optional[SolanaRPC] = None, max_concurrency: int = 8,
+                 holder_timeout: float = 60, signature_limit: int = 100,
+                 store: Optional[HolderSnapshotStore] = None):
+        self.rpc = rpc or get_solana_rpc()
+        self.store = store
+        # Bounds the signature-history requests in flight against the node
+        self.max_concurrency = max_concurrency
+        self.holder_timeout = holder_timeout
+        self.signature_limit = signature_limit
         self.risk_threshold = {
             'dev_wallet_percentage': 0.10,  # 10% max for dev wallets
             'top10_holders_percentage': 0.50,  # 50% max for top 10 holders
             'min_unique_holders': 100
         }
-        async def fetch_holder_data(self, token_address: str) -> List[Dict]:
-            """Fetch token holder data from Solana"""
+        self.dev_wallet_criteria = {
+            'min_share': 0.05,  # Holds more than 5% of supply
+            'early_window': 86400,  # First received within a day of launch
+            'max_dev_txs': 5  # Received once and barely touched since
+        }
+
+    async def fetch_holder_data(self, token_address: str) -> Holders:
+        """Fetch token holder data from Solana"""
+        previous = await asyncio.to_thread(self.store.snapshot, token_address) if self.store else None
+        if self.store and self.store.is_fresh(previous):
+            return aggregate_holders(previous.accounts, previous.owners, previous.amounts,
+                                     previous.decimals, previous.slot)
+
+        # Every token account of the mint, from both token programs, plus the
+        # decimals, in one batched request
+        min_slot = previous.slot if previous else None
+        results = await self.rpc.batch([
+            ('getProgramAccounts', holder_accounts_params(token_address, TOKEN_PROGRAM_ID,
+                                                          min_context_slot=min_slot)),
+            ('getProgramAccounts', holder_accounts_params(token_address, TOKEN_2022_PROGRAM_ID, sized=False,
+                                                          min_context_slot=min_slot)),
+            ('getTokenSupply', [token_address])
+        ], timeout=self.holder_timeout)
+        for result in results:
+            if isinstance(result, RpcError):
+                raise result
+
+        *program_accounts, supply = results
+        slot = min(result['context']['slot'] for result in program_accounts)
+        decimals = int(supply['value']['decimals'])
+        accounts, owners, amounts = decode_token_accounts(
+            [account for result in program_accounts for account in result['value']]
+        )
+        if self.store:
+            # Only the accounts that differ from the stored snapshot are written
+            snapshot = await asyncio.to_thread(
+                self.store.apply, token_address, slot, decimals, accounts, owners, amounts, previous
+            )
+            accounts, owners, amounts = snapshot.accounts, snapshot.owners, snapshot.amounts
+        return aggregate_holders(accounts, owners, amounts, decimals, slot)
+
+    async def _history_for(self, holders: Holders, i: int, semaphore: asyncio.Semaphore) -> Optional[List[Dict]]:
+        async with semaphore:
             try:
-                # Use Solana Web3 to fetch token accounts
-                token_accounts = await self.client.get_token_accounts_by_owner(
-                    token_address,
-                    {'programId': 'TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA'}
-                )
-                
-                holders = []
-                for account in token_accounts['result']['value']:
-                    balance = account['account']['data']['parsed']['info']['tokenAmount']['uiAmount']
-                    owner = account['pubkey']
-                    
-                    holders.append({
-                        'address': owner,
-                        'balance': balance,
-                        'last_transaction': None  # You could fetch this if needed
-                    })
-                
-                return holders
-                
+                return await self.get_wallet_transaction_history(holders.account(i))
             except Exception as e:
-                st.error(f"Error fetching holder data: {e}")
-                return []
+                st.warning(f"Could not analyze wallet {holders.address(i)}: {e}")
+                return None
 
-    def identify_dev_wallets(self, holders_data: List[Dict]) -> List[Dict]:
+    async def identify_dev_wallets(self, holders: Holders, total_supply: float,
+                                   launch_time: Optional[float] = None) -> List[Dict]:
         """Identify potential developer wallets"""
+        # Criteria for identifying dev wallets:
+        # 1. Large initial allocation
+        # 2. Early transaction history
+        # 3. Few interactions since receiving the tokens
+        if total_supply <= 0:
+            return []
+        candidates = np.flatnonzero(holders.balances > self.dev_wallet_criteria['min_share'] * total_supply)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        histories = await asyncio.gather(*(self._history_for(holders, i, semaphore) for i in candidates))
+
+        if launch_time is None:
+            # Without the pair's creation time, the earliest large holder marks the launch
+            first_seen = [self._first_seen(h) for h in histories if h]
+            launch_time = min((t for t in first_seen if t is not None), default=None)
+
         dev_wallets = []
-        total_supply = sum(holder['balance'] for holder in holders_data)
-        
-        for holder in holders_data:
-            # Criteria for identifying dev wallets:
-            # 1. Large initial allocation
-            # 2. Early transaction history
-            # 3. Multiple token interactions
-            
-            wallet_share = holder['balance'] / total_supply if total_supply > 0 else 0
-            
-            if wallet_share > 0.05:  # Holds more than 5% of supply
-                try:
-                    # You could add more sophisticated checks here
-                    tx_history = self.get_wallet_transaction_history(holder['address'])
-                    is_early_holder = self.check_if_early_holder(tx_history)
-                    has_dev_pattern = self.analyze_transaction_pattern(tx_history)
-                    
-                    if is_early_holder or has_dev_pattern:
-                        dev_wallets.append({
-                            'address': holder['address'],
-                            'balance': holder['balance'],
-                            'share': wallet_share,
-                            'risk_score': self.calculate_dev_wallet_risk(wallet_share, tx_history)
-                        })
-                        
-                except Exception as e:
-                    st.warning(f"Could not analyze wallet {holder['address']}: {e}")
+        for i, tx_history in zip(candidates, histories):
+            if tx_history is None:
+                continue
+            balance = float(holders.balances[i])
+            wallet_share = balance / total_supply
+            is_early_holder = self.check_if_early_holder(tx_history, launch_time)
+            has_dev_pattern = self.analyze_transaction_pattern(tx_history)
+
+            if is_early_holder or has_dev_pattern:
+                dev_wallets.append({
+                    'address': holders.address(i),
+                    'balance': balance,
+                    'share': wallet_share,
+                    'risk_score': self.calculate_dev_wallet_risk(wallet_share, tx_history)
+                })
         
         return dev_wallets
 
     # Helper methods for WalletAnalyzer
-    def get_wallet_transaction_history(self, wallet_address: str) -> List[Dict]:
-        """Get transaction history for a wallet"""
-        # Implement actual transaction fetching logic
-        return []
+    async def get_wallet_transaction_history(self, account_address: str) -> List[Dict]:
+        """Signatures touching a holder's token account, newest first"""
+        return await self.rpc.call('getSignaturesForAddress', [
+            account_address, {'limit': self.signature_limit, 'commitment': 'confirmed'}
+        ]) or []
+
+    def _first_seen(self, tx_history: List[Dict]) -> Optional[float]:
+        # A full page means older signatures exist that were not fetched
+        if not tx_history or len(tx_history) >= self.signature_limit:
+            return None
+        return tx_history[-1].get('blockTime')
 
-    def check_if_early_holder(self, tx_history: List[Dict]) -> bool:
+    def check_if_early_holder(self, tx_history: List[Dict], launch_time: Optional[float] = None) -> bool:
         """Check if wallet was an early holder"""
-        return True  # Implement actual logic
+        first_seen = self._first_seen(tx_history)
+        if first_seen is None or launch_time is None:
+            return False
+        return first_seen <= launch_time + self.dev_wallet_criteria['early_window']
 
     def analyze_transaction_pattern(self, tx_history: List[Dict]) -> bool:
         """Analyze if transaction pattern matches developer behavior"""
-        return True  # Implement actual logic
+        # A large allocation that was received and then left alone
+        return 0 < len(tx_history) <= self.dev_wallet_criteria['max_dev_txs']
 
     def calculate_dev_wallet_risk(self, wallet_share: float, tx_history: List[Dict]) -> float:
         """Calculate risk score for potential developer wallet"""
         risk_score = min(wallet_share * 5, 1.0)  # Basic score based on holdings
         return risk_score
 
-    def analyze_wallet_distribution(self, token_address):
-        """Analyze token holder distribution"""
-        try:
-            # Fetch holder data from Solana (you'll need to implement the actual API call)
-            holders_data = self.fetch_holder_data(token_address)
-            
-            # Calculate key metrics
-            total_supply = sum(holder['balance'] for holder in holders_data)
-            dev_wallets = self.identify_dev_wallets(holders_data)
-            dev_percentage = sum(w['balance'] for w in dev_wallets) / total_supply
+    async def analyze_wallet_distribution_async(self, token_address: str,
+                                                launch_time: Optional[float] = None) -> Dict:
+        holders = await self.fetch_holder_data(token_address)
             
-            # Sort holders by balance
-            sorted_holders = sorted(holders_data, key=lambda x: x['balance'], reverse=True)
-            top10_percentage = sum(h['balance'] for h in sorted_holders[:10]) / total_supply
+        # Calculate key metrics
+        distribution = self.calculate_distribution_metrics(holders)
+        total_supply = distribution['total_supply']
+        dev_wallets = await self.identify_dev_wallets(holders, total_supply, launch_time)
+        dev_percentage = sum(w['balance'] for w in dev_wallets) / total_supply
+        if self.store:
+            await asyncio.to_thread(
+                self.store.record_metrics, token_address, holders.slot, distribution, dev_percentage
+            )
             
-            return {
-                'dev_wallet_percentage': dev_percentage,
-                'top10_holders_percentage': top10_percentage,
-                'unique_holders': len(holders_data),
-                'dev_wallets': dev_wallets,
-                'holder_distribution': self.calculate_distribution_metrics(sorted_holders)
-            }
+        return {
+            'dev_wallet_percentage': dev_percentage,
+            'top10_holders_percentage': distribution['top10_share'],
+            'unique_holders': len(holders),
+            'dev_wallets': dev_wallets,
+            'holder_distribution': distribution
+        }
+
+    def calculate_distribution_metrics(self, holders: Holders) -> Dict[str, float]:
+        """Supply, top-N shares, Gini and HHI over the holder balances"""
+        return distribution_metrics(holders.balances)
+
+    def analyze_wallet_distribution(self, token_address, launch_time: Optional[float] = None):
+        """Analyze token holder distribution"""
+        try:
+            return get_background_runtime().run(
+                self.analyze_wallet_distribution_async(token_address, launch_time),
+                self.holder_timeout * 2
+            )
         except Exception as e:
             st.error(f"Error analyzing wallets: {e}")
             return None
@@ -421,109 +726,80 @@ class WalletAnalyzer:
         return min(risk_score, 1.0)
 
 class BaseTrader:
-    def __init__(self, client, wallet):
+    def __init__(self, client, wallet, price_feed=None):
         self.client = client
         self.wallet = wallet
+        self.price_feed = price_feed or get_price_feed()
         self.trade_history = []
 
     async def get_current_price(self, token_address):
         """Get current price for a token"""
         try:
-            # Add actual price fetching logic here
-            response = await self.client.get_token_price(token_address)
-            return float(response['price'])
+            price = self.price_feed.latest(token_address)
+            if price is None:
+                # Not subscribed yet; wait for the feed's first batch that includes it
+                async with self.price_feed.subscribe(token_address) as updates:
+                    price = (await updates.__anext__()).price
+            return price
         except Exception as e:
             st.error(f"Error getting price: {e}")
             return None
 
-class AutomatedTrader(BaseTrader):
-    def __init__(self, client, wallet):
-        super().__init__(client, wallet)
-        self.active_trades = []
-        self.auto_levels = {}
-        
-    async def monitor_price(self, token_address, target_price, stop_loss):
-        """Monitor price and execute trade when conditions are met"""
-        while True:
-            current_price = await self.get_current_price(token_address)
-            
-            if current_price >= target_price:
-                await self.execute_trade(token_address, 'sell')
-                break
-            elif current_price <= stop_loss:
-                await self.execute_trade(token_address, 'sell')
-                break
-                
-            await asyncio.sleep(5)  # Check every 5 seconds
-
 class DexAnalyzer:
-    def __init__(self):
-        self.rug_indicators = {
-            'min_liquidity_age': timedelta(days=2),
-            'min_tx_count': 100,
-            'min_liquidity_usd': 10000,
-            'suspicious_buy_sell_ratio': 0.3,  # Very low sells compared to buys
-            'suspicious_holder_count': 10
-        }
+    def __init__(self, cache: DataCache = None, history_days: float = 7):
+        self.cache = cache
+        self.history_days = history_days
+        self.rug_indicators = dict(RUG_INDICATORS)
+        # A drop counts when it happens within drop_window candles of a peak
+        self.drop_threshold = 0.5
+        self.liquidity_removal_threshold = 0.5
+        self.drop_window = 12
+
+    def get_price_history(self, token_address: str) -> pd.DataFrame:
+        """Stored candles (close and liquidity) for the token, oldest first"""
+        if self.cache is None:
+            return pd.DataFrame(columns=['close', 'liquidity'], dtype=float)
+        return self.cache.get_ohlcv(token_address, days=self.history_days)
+
+    def detect_sudden_drops(self, price_history: pd.DataFrame) -> List:
+        """Timestamps of peaks the price fell from by drop_threshold or more"""
+        if price_history.empty:
+            return []
+        hits = detect_drops(price_history['close'].to_numpy(), self.drop_threshold, self.drop_window)
+        return price_history.index[hits].tolist()
+
+    def detect_liquidity_removals(self, price_history: pd.DataFrame) -> List:
+        """Timestamps of liquidity peaks followed by a pull of liquidity_removal_threshold or more"""
+        if price_history.empty or 'liquidity' not in price_history:
+            return []
+        hits = detect_drops(
+            price_history['liquidity'].to_numpy(), self.liquidity_removal_threshold, self.drop_window
+        )
+        return price_history.index[hits].tolist()
 
     def analyze_pair_health(self, pair_data):
         """Analyze pair for rug pull risks and health indicators"""
         try:
-            # Basic metrics
-            liquidity_usd = float(pair_data['liquidity']['usd'])
-            pair_age = datetime.now() - datetime.fromtimestamp(pair_data['pairCreatedAt'])
-            tx_count = sum(int(pair_data['txns']['h24'].get(k, 0)) for k in ['buys', 'sells'])
-            
-            # Calculate buy/sell ratio
-            buys = int(pair_data['txns']['h24'].get('buys', 0))
-            sells = int(pair_data['txns']['h24'].get('sells', 0))
-            buy_sell_ratio = buys / sells if sells > 0 else float('inf')
-            
             # Analyze price history for suspicious patterns
             price_history = self.get_price_history(pair_data['baseToken']['address'])
             sudden_drops = self.detect_sudden_drops(price_history)
             liquidity_removals = self.detect_liquidity_removals(price_history)
             
-            risk_factors = []
-            risk_score = 0
-            
-            # Age check
-            if pair_age < self.rug_indicators['min_liquidity_age']:
-                risk_factors.append("Very new token (high risk)")
-                risk_score += 0.3
-            
-            # Transaction activity check
-            if tx_count < self.rug_indicators['min_tx_count']:
-                risk_factors.append("Low transaction count")
-                risk_score += 0.2
-            
-            # Liquidity check
-            if liquidity_usd < self.rug_indicators['min_liquidity_usd']:
-                risk_factors.append("Low liquidity")
-                risk_score += 0.2
-            
-            # Buy/Sell ratio check
-            if buy_sell_ratio > 1/self.rug_indicators['suspicious_buy_sell_ratio']:
-                risk_factors.append("Suspicious buy/sell ratio")
-                risk_score += 0.2
-            
-            # Price and liquidity pattern checks
-            if sudden_drops:
-                risk_factors.append("History of sudden price drops")
-                risk_score += 0.3
-            
-            if liquidity_removals:
-                risk_factors.append("History of liquidity removals")
-                risk_score += 0.4
+            row = screen_pairs(
+                pairs_to_health_frame([pair_data]),
+                sudden_drops=[len(sudden_drops)],
+                liquidity_removals=[len(liquidity_removals)],
+                indicators=self.rug_indicators
+            ).iloc[0]
             
             return {
-                'risk_score': min(risk_score, 1.0),
-                'risk_factors': risk_factors,
+                'risk_score': float(row['risk_score']),
+                'risk_factors': risk_factors(row),
                 'metrics': {
-                    'liquidity_usd': liquidity_usd,
-                    'pair_age_days': pair_age.days,
-                    'tx_count_24h': tx_count,
-                    'buy_sell_ratio': buy_sell_ratio,
+                    'liquidity_usd': float(row['liquidity_usd']),
+                    'pair_age_days': int(row['pair_age_days']) if np.isfinite(row['pair_age_days']) else None,
+                    'tx_count_24h': int(row['tx_count_24h']),
+                    'buy_sell_ratio': float(row['buy_sell_ratio']),
                     'sudden_drops': len(sudden_drops),
                     'liquidity_removals': len(liquidity_removals)
                 }
@@ -532,6 +808,33 @@ class DexAnalyzer:
             st.error(f"Error analyzing pair health: {e}")
             return None
 
+    def analyze_pairs_health(self, pairs_by_address, include_history: bool = False):
+        """Screen the most liquid pair of every token in one vectorized pass
+
+        Returns a DataFrame indexed by token address, highest rug risk first.
+        Stored history is only read when ``include_history`` is set, since it
+        costs one cache query per token.
+        """
+        best_pairs = {}
+        for address, pairs in pairs_by_address.items():
+            pair = most_liquid_pair(pairs)
+            if pair is not None:
+                best_pairs[address] = pair
+        addresses = list(best_pairs)
+        
+        drops = removals = None
+        if include_history:
+            histories = [self.get_price_history(a) for a in addresses]
+            drops = [len(self.detect_sudden_drops(h)) for h in histories]
+            removals = [len(self.detect_liquidity_removals(h)) for h in histories]
+        
+        return screen_pairs(
+            pairs_to_health_frame(list(best_pairs.values()), index=pd.Index(addresses, name='token_address')),
+            sudden_drops=drops,
+            liquidity_removals=removals,
+            indicators=self.rug_indicators
+        )
+
     def detect_dead_project_revival(self, pair_data, social_metrics):
         """Analyze if this is a dead project showing signs of revival"""
         try:
@@ -579,7 +882,8 @@ class DexAnalyzer:
             return None
 
 class TradingRecommendation:
-    def __init__(self):
+    def __init__(self, social_store: SocialMetricsStore = None):
+        self.social_store = social_store
         self.weight_social = 0.3
         self.weight_price = 0.3
         self.weight_volume = 0.2
@@ -611,20 +915,12 @@ class TradingRecommendation:
 
     def calculate_social_score(self, social_metrics):
         """Calculate combined social sentiment score"""
-        twitter_metrics = social_metrics['twitter']
-        tiktok_metrics = social_metrics['tiktok']
-        
-        twitter_score = (
-            twitter_metrics['sentiment'] * 0.6 +
-            min(1, twitter_metrics['volume'] / 1000) * 0.4
-        )
-        
-        tiktok_score = (
-            min(1, tiktok_metrics['total_views'] / 1000000) * 0.5 +
-            tiktok_metrics['engagement_rate'] * 0.5
-        )
-        
-        return (twitter_score * 0.6 + tiktok_score * 0.4)
+        ticker = social_metrics.get('ticker')
+        if self.social_store is not None and ticker:
+            # Precomputed rolling aggregates cover every platform, including
+            # any that timed out on this refresh
+            return combined_social_score(self.social_store.metrics(ticker))
+        return combined_social_score(social_metrics)
 
     def get_recommendation(self, price_data, token_data, social_metrics):
         """Generate trading recommendation based on all available data"""
@@ -674,47 +970,105 @@ class TradingRecommendation:
             'suggested_target': price_data['high'].max() * 1.05  # 5% above highest high
         }
 
+def _epoch(value) -> float:
+    """TikTok create_time arrives as epoch seconds or as a datetime depending on the client version"""
+    return value.timestamp() if isinstance(value, datetime) else float(value)
+
 class SocialMediaAnalyzer:
-    def __init__(self, twitter_api, tiktok_api):
+    def __init__(self, twitter_api, tiktok_api, sentiment=None, timeout: float = 8.0,
+                 store: SocialMetricsStore = None):
         self.twitter_api = twitter_api
         self.tiktok_api = tiktok_api
+        self.sentiment = sentiment or get_sentiment_service()
+        self.timeout = timeout
+        self.store = store
+        
+        self.aggregator = SocialAggregator([
+            SocialSource('twitter', self.fetch_twitter_metrics,
+                         {'sentiment': 0, 'volume': 0, 'engagement': 0}, timeout),
+            SocialSource('tiktok', self.fetch_tiktok_metrics,
+                         self.analyze_tiktok_engagement([]), timeout),
+        ])
         
     async def get_tiktok_data(self, ticker_formats, count=20):
         """Fetch TikTok data for a hashtag"""
-        try:
-            # Use the TikTok format (with #)
-            tag_data = await self.tiktok_api.hashtag(ticker_formats['tiktok'])
-            videos = await tag_data.videos(count=count)
-            
-            tiktok_data = []
-            for video in videos:
-                data = {
-                    'desc': video.desc,
-                    'create_time': video.create_time,
-                    'stats': {
-                        'views': video.stats['playCount'],
-                        'likes': video.stats['diggCount'],
-                        'shares': video.stats['shareCount'],
-                        'comments': video.stats['commentCount']
-                    }
+        # Use the TikTok format (with #); errors are reported by the aggregator
+        tag_data = await self.tiktok_api.hashtag(ticker_formats['tiktok'])
+        videos = await tag_data.videos(count=count)
+        
+        tiktok_data = []
+        for video in videos:
+            data = {
+                'id': video.id,
+                'desc': video.desc,
+                'create_time': video.create_time,
+                'stats': {
+                    'views': video.stats['playCount'],
+                    'likes': video.stats['diggCount'],
+                    'shares': video.stats['shareCount'],
+                    'comments': video.stats['commentCount']
                 }
-                tiktok_data.append(data)
-            
-            return tiktok_data
-        except Exception as e:
-            st.error(f"TikTok API error: {e}")
-            return []
+            }
+            tiktok_data.append(data)
+        
+        return tiktok_data
+
+    async def fetch_twitter_metrics(self, ticker_formats, count=100):
+        """Search tweets on a worker thread (tweepy blocks) and score them"""
+        if self.twitter_api is None:
+            raise RuntimeError("Twitter API not configured")
+        if self.store is None:
+            tweets = await asyncio.to_thread(
+                self.twitter_api.search_tweets, q=ticker_formats['twitter'], count=count, lang='en'
+            )
+            return await asyncio.to_thread(self.analyze_tweet_sentiment, tweets)
+        
+        ticker = ticker_formats['display']
+        if not self.store.is_fresh(ticker, 'twitter'):
+            # Only tweets newer than the last one ingested
+            since_id, _ = self.store.cursor(ticker, 'twitter')
+            params = {'q': ticker_formats['twitter'], 'count': count, 'lang': 'en'}
+            if since_id:
+                params['since_id'] = since_id
+            tweets = await asyncio.to_thread(self.twitter_api.search_tweets, **params)
+            sentiments = await asyncio.to_thread(self.sentiment.score, [t.text for t in tweets])
+            posts = [
+                (str(t.id), t.created_at.timestamp(), sentiment,
+                 t.favorite_count + t.retweet_count, 0, 0)
+                for t, sentiment in zip(tweets, sentiments)
+            ]
+            newest = max((t.id for t in tweets), default=None)
+            await asyncio.to_thread(self.store.ingest, ticker, 'twitter', posts,
+                                    str(newest) if newest is not None else None)
+        return (await asyncio.to_thread(self.store.metrics, ticker))['twitter']
+
+    async def fetch_tiktok_metrics(self, ticker_formats):
+        if self.store is None:
+            return self.analyze_tiktok_engagement(await self.get_tiktok_data(ticker_formats))
+        
+        ticker = ticker_formats['display']
+        if not self.store.is_fresh(ticker, 'tiktok'):
+            # The hashtag feed has no since parameter, so the videos already
+            # ingested come back too and refresh their views and engagement
+            posts = [
+                (str(v['id']), _epoch(v['create_time']), 0.0,
+                 v['stats']['likes'] + v['stats']['comments'],
+                 v['stats']['views'], v['stats']['shares'])
+                for v in await self.get_tiktok_data(ticker_formats)
+            ]
+            newest = max((p[1] for p in posts), default=None)
+            await asyncio.to_thread(self.store.ingest, ticker, 'tiktok', posts,
+                                    str(newest) if newest is not None else None)
+        return (await asyncio.to_thread(self.store.metrics, ticker))['tiktok']
     def analyze_tweet_sentiment(self, tweets):
         """Analyze sentiment of tweets"""
         total_sentiment = 0
         tweet_count = 0
         engagement_total = 0
         
-        for tweet in tweets:
-            # Analyze sentiment using TextBlob
-            analysis = TextBlob(tweet.text)
-            sentiment = analysis.sentiment.polarity
-            
+        # One batched, cached call instead of a TextBlob per tweet
+        sentiments = self.sentiment.score([tweet.text for tweet in tweets])
+        for tweet, sentiment in zip(tweets, sentiments):
             # Calculate engagement
             engagement = tweet.favorite_count + tweet.retweet_count
             engagement_total += engagement
@@ -763,24 +1117,21 @@ class SocialMediaAnalyzer:
         }
         
     def analyze_social_metrics(self, ticker_formats):
-        """Analyze metrics from multiple social platforms"""
-        # Twitter analysis (using $ format)
-        tweets = self.twitter_api.search_tweets(
-            q=ticker_formats['twitter'], 
-            count=100, 
-            lang='en'
+        """Analyze metrics from multiple social platforms
+
+        All platforms are fetched concurrently on the background runtime;
+        one that times out or fails contributes its default metrics and is
+        listed under ``sources`` with its status.
+        """
+        social_metrics = get_background_runtime().run(
+            self.aggregator.collect(ticker_formats), timeout=self.timeout + 5
         )
-        twitter_sentiment = self.analyze_tweet_sentiment(tweets)
-        
-        # TikTok analysis (using # format)
-        tiktok_data = asyncio.run(self.get_tiktok_data(ticker_formats))
-        tiktok_metrics = self.analyze_tiktok_engagement(tiktok_data)
-        
-        return {
-            'twitter': twitter_sentiment,
-            'tiktok': tiktok_metrics,
-            'combined_score': self.calculate_combined_score(twitter_sentiment, tiktok_metrics)
-        }
+        social_metrics['ticker'] = ticker_formats['display']
+        return social_metrics
+
+    def calculate_combined_score(self, twitter_metrics, tiktok_metrics):
+        """Combined 0-1 social score from Twitter and TikTok metrics"""
+        return combined_social_score({'twitter': twitter_metrics, 'tiktok': tiktok_metrics})
 
 
 class PriceChartManager:
@@ -822,59 +1173,106 @@ class PriceChartManager:
         
         return fig
 
+# Swap instructions for one trade: (owner, token mint, 'buy' or 'sell', amount)
+SwapInstructionBuilder = Callable[[Pubkey, str, str, float], List[Instruction]]
+# A level whose trade failed is re-armed after a delay that doubles per failure
+LEVEL_RETRY_DELAY = 5.0
+LEVEL_RETRY_MAX_DELAY = 300.0
+
+
 class AutomatedTrader(BaseTrader):
-    def __init__(self, client, wallet):
-        super().__init__(client, wallet)
+    def __init__(self, client, wallet, price_feed=None, pipeline: ExecutionPipeline = None,
+                 signer: Optional[Keypair] = None, swap: Optional[SwapInstructionBuilder] = None):
+        super().__init__(client, wallet, price_feed)
+        self.pipeline = pipeline or get_execution_pipeline()
+        self.signer = signer
+        self.swap = swap
         self.active_trades = []
         self.auto_levels = {}
-        
-    async def monitor_price(self, token_address, target_price, stop_loss):
-        """Monitor price and execute trade when conditions are met"""
-        while True:
-            current_price = await self.get_current_price(token_address)
-            
-            if current_price >= target_price:
-                await self.execute_trade(token_address, 'sell')
-                break
-            elif current_price <= stop_loss:
-                await self.execute_trade(token_address, 'sell')
-                break
+        self._level_failures: Dict[int, int] = {}
+        # (token, level id) of failed levels waiting out their backoff
+        self._retrying = set()
+
+    @property
+    def trading_enabled(self) -> bool:
+        return self.signer is not None and self.swap is not None
+
+    def _trade_builder(self, token_address, trade_type, amount):
+        """Signs the swap for whatever recent blockhash the pipeline supplies"""
+        if self.swap is None:
+            raise ValueError("No DEX swap builder configured; trades are not sent")
+        if self.signer is None:
+            raise ValueError("No keypair for the connected wallet; set TRADER_KEYPAIR to its keypair file")
+        if not amount or amount <= 0:
+            raise ValueError("Trade amount must be positive")
+        signer = self.signer
+        instructions = self.swap(signer.pubkey(), token_address, trade_type, amount)
+
+        def build(blockhash: str) -> bytes:
+            return bytes(Transaction.new_signed_with_payer(
+                instructions, signer.pubkey(), [signer], Hash.from_string(blockhash)
+            ))
+        return build
+
+    def _arm(self, key, token_address, trade_type, amount):
+        # Nothing is pre-signed unless it could also be sent
+        if self.trading_enabled and amount and amount > 0:
+            self.pipeline.arm(key, self._trade_builder(token_address, trade_type, amount))
+
+    @staticmethod
+    def _record_confirmation(trade, done):
+        if done.cancelled():
+            trade['status'] = 'unconfirmed'
+        elif done.exception() is not None:
+            trade.update(status='unconfirmed', error=str(done.exception()))
+        else:
+            outcome = done.result()
+            trade.update(status=outcome['status'], error=outcome['err'])
+
+    async def monitor_price(self, token_address, target_price, stop_loss, amount):
+        """Monitor price and sell ``amount`` when the target or the stop loss is hit"""
+        # Both exits are the same sell, kept pre-signed until one of them fires
+        exit_key = (token_address, 'exit')
+        self._arm(exit_key, token_address, 'sell', amount)
+        self.pipeline.ensure_started()
+        # Updates come from the shared price feed instead of a per-token poller
+        async with self.price_feed.subscribe(token_address) as updates:
+            async for update in updates:
+                current_price = update.price
                 
-            await asyncio.sleep(5)  # Check every 5 seconds
+                if current_price >= target_price or current_price <= stop_loss:
+                    await self.execute_trade(token_address, 'sell', amount, template=exit_key,
+                                             trigger_time=time.perf_counter())
+                    break
     
-    async def execute_trade(self, token_address, trade_type, amount=None):
-        """Execute trade on DEX"""
+    async def execute_trade(self, token_address, trade_type, amount=None, template=None,
+                            trigger_time=None):
+        """Execute trade on DEX
+
+        Sends the pre-signed ``template`` when one is armed (signing on the
+        spot otherwise) and returns the signature as soon as the node accepts
+        it. The trade's status moves from 'submitted' to 'confirmed',
+        'failed' or 'expired' when the confirmation tracker resolves it.
+        """
         try:
-            # Create transaction
-            transaction = Transaction()
-            
-            # Add transfer instruction
-            transfer_instruction = transfer(
-                TransferParams(
-                    from_pubkey=self.wallet["public_key"],
-                    to_pubkey=token_address,
-                    lamports=int(amount * 1e9) if amount else 0
-                )
-            )
-            transaction.add(transfer_instruction)
-            
-            # Send transaction
-            response = self.client.send_transaction(
-                transaction,
-                opts=TxOpts(skip_confirmation=False)
-            )
+            # An armed template is sent as is; only sign here without one
+            build = (None if template is not None and self.pipeline.is_armed(template)
+                     else self._trade_builder(token_address, trade_type, amount))
+            signature, confirmation = await self.pipeline.submit(template, build, trigger_time)
             
             # Record trade
-            self.trade_history.append({
+            trade = {
                 'timestamp': datetime.now(),
                 'token': token_address,
                 'type': trade_type,
                 'amount': amount,
-                'status': 'success',
-                'tx_signature': response['result']
-            })
+                'status': 'submitted',
+                'tx_signature': signature
+            }
+            self.trade_history.append(trade)
+            confirmation.add_done_callback(lambda done: self._record_confirmation(trade, done))
             
-            return response['result']
+            return signature
             
         except Exception as e:
             self.trade_history.append({
@@ -889,34 +1287,56 @@ class AutomatedTrader(BaseTrader):
     
     def set_auto_levels(self, token_address, levels):
         """Set automatic buy/sell levels"""
-        self.auto_levels[token_address] = {
-            'buy': sorted(levels['buy'], reverse=True),  # Higher to lower
-            'sell': sorted(levels['sell'])  # Lower to higher
-        }
+        if not self.trading_enabled:
+            raise ValueError("Auto trading needs a DEX swap builder and the connected wallet's keypair")
+        previous = self.auto_levels.get(token_address)
+        if previous:
+            for level in previous.levels('buy') + previous.levels('sell'):
+                self.pipeline.disarm((token_address, level.level_id))
+        # Levels left at zero price or amount in the form are not armed
+        book = TriggerBook.from_levels(levels['buy'], levels['sell'])
+        for level in book.levels('buy') + book.levels('sell'):
+            self._arm((token_address, level.level_id), token_address, level.side, level.amount)
+        self.auto_levels[token_address] = book
         
     async def monitor_auto_levels(self, token_address):
         """Monitor price and execute trades at preset levels"""
-        while True:
-            try:
-                current_price = await self.get_current_price(token_address)
-                levels = self.auto_levels.get(token_address, {})
+        self.pipeline.ensure_started()
+        async with self.price_feed.subscribe(token_address) as updates:
+            async for update in updates:
+                triggered = time.perf_counter()
+                book = self.auto_levels.get(token_address)
+                if book is None or (not book and not any(k[0] == token_address for k in self._retrying)):
+                    break
                 
-                # Check buy levels
-                for buy_level in levels.get('buy', []):
-                    if current_price <= buy_level['price']:
-                        await self.execute_trade(token_address, 'buy', buy_level['amount'])
-                        levels['buy'].remove(buy_level)
-                
-                # Check sell levels
-                for sell_level in levels.get('sell', []):
-                    if current_price >= sell_level['price']:
-                        await self.execute_trade(token_address, 'sell', sell_level['amount'])
-                        levels['sell'].remove(sell_level)
-                
-                await asyncio.sleep(5)
-            except Exception as e:
-                st.error(f"Error monitoring levels: {e}")
-                await asyncio.sleep(30)
+                # Crossed levels are already out of the book; failed ones return after a backoff
+                buys, sells = book.pop_crossed(update.price)
+                crossed = buys + sells
+                results = await asyncio.gather(*(
+                    self.execute_trade(token_address, level.side, level.amount,
+                                       template=(token_address, level.level_id), trigger_time=triggered)
+                    for level in crossed
+                ), return_exceptions=True)
+                for level, result in zip(crossed, results):
+                    if not isinstance(result, Exception):
+                        self._level_failures.pop(level.level_id, None)
+                        continue
+                    failures = self._level_failures.get(level.level_id, 0) + 1
+                    self._level_failures[level.level_id] = failures
+                    delay = min(LEVEL_RETRY_MAX_DELAY, LEVEL_RETRY_DELAY * 2 ** (failures - 1))
+                    logger.warning("%s level %s of %s failed (%s); re-arming in %.0fs",
+                                   level.side, level.price, token_address, result, delay)
+                    self._retrying.add((token_address, level.level_id))
+                    asyncio.get_running_loop().call_later(
+                        delay, self._retry_level, token_address, book, level
+                    )
+
+    def _retry_level(self, token_address, book, level):
+        self._retrying.discard((token_address, level.level_id))
+        # Levels replaced by set_auto_levels in the meantime stay gone
+        if self.auto_levels.get(token_address) is book:
+            book.restore(level)
+            self._arm((token_address, level.level_id), token_address, level.side, level.amount)
 
 
 def normalize_ticker(ticker: str) -> dict:
@@ -941,9 +1361,9 @@ def fetch_dexscreener_data(ticker_formats):
     """Fetch token data from Dexscreener API"""
     try:
         # Use the clean ticker format for DexScreener
-        url = f"https://api.dexscreener.com/latest/dex/tokens/solana/{ticker_formats['dexscreener']}"
-        response = requests.get(url)
-        data = response.json()
+        data = get_dexscreener_client().get_json_sync(
+            f"tokens/solana/{ticker_formats['dexscreener']}"
+        )
         
         if 'pairs' in data and data['pairs']:
             return data
@@ -954,40 +1374,38 @@ def fetch_dexscreener_data(ticker_formats):
         return None
 
 
-def prepare_price_data(token_data):
+def prepare_price_data(token_data, cache=None, days=7, max_points=500):
     """Prepare price data for charting"""
     try:
-        # Extract price history from token data
-        pair = token_data['pairs'][0]  # Use most liquid pair
-        
-        # Construct DataFrame
-        price_data = pd.DataFrame({
-            'open': [float(pair.get('priceUsd', 0))],  # Current price as open
-            'high': [float(pair.get('priceUsd', 0)) * (1 + float(pair.get('priceChange', {}).get('h24', 0))/100)],
-            'low': [float(pair.get('priceUsd', 0)) * (1 - float(pair.get('priceChange', {}).get('h24', 0))/100)],
-            'close': [float(pair.get('priceUsd', 0))],
-            'volume': [float(pair.get('volume', {}).get('h24', 0))]
-        }, index=[pd.Timestamp.now()])
-        
-        # Add some historical data points using price change
-        for i in range(1, 24):  # Create 24 hours of dummy data
-            time_point = pd.Timestamp.now() - pd.Timedelta(hours=i)
-            price_change = float(pair.get('priceChange', {}).get('h24', 0)) / 24 * i
-            base_price = float(pair.get('priceUsd', 0))
-            
-            historical_price = base_price / (1 + price_change/100)
-            price_data.loc[time_point] = {
-                'open': historical_price * 0.998,
-                'high': historical_price * 1.005,
-                'low': historical_price * 0.995,
-                'close': historical_price,
-                'volume': float(pair.get('volume', {}).get('h24', 0)) / 24
-            }
+        pair = most_liquid_pair(token_data['pairs'])
+        token_address = pair['baseToken']['address']
+        cache = cache or get_data_cache()
         
-        # Sort index
-        price_data.sort_index(inplace=True)
+        # Stored history first; backfill from the candle API when it does not
+        # reach back to the window start (or the pair's launch, if later)
+        resolution = DataCache.pick_resolution(timedelta(days=days), max_points)
+        price_data = cache.get_ohlcv(token_address, days=days, resolution=resolution)
+        window_start = time.time() - days * 86400
+        if pair.get('pairCreatedAt'):
+            window_start = max(window_start, pair['pairCreatedAt'] / 1000)
+        covered = (
+            len(price_data) >= 2
+            and local_index_to_epoch(price_data.index[:1])[0] <= window_start + ROLLUP_RESOLUTIONS[resolution]
+        )
+        if not covered:
+            # One extra day so the first candles in the window get a full
+            # trailing day for their 24h volume
+            fetch_start = time.time() - (days + 1) * 86400
+            candle_client = get_candle_client()
+            candles = candle_client.run_sync(
+                fetch_candles(candle_client, pair['pairAddress'], resolution, days + 1)
+            )
+            cache.store_ohlcv(token_address, resolution, candles,
+                              from_launch=(pair.get('pairCreatedAt') or 0) / 1000 > fetch_start)
+            # Re-read so the backfill and the locally recorded buckets come back merged
+            price_data = cache.get_ohlcv(token_address, days=days, resolution=resolution)
         
-        return price_data
+        return price_data[OHLCV_COLUMNS]
         
     except Exception as e:
         st.error(f"Error preparing price data: {e}")
@@ -997,12 +1415,24 @@ def prepare_price_data(token_data):
 def main():
     st.title("Advanced Solana Memecoin Trading Bot")
     
+    with st.sidebar.expander("Dexscreener Cache"):
+        st.json(get_dexscreener_client().stats())
+    with st.sidebar.expander("Sentiment"):
+        st.json(get_sentiment_service().stats())
+    with st.sidebar.expander("Alert Delivery"):
+        st.json(get_notification_dispatcher().stats())
+    with st.sidebar.expander("Solana RPC"):
+        st.json(get_solana_rpc().stats())
+    with st.sidebar.expander("Execution"):
+        st.json(get_execution_pipeline().stats())
+    
     # Initialize APIs and components
-    client = Client("https://api.mainnet-beta.solana.com")
-    cache = DataCache()
-    pattern_detector = PatternDetector(cache)
-    wallet_monitor = WalletMonitor(cache, AlertConfig())
-    dex_analyzer = DexAnalyzer()
+    client = get_solana_client()
+    runtime = get_background_runtime()
+    cache = get_data_cache()
+    pattern_detector = get_pattern_detector()
+    wallet_monitor = get_wallet_monitor()
+    dex_analyzer = DexAnalyzer(get_data_cache())
 
     # Initialize wallet connection
     connected_wallet = wallet_connect()
@@ -1012,13 +1442,23 @@ def main():
         st.success(f"Connected Wallet: {wallet_address}")
         
         # Initialize automated trader
-        trader = AutomatedTrader(client, connected_wallet)
+        trader = get_trader(wallet_address, client, connected_wallet)
         
         # Add wallet to monitor
         wallet_monitor.add_wallet(wallet_address)
         
-        # Start monitoring in background
-        monitoring_task = asyncio.create_task(wallet_monitor.monitor_wallet_tokens())
+        # Start monitoring in background (no-op if already running)
+        runtime.submit(
+            wallet_monitor.monitor_wallet_tokens(),
+            name="wallet-monitor",
+            key="wallet-monitor"
+        )
+        
+        with st.sidebar.expander("Background Tasks"):
+            for task in runtime.tasks():
+                st.write(f"{task['name']} ({task['handle']}): {task['status']}")
+                if task['status'] == 'running' and st.button("Stop", key=f"stop-{task['handle']}"):
+                    runtime.stop(task['handle'])
     else:
         st.warning("Please connect your wallet to continue")
         st.info("Make sure you have a Solana wallet extension installed (Phantom, Solflare, or Backpack)")
@@ -1089,7 +1529,7 @@ def main():
     tiktok_api = TikTokApi()
     
     # Initialize analyzers
-    social_analyzer = SocialMediaAnalyzer(twitter_api, tiktok_api)
+    social_analyzer = SocialMediaAnalyzer(twitter_api, tiktok_api, store=get_social_store())
     chart_manager = PriceChartManager()
     
     # Token input with format handling
@@ -1109,12 +1549,19 @@ def main():
         token_data = fetch_dexscreener_data(ticker_formats)
         
         if token_data:
+            # Multi-day OHLCV from the cache (or the candle API on a cold cache)
+            price_data = prepare_price_data(token_data, cache)
+            
             # Initialize recommendation engine
-            recommendation_engine = TradingRecommendation()
+            recommendation_engine = TradingRecommendation(get_social_store())
 
             # Initialize wallet analyzer
-            wallet_analyzer = WalletAnalyzer()
-            wallet_analysis = wallet_analyzer.analyze_wallet_distribution(token_data['pairs'][0]['baseToken']['address'])
+            wallet_analyzer = WalletAnalyzer(store=get_holder_store())
+            pair_created = token_data['pairs'][0].get('pairCreatedAt')
+            wallet_analysis = wallet_analyzer.analyze_wallet_distribution(
+                token_data['pairs'][0]['baseToken']['address'],
+                pair_created / 1000 if pair_created else None  # Dexscreener reports milliseconds
+            )
 
             # Display wallet analysis
             with st.expander("Wallet Analysis"):
@@ -1122,6 +1569,16 @@ def main():
                     st.metric("Dev Wallet Concentration", f"{wallet_analysis['dev_wallet_percentage']:.1%}")
                     st.metric("Top 10 Holders", f"{wallet_analysis['top10_holders_percentage']:.1%}")
                     st.metric("Unique Holders", wallet_analysis['unique_holders'])
+                    distribution = wallet_analysis['holder_distribution']
+                    st.caption(
+                        f"Gini {distribution['gini']:.2f} · HHI {distribution['hhi']:.3f} · "
+                        f"~{distribution['effective_holders']:,.0f} effective holders"
+                    )
+
+                    # Concentration trend from earlier snapshots, no chain queries
+                    history = get_holder_store().metrics_history(token_data['pairs'][0]['baseToken']['address'])
+                    if len(history) > 1:
+                        st.line_chart(history[['top10_share', 'dev_wallet_percentage', 'gini']])
                     
                     # Risk warning
                     risk_score = wallet_analyzer.calculate_risk_score(wallet_analysis)
@@ -1135,20 +1592,28 @@ def main():
             with col1:
                 buy_amount = st.number_input("Buy Amount", min_value=0.0, format="%.4f")
                 if st.button("Buy Now", type="primary"):
-                    asyncio.run(trader.execute_trade(
-                        token_data['pairs'][0]['baseToken']['address'],
-                        'buy',
-                        buy_amount
-                    ))
+                    try:
+                        signature = runtime.run(trader.execute_trade(
+                            token_data['pairs'][0]['baseToken']['address'],
+                            'buy',
+                            buy_amount
+                        ), timeout=60)
+                        st.success(f"Buy submitted: {signature}")
+                    except Exception as e:
+                        st.error(f"Buy failed: {e}")
             
             with col2:
                 sell_amount = st.number_input("Sell Amount", min_value=0.0, format="%.4f")
                 if st.button("Sell Now", type="primary"):
-                    asyncio.run(trader.execute_trade(
-                        token_data['pairs'][0]['baseToken']['address'],
-                        'sell',
-                        sell_amount
-                    ))
+                    try:
+                        signature = runtime.run(trader.execute_trade(
+                            token_data['pairs'][0]['baseToken']['address'],
+                            'sell',
+                            sell_amount
+                        ), timeout=60)
+                        st.success(f"Sell submitted: {signature}")
+                    except Exception as e:
+                        st.error(f"Sell failed: {e}")
             
             # Auto-levels setup
             with st.expander("Set Auto Levels"):
@@ -1175,13 +1640,18 @@ def main():
                     sell_levels.append({"price": price, "amount": amount})
                 
                 if st.button("Start Auto Trading"):
-                    trader.set_auto_levels(
-                        token_data['pairs'][0]['baseToken']['address'],
-                        {'buy': buy_levels, 'sell': sell_levels}
-                    )
-                    asyncio.run(trader.monitor_auto_levels(
-                        token_data['pairs'][0]['baseToken']['address']
-                    )) 
+                    token_address = token_data['pairs'][0]['baseToken']['address']
+                    try:
+                        trader.set_auto_levels(token_address, {'buy': buy_levels, 'sell': sell_levels})
+                    except ValueError as e:
+                        st.error(str(e))
+                    else:
+                        runtime.submit(
+                            trader.monitor_auto_levels(token_address),
+                            name=f"auto-levels {ticker_formats['display']}",
+                            key=f"auto-levels:{wallet_address}:{token_address}"
+                        )
+                        st.success("Auto trading started in the background")
             # Get recommendation
             recommendation = recommendation_engine.get_recommendation(
             price_data,
@@ -1225,7 +1695,6 @@ def main():
                     if recommendation['details']['social_sentiment'] < 0:
                         st.write("- Negative social sentiment")
             # Use display format for chart title
-            price_data = prepare_price_data(token_data)
             chart = chart_manager.create_price_chart(price_data, ticker_formats['display'])
             st.plotly_chart(chart)
             
@@ -1243,6 +1712,11 @@ def main():
                     st.subheader("TikTok Metrics")
                     st.write(f"Total Views: {social_metrics['tiktok']['total_views']:,}")
                     st.write(f"Engagement Rate: {social_metrics['tiktok']['engagement_rate']:.2%}")
+                
+                if social_metrics['partial']:
+                    missing = [name for name, status in social_metrics['sources'].items()
+                               if status['status'] != 'ok']
+                    st.caption(f"Partial results: {', '.join(missing)} unavailable")
             
             # Automated trading setup
             with st.expander("Automated Trading"):
@@ -1261,12 +1735,16 @@ def main():
                                                  format="%.4f")
                 
                 if st.button("Start Automated Trading"):
-                    if all([target_price, stop_loss, trade_amount]):
-                        asyncio.run(trader.monitor_price(
-                            token_data['address'],
-                            target_price,
-                            stop_loss
-                        ))
+                    if not trader.trading_enabled:
+                        st.error("Automated trading needs a DEX swap builder and the connected wallet's keypair")
+                    elif all([target_price, stop_loss, trade_amount]):
+                        token_address = token_data['pairs'][0]['baseToken']['address']
+                        runtime.submit(
+                            trader.monitor_price(token_address, target_price, stop_loss, trade_amount),
+                            name=f"price-monitor {ticker_formats['display']}",
+                            key=f"price-monitor:{wallet_address}:{token_address}"
+                        )
+                        st.success("Price monitor started in the background")
                     else:
                         st.warning("Please set all trading parameters")
             
@@ -0,0 +1,113 @@
+import asyncio
+import itertools
+import threading
+import time
+from concurrent.futures import CancelledError, Future
+from dataclasses import dataclass, field
+from typing import Any, Coroutine, Dict, List, Optional
+
+
+@dataclass
+class TaskHandle:
+    handle_id: str
+    name: str
+    future: Future = field(repr=False)
+    started_at: float = field(default_factory=time.time)
+
+    @property
+    def status(self) -> str:
+        if not self.future.done():
+            return 'running'
+        if self.future.cancelled():
+            return 'stopped'
+        return 'failed' if self.future.exception() is not None else 'finished'
+
+    def describe(self) -> Dict[str, Any]:
+        info = {
+            'handle': self.handle_id,
+            'name': self.name,
+            'status': self.status,
+            'running_for_s': round(time.time() - self.started_at, 1)
+        }
+        if info['status'] == 'failed':
+            info['error'] = repr(self.future.exception())
+        return info
+
+
+class BackgroundRuntime:
+    """A dedicated event-loop thread for monitors, traders and alert checks
+
+    Streamlit reruns the script on every interaction, so long-running
+    coroutines cannot live on the script thread. They are submitted here
+    instead and managed by handle. Submitting with a ``key`` that is already
+    running returns the existing handle, so reruns do not start duplicates.
+    """
+
+    def __init__(self, max_finished: int = 200):
+        self.loop = asyncio.new_event_loop()
+        self.max_finished = max_finished
+        self._handles: Dict[str, TaskHandle] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._thread = threading.Thread(target=self._run_loop, name="background-runtime", daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Coroutine, name: str, key: Optional[str] = None) -> str:
+        """Schedule ``coro`` on the runtime loop and return its handle id"""
+        with self._lock:
+            existing = self._handles.get(key) if key else None
+            if existing is not None and existing.status == 'running':
+                coro.close()
+                return existing.handle_id
+            handle_id = key or f"{name}-{next(self._ids)}"
+            future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+            self._handles[handle_id] = TaskHandle(handle_id, name, future)
+            self._prune()
+            return handle_id
+
+    def _prune(self):
+        finished = [h for h in self._handles.values() if h.future.done()]
+        for handle in sorted(finished, key=lambda h: h.started_at)[:-self.max_finished or None]:
+            del self._handles[handle.handle_id]
+
+    def stop(self, handle_id: str) -> bool:
+        """Cancel a running task; returns False if it was unknown or already done"""
+        handle = self._handles.get(handle_id)
+        return handle is not None and handle.future.cancel()
+
+    def status(self, handle_id: str) -> Optional[Dict[str, Any]]:
+        handle = self._handles.get(handle_id)
+        return handle.describe() if handle else None
+
+    def tasks(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            handles = list(self._handles.values())
+        return [h.describe() for h in sorted(handles, key=lambda h: h.started_at)]
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Run a short coroutine on the runtime loop and wait for its result"""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def shutdown(self, timeout: float = 5.0):
+        """Cancel every task on the loop, wait for them to unwind, then stop the thread"""
+        async def cancel_all():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            self.run(cancel_all(), timeout)
+        except (TimeoutError, CancelledError):
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
@@ -0,0 +1,203 @@
+"""Micro-benchmarks for the hot paths of the trading app
+
+Run with ``python benchmarks.py`` (or ``python benchmarks.py symbol_index``
+to run a single benchmark). Data is synthetic, so no network access is needed.
+"""
+import random
+import string
+import sys
+import time
+
+import numpy as np
+
+from holders import Holders, distribution_metrics
+from pair_health import detect_drops, pairs_to_health_frame, screen_pairs
+from sentiment import LexiconScorer, SentimentService, TextBlobScorer
+from risk_scoring import pairs_to_frame, score_risk
+from symbol_index import SymbolIndex
+
+
+def _timeit(fn, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_pairs(n, seed=42):
+    """Synthetic Dexscreener-shaped pairs"""
+    rng = random.Random(seed)
+    pairs = []
+    for i in range(n):
+        symbol = ''.join(rng.choices(string.ascii_uppercase, k=rng.randint(3, 8)))
+        pairs.append({
+            'pairAddress': f"pair{i}",
+            'baseToken': {'address': f"token{i}", 'symbol': symbol},
+            'priceUsd': str(rng.uniform(1e-6, 10)),
+            'liquidity': {'usd': rng.uniform(0, 5e6)},
+            'volume': {'h24': rng.uniform(0, 1e6), 'h6': rng.uniform(0, 3e5)},
+            'priceChange': {'h24': rng.uniform(-90, 300)},
+            'txns': {'h24': {'buys': rng.randint(0, 5000), 'sells': rng.randint(0, 5000)}},
+            'pairCreatedAt': int(time.time()) - rng.randint(0, 90 * 86400)
+        })
+    return pairs
+
+
+def linear_filter(pairs, ticker):
+    """The scan MemecoinAnalyzer.filter_memecoins used before the symbol index"""
+    memecoins = []
+    for token in pairs:
+        if not isinstance(token, dict) or 'baseToken' not in token:
+            continue
+        base_token = token.get('baseToken', {})
+        if not isinstance(base_token, dict) or 'symbol' not in base_token:
+            continue
+        if ticker.upper() in base_token['symbol'].upper():
+            memecoins.append(token)
+    return memecoins
+
+
+def bench_symbol_index(n=100_000):
+    pairs = make_pairs(n)
+    build = _timeit(lambda: SymbolIndex(pairs), repeat=1)
+    index = SymbolIndex(pairs)
+
+    # A refetch where 1% of the pairs changed symbol
+    refreshed = make_pairs(n // 100, seed=7)
+    sync = _timeit(lambda: index.update(refreshed), repeat=1)
+    pairs = refreshed + pairs[len(refreshed):]
+
+    print(f"symbol_index: {n} pairs, build {build * 1e3:.0f} ms, "
+          f"incremental update of {len(refreshed)} pairs {sync * 1e3:.1f} ms")
+    for query in ['W', 'WI', 'WIF', 'BONK', 'QXZJ']:
+        scan = _timeit(lambda: linear_filter(pairs, query))
+        indexed = _timeit(lambda: index.search(query))
+        hits = index.search(query)
+        assert hits == linear_filter(pairs, query)
+        print(f"  search {query!r:8} {len(hits):6} hits  "
+              f"scan {scan * 1e3:8.2f} ms  index {indexed * 1e3:8.3f} ms ({scan / indexed:,.0f}x)")
+    exact = _timeit(lambda: index.exact('WIF'))
+    prefix = _timeit(lambda: index.prefix('WIF'))
+    print(f"  exact 'WIF' {exact * 1e3:.3f} ms, prefix 'WIF' {prefix * 1e3:.3f} ms")
+
+
+def scalar_risk(memecoin_data, sentiment_data):
+    """The per-pair scorer RiskManager.calculate_risk_metrics used before vectorizing"""
+    try:
+        liquidity = float(memecoin_data['liquidity']['usd'])
+        volume = float(memecoin_data['volume']['h24'])
+        price_change = float(memecoin_data.get('priceChange', {}).get('h24', 0))
+        risk_metrics = {
+            'liquidity_score': min(liquidity / 1000000, 1),
+            'volume_score': min(volume / 100000, 1),
+            'price_volatility': abs(price_change) / 100,
+            'sentiment_risk': abs(sentiment_data['sentiment_volatility']),
+            'social_volume': min(sentiment_data['total_tweets'] / 1000, 1)
+        }
+        risk_score = (
+            (1 - risk_metrics['liquidity_score']) * 30 +
+            (1 - risk_metrics['volume_score']) * 20 +
+            risk_metrics['price_volatility'] * 25 +
+            risk_metrics['sentiment_risk'] * 15 +
+            (1 - risk_metrics['social_volume']) * 10
+        )
+        return risk_score, risk_metrics
+    except Exception:
+        return 100, {}
+
+
+def bench_risk(n=100_000):
+    pairs = make_pairs(n)
+    rng = random.Random(3)
+    sentiments = [{'sentiment_volatility': rng.uniform(0, 1), 'total_tweets': rng.randint(0, 3000)}
+                  for _ in range(n)]
+
+    loop = _timeit(lambda: [scalar_risk(p, s) for p, s in zip(pairs, sentiments)], repeat=1)
+    extract = _timeit(lambda: pairs_to_frame(pairs, sentiments), repeat=1)
+    frame = pairs_to_frame(pairs, sentiments)
+    vectorized = _timeit(lambda: score_risk(frame))
+
+    expected = np.array([scalar_risk(p, s)[0] for p, s in zip(pairs, sentiments)])
+    assert np.allclose(score_risk(frame)['risk_score'].to_numpy(), expected)
+    print(f"risk: {n} pairs, scalar loop {loop * 1e3:.0f} ms, "
+          f"vectorized {vectorized * 1e3:.1f} ms on columns ({loop / vectorized:,.0f}x), "
+          f"{(extract + vectorized) * 1e3:.0f} ms including dict -> column extraction")
+
+
+def bench_health(n=100_000, history_tokens=2_000, candles=168):
+    pairs = make_pairs(n)
+    extract = _timeit(lambda: pairs_to_health_frame(pairs), repeat=1)
+    frame = pairs_to_health_frame(pairs)
+    screen = _timeit(lambda: screen_pairs(frame))
+    ranked = screen_pairs(frame)
+    assert ranked['risk_score'].is_monotonic_decreasing
+
+    # A week of hourly candles per token, random walk with occasional pulls
+    rng = np.random.default_rng(5)
+    series = np.exp(np.cumsum(rng.normal(0, 0.05, (history_tokens, candles)), axis=1))
+    series[rng.random((history_tokens, candles)) < 0.005] *= 0.3
+    detect = _timeit(lambda: [detect_drops(row, 0.5, 12) for row in series], repeat=1)
+    print(f"health: {n} pairs screened and ranked in {screen * 1e3:.0f} ms "
+          f"({n / (extract + screen):,.0f} pairs/s including extraction); "
+          f"drop detection over {history_tokens} histories {detect * 1e3:.0f} ms "
+          f"({history_tokens / detect:,.0f} tokens/s)")
+
+
+def make_tweets(n, unique=None, seed=11):
+    """Synthetic tweets; with ``unique`` set, texts repeat the way retweets do"""
+    rng = random.Random(seed)
+    words = ['moon', 'rug', 'lfg', 'buy', 'dump', 'this', 'token', 'is', 'not', 'going',
+             'to', 'the', 'very', 'good', 'bad', 'scam', 'gem', 'ngmi', 'wagmi', 'chart']
+    pool = [' '.join(rng.choices(words, k=rng.randint(6, 20))) + f" #{rng.randint(0, 10**6)}"
+            for _ in range(unique or n)]
+    return pool if unique is None else [rng.choice(pool) for _ in range(n)]
+
+
+def bench_sentiment(n=20_000, unique=5_000):
+    tweets = make_tweets(n, unique)
+    for scorer in (TextBlobScorer(), LexiconScorer()):
+        sample = tweets[:2_000]
+        raw = _timeit(lambda: scorer.score_batch(sample), repeat=1)
+        service = SentimentService(scorer, processes=0)
+        cold = _timeit(lambda: service.score(tweets), repeat=1)
+        warm = _timeit(lambda: service.score(tweets))
+        print(f"sentiment[{scorer.name}]: per-tweet {len(sample) / raw:,.0f} tweets/s; "
+              f"service {n} tweets ({unique} unique) cold {n / cold:,.0f} tweets/s, "
+              f"warm {n / warm:,.0f} tweets/s")
+
+
+def bench_holders(n=1_000_000):
+    rng = np.random.default_rng(5)
+    balances = rng.pareto(1.2, n) * 1e3
+    holders = Holders(np.frombuffer(rng.bytes(32 * n), dtype='S32'),
+                      np.full(n, b'x' * 44, dtype='S44'), balances)
+    dicts = [{'address': 'x' * 44, 'account': 'y' * 44, 'balance': float(b)} for b in balances[:10_000]]
+    dict_bytes = sum(sys.getsizeof(d) + sum(sys.getsizeof(v) for v in d.values()) for d in dicts) / len(dicts)
+
+    def dict_metrics():
+        total = sum(h['balance'] for h in dicts)
+        ranked = sorted(dicts, key=lambda h: h['balance'], reverse=True)
+        return sum(h['balance'] for h in ranked[:10]) / total
+
+    loop = _timeit(dict_metrics, repeat=1) * n / len(dicts)
+    vectorized = _timeit(lambda: distribution_metrics(holders.balances))
+    print(f"holders: {n} holders, {holders.nbytes / n:.0f} B/holder as arrays vs "
+          f"~{dict_bytes:.0f} B as dicts; all distribution metrics {vectorized * 1e3:.0f} ms "
+          f"(dict sum + sort for top-10 alone ~{loop * 1e3:.0f} ms, extrapolated)")
+
+
+BENCHMARKS = {
+    'symbol_index': bench_symbol_index,
+    'risk': bench_risk,
+    'health': bench_health,
+    'sentiment': bench_sentiment,
+    'holders': bench_holders,
+}
+
+
+if __name__ == "__main__":
+    selected = sys.argv[1:] or list(BENCHMARKS)
+    for name in selected:
+        BENCHMARKS[name]()
@@ -0,0 +1,42 @@
+from datetime import timedelta
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from data_cache import ROLLUP_RESOLUTIONS, epoch_to_local_index
+
+# GeckoTerminal serves OHLCV per pool; any server with the same response shape
+# (e.g. a local fixture) can be used by pointing the client base URL at it
+CANDLE_BASE_URL = "https://api.geckoterminal.com/api/v2"
+TIMEFRAMES = {
+    '1m': ('minute', 1),
+    '5m': ('minute', 5),
+    '1h': ('hour', 1),
+    '1d': ('day', 1),
+}
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+MAX_CANDLES_PER_REQUEST = 1000
+
+
+def candles_to_frame(rows: Sequence[Sequence[float]]) -> pd.DataFrame:
+    """Build an OHLCV frame from ``[timestamp, open, high, low, close, volume]`` rows in one pass"""
+    if len(rows) == 0:
+        return pd.DataFrame(columns=OHLCV_COLUMNS, dtype=float)
+    values = np.asarray(rows, dtype=float)
+    values = values[np.argsort(values[:, 0], kind='stable')]
+    return pd.DataFrame(values[:, 1:6], index=epoch_to_local_index(values[:, 0]), columns=OHLCV_COLUMNS)
+
+
+async def fetch_candles(client, pool_address: str, resolution: str,
+                        days: float = 7) -> pd.DataFrame:
+    """Fetch a pool's OHLCV candles covering the last ``days`` at ``resolution``"""
+    timeframe, aggregate = TIMEFRAMES[resolution]
+    limit = min(MAX_CANDLES_PER_REQUEST,
+                int(timedelta(days=days).total_seconds() // ROLLUP_RESOLUTIONS[resolution]) + 1)
+    data = await client.get_json(
+        f"networks/solana/pools/{pool_address}/ohlcv/{timeframe}"
+        f"?aggregate={aggregate}&limit={limit}"
+    )
+    rows = (((data or {}).get('data') or {}).get('attributes') or {}).get('ohlcv_list') or []
+    return candles_to_frame(rows)
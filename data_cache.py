@@ -0,0 +1,629 @@
+import atexit
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+ALERT_HISTORY_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS alert_history (
+        token_address TEXT,
+        alert_type TEXT,
+        timestamp DATETIME,
+        severity TEXT,
+        message TEXT,
+        PRIMARY KEY (token_address, alert_type, timestamp)
+    )
+"""
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS price_history (
+        token_address TEXT,
+        timestamp DATETIME,
+        price REAL,
+        volume REAL,
+        liquidity REAL,
+        PRIMARY KEY (token_address, timestamp)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS pattern_history (
+        token_address TEXT,
+        pattern_type TEXT,
+        timestamp DATETIME,
+        confidence REAL,
+        description TEXT,
+        PRIMARY KEY (token_address, pattern_type, timestamp)
+    )
+    """,
+    ALERT_HISTORY_SCHEMA
+]
+
+# Rollup table suffix -> bucket width in seconds, finest first
+ROLLUP_RESOLUTIONS = {'1m': 60, '5m': 300, '1h': 3600, '1d': 86400}
+DAY_SECONDS = 86400
+
+SCHEMA += [
+    f"""
+    CREATE TABLE IF NOT EXISTS price_ohlcv_{name} (
+        token_address TEXT,
+        bucket INTEGER,
+        open REAL,
+        high REAL,
+        low REAL,
+        close REAL,
+        volume REAL,
+        liquidity REAL,
+        first_ts REAL,
+        last_ts REAL,
+        tick_count INTEGER,
+        PRIMARY KEY (token_address, bucket)
+    ) WITHOUT ROWID
+    """
+    for name in ROLLUP_RESOLUTIONS
+]
+
+SCHEMA += [
+    f"CREATE INDEX IF NOT EXISTS idx_ohlcv_{name}_bucket ON price_ohlcv_{name} (bucket)"
+    for name in ROLLUP_RESOLUTIONS
+] + [
+    "CREATE INDEX IF NOT EXISTS idx_alert_history_timestamp ON alert_history (timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_pattern_history_timestamp ON pattern_history (timestamp)"
+]
+
+INSERT_ALERT_SQL = """
+    INSERT OR REPLACE INTO alert_history (token_address, alert_type, timestamp, severity, message)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+INSERT_PATTERN_SQL = """
+    INSERT OR REPLACE INTO pattern_history (token_address, pattern_type, timestamp, confidence, description)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+# Raw ticks live in one table per month (price_history_YYYY_MM) so expired
+# months are dropped whole instead of deleted row by row. The original
+# price_history table is kept for compatibility and migrated on startup.
+PARTITION_PREFIX = "price_history_"
+PARTITION_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        token_address TEXT,
+        timestamp DATETIME,
+        price REAL,
+        volume REAL,
+        liquidity REAL,
+        PRIMARY KEY (token_address, timestamp)
+    ) WITHOUT ROWID
+"""
+INSERT_PRICE_SQL = "INSERT OR REPLACE INTO {table} VALUES (?, ?, ?, ?, ?)"
+
+# Merges a batch's partial bucket into the stored one. SET expressions see the
+# pre-update row, so open/close follow whichever side has the earlier/later tick.
+UPSERT_ROLLUP_SQL = """
+    INSERT INTO price_ohlcv_{name} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (token_address, bucket) DO UPDATE SET
+        open = CASE WHEN excluded.first_ts < first_ts THEN excluded.open ELSE open END,
+        high = MAX(high, excluded.high),
+        low = MIN(low, excluded.low),
+        close = CASE WHEN excluded.last_ts >= last_ts THEN excluded.close ELSE close END,
+        volume = CASE WHEN excluded.last_ts >= last_ts THEN excluded.volume ELSE volume END,
+        liquidity = CASE WHEN excluded.last_ts >= last_ts THEN excluded.liquidity ELSE liquidity END,
+        first_ts = MIN(first_ts, excluded.first_ts),
+        last_ts = MAX(last_ts, excluded.last_ts),
+        tick_count = tick_count + excluded.tick_count
+"""
+
+
+def format_timestamp(value: datetime) -> str:
+    """Fixed-width ISO text, so string order matches time order in range scans"""
+    return value.isoformat(sep=' ', timespec='microseconds')
+
+
+def epoch_to_local_index(epochs) -> pd.DatetimeIndex:
+    """Vectorized epoch seconds -> naive local timestamps, matching datetime.now()"""
+    local_tz = datetime.now().astimezone().tzinfo
+    return pd.to_datetime(epochs, unit='s', utc=True).tz_convert(local_tz).tz_localize(None)
+
+
+def local_index_to_epoch(index: pd.DatetimeIndex) -> pd.Index:
+    """Inverse of ``epoch_to_local_index``: naive local timestamps -> epoch seconds"""
+    local_tz = datetime.now().astimezone().tzinfo
+    return (index.tz_localize(local_tz) - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1)
+
+
+def partition_for(timestamp_text: str) -> str:
+    """Monthly partition table for an ISO timestamp ('2024-03-...' -> price_history_2024_03)"""
+    return f"{PARTITION_PREFIX}{timestamp_text[:4]}_{timestamp_text[5:7]}"
+
+
+def partition_bounds(table: str) -> Tuple[datetime, datetime]:
+    """First instant of a partition's month and of the month after it"""
+    year, month = int(table[-7:-3]), int(table[-2:])
+    start = datetime(year, month, 1)
+    end = datetime(year + month // 12, month % 12 + 1, 1)
+    return start, end
+
+
+@dataclass
+class RetentionPolicy:
+    """How long each kind of cached data is kept; ``None`` keeps it forever
+
+    Raw ticks are dropped a whole month partition at a time, so they can
+    outlive ``raw_days`` by up to a month.
+    """
+    raw_days: Optional[float] = 7
+    rollup_days: Dict[str, Optional[float]] = field(default_factory=lambda: {
+        '1m': 14, '5m': 90, '1h': 365, '1d': None
+    })
+    alert_days: Optional[float] = 90
+    pattern_days: Optional[float] = 90
+    # Seconds between background retention + compaction passes
+    maintenance_interval: float = 3600
+    # Free pages returned to the OS per incremental_vacuum step
+    vacuum_pages_per_step: int = 2000
+    # Rows deleted per retention transaction; flushes run between batches
+    delete_batch_size: int = 5000
+
+
+def rollup_ticks(rows: List[Tuple], width: int) -> List[Tuple]:
+    """Aggregate buffered tick rows into OHLCV buckets of ``width`` seconds
+
+    Rows are ``(token, timestamp_text, price, volume, liquidity, epoch)``.
+    Dexscreener volume is a rolling 24h figure, so a bucket keeps the last
+    volume and liquidity seen rather than a sum.
+    """
+    buckets: Dict[Tuple[str, int], list] = {}
+    for token, _, price, volume, liquidity, epoch in rows:
+        key = (token, int(epoch // width) * width)
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = [price, price, price, price, volume, liquidity, epoch, epoch, 1]
+            continue
+        if epoch < bucket[6]:
+            bucket[0], bucket[6] = price, epoch
+        if price > bucket[1]:
+            bucket[1] = price
+        if price < bucket[2]:
+            bucket[2] = price
+        if epoch >= bucket[7]:
+            bucket[3], bucket[4], bucket[5], bucket[7] = price, volume, liquidity, epoch
+        bucket[8] += 1
+    return [key + tuple(values) for key, values in buckets.items()]
+
+
+class DataCache:
+    """SQLite price/pattern/alert cache tuned for high tick rates
+
+    The database runs in WAL mode so readers never wait for the writer.
+    Connections come from a small thread-safe pool. Price ticks are buffered
+    and written with one ``executemany`` per flush on a background thread,
+    woken when the buffer reaches ``flush_size`` rows and otherwise every
+    ``flush_interval`` seconds, so buffering a tick never does I/O. Each
+    flush also folds the ticks into 1m/5m/1h/1d OHLCV rollup tables in the
+    same transaction, so charts can read buckets instead of raw ticks.
+    """
+
+    def __init__(self, db_path: str = "memecoin_cache.db", pool_size: int = 4,
+                 flush_size: int = 1000, flush_interval: float = 1.0,
+                 retention: Optional[RetentionPolicy] = None):
+        self.db_path = db_path
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.retention = retention or RetentionPolicy()
+
+        self._pool = queue.Queue(maxsize=pool_size)
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        with self.connection() as conn:
+            # Only takes effect on a new database; compact() converts old ones
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Read once here: other pooled connections keep reporting the old
+            # mode after a VACUUM on this one switches it
+            self._incremental_vacuum = conn.execute("PRAGMA auto_vacuum").fetchall()[0][0] == 2
+            with conn:
+                for statement in SCHEMA:
+                    conn.execute(statement)
+                self._migrate_alert_history(conn)
+            self._partitions = {
+                name for (name,) in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB ?",
+                    (PARTITION_PREFIX + '[0-9][0-9][0-9][0-9]_[0-9][0-9]',)
+                )
+            }
+            self._migrate_legacy_ticks(conn)
+
+        self._buffer: List[Tuple] = []
+        self._alert_buffer: List[Tuple] = []
+        self._pattern_buffer: List[Tuple] = []
+        self._buffer_lock = threading.Lock()
+        # Serializes flushes so batches commit in the order they were taken
+        self._flush_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flush_wanted = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="data-cache-flusher", daemon=True)
+        self._flusher.start()
+        self._maintenance = threading.Thread(
+            target=self._maintenance_loop, name="data-cache-maintenance", daemon=True
+        )
+        self._maintenance.start()
+        atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def _ensure_partition(self, conn: sqlite3.Connection, table: str):
+        if table not in self._partitions:
+            conn.execute(PARTITION_SCHEMA.format(table=table))
+            self._partitions.add(table)
+
+    def _migrate_alert_history(self, conn: sqlite3.Connection):
+        """Rebuild an alert_history table keyed without alert_type
+
+        The original key (token_address, timestamp) made two alerts for one
+        token in the same instant collide.
+        """
+        key = [name for _, name, _, _, _, pk in sorted(
+            conn.execute("PRAGMA table_info(alert_history)").fetchall(), key=lambda c: c[5]
+        ) if pk]
+        if key == ['token_address', 'alert_type', 'timestamp']:
+            return
+        conn.execute("ALTER TABLE alert_history RENAME TO alert_history_old")
+        conn.execute("DROP INDEX IF EXISTS idx_alert_history_timestamp")
+        conn.execute(ALERT_HISTORY_SCHEMA)
+        conn.execute("""
+            INSERT OR REPLACE INTO alert_history
+            SELECT token_address, alert_type, timestamp, severity, message FROM alert_history_old
+        """)
+        conn.execute("DROP TABLE alert_history_old")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_alert_history_timestamp ON alert_history (timestamp)")
+
+    def _migrate_legacy_ticks(self, conn: sqlite3.Connection, chunk_size: int = 50_000):
+        """Move rows from the unpartitioned price_history table into month partitions
+
+        The ticks predate the rollup tables, so they are folded into them in
+        the same transaction; otherwise charts would show no history before
+        the upgrade.
+        """
+        months = [m for (m,) in conn.execute(
+            "SELECT DISTINCT substr(timestamp, 1, 7) FROM price_history"
+        )]
+        if not months:
+            return
+        with conn:
+            for month in months:
+                table = partition_for(month)
+                self._ensure_partition(conn, table)
+                conn.execute(f"""
+                    INSERT OR REPLACE INTO {table}
+                    SELECT * FROM price_history WHERE substr(timestamp, 1, 7) = ?
+                """, (month,))
+            ticks = conn.execute("SELECT * FROM price_history")
+            while True:
+                rows = ticks.fetchmany(chunk_size)
+                if not rows:
+                    break
+                timestamps = pd.to_datetime([row[1] for row in rows], format='ISO8601')
+                epochs = local_index_to_epoch(pd.DatetimeIndex(timestamps)).tolist()
+                # Chunks may split a bucket; the upsert merges the partial buckets
+                self._write_rollups(conn, [row + (epoch,) for row, epoch in zip(rows, epochs)])
+            conn.execute("DELETE FROM price_history")
+
+    @staticmethod
+    def _write_rollups(conn: sqlite3.Connection, rows: List[Tuple]):
+        for name, width in ROLLUP_RESOLUTIONS.items():
+            conn.executemany(UPSERT_ROLLUP_SQL.format(name=name), rollup_ticks(rows, width))
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection for the duration of the block"""
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def cache_price_data(self, token_address: str, price_data: dict,
+                         timestamp: Optional[datetime] = None):
+        """Buffer a price tick; it is written with the next flush
+
+        Safe to call from an event loop: a full buffer wakes the flusher
+        thread instead of writing here.
+        """
+        timestamp = timestamp or datetime.now()
+        row = (
+            token_address,
+            format_timestamp(timestamp),
+            float(price_data['price']),
+            float(price_data['volume']),
+            float(price_data['liquidity']),
+            timestamp.timestamp()
+        )
+        with self._buffer_lock:
+            self._buffer.append(row)
+            full = len(self._buffer) >= self.flush_size
+        if full:
+            self._flush_wanted.set()
+
+    def record_alert(self, token_address: str, alert_type: str, severity: str, message: str,
+                     timestamp: Optional[datetime] = None):
+        """Buffer an alert; it is written with the next flush"""
+        row = (token_address, alert_type, format_timestamp(timestamp or datetime.now()),
+               severity, message)
+        with self._buffer_lock:
+            self._alert_buffer.append(row)
+
+    def record_patterns(self, token_address: str, patterns: List[Tuple[str, datetime, float, str]]):
+        """Buffer ``(pattern_type, timestamp, confidence, description)`` rows for the next flush"""
+        rows = [
+            (token_address, pattern_type, format_timestamp(timestamp), float(confidence), description)
+            for pattern_type, timestamp, confidence, description in patterns
+        ]
+        with self._buffer_lock:
+            self._pattern_buffer.extend(rows)
+
+    def _flush_loop(self):
+        while True:
+            self._flush_wanted.wait(self.flush_interval)
+            self._flush_wanted.clear()
+            if self._closed.is_set():
+                return
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # Rows stay buffered and are retried on the next interval
+                pass
+
+    def _maintenance_loop(self):
+        while not self._closed.wait(self.retention.maintenance_interval):
+            try:
+                self.apply_retention()
+                self.compact()
+            except sqlite3.Error:
+                # Usually a busy database; the next pass picks up where this stopped
+                pass
+
+    def flush(self, wait: bool = True) -> int:
+        """Write all buffered ticks, alerts and patterns in a single transaction
+
+        With ``wait=False`` (how reads flush) nothing happens while another
+        flush or a retention batch holds the writer; the flusher thread
+        writes those rows shortly after.
+        """
+        with self._buffer_lock:
+            if not self._buffer and not self._alert_buffer and not self._pattern_buffer:
+                return 0
+        if not self._flush_lock.acquire(blocking=wait):
+            return 0
+        try:
+            with self._buffer_lock:
+                rows, self._buffer = self._buffer, []
+                alerts, self._alert_buffer = self._alert_buffer, []
+                patterns, self._pattern_buffer = self._pattern_buffer, []
+            if not rows and not alerts and not patterns:
+                return 0
+            try:
+                by_partition: Dict[str, List[Tuple]] = {}
+                for row in rows:
+                    by_partition.setdefault(partition_for(row[1]), []).append(row[:5])
+                with self.connection() as conn:
+                    with conn:
+                        for table, partition_rows in by_partition.items():
+                            self._ensure_partition(conn, table)
+                            conn.executemany(INSERT_PRICE_SQL.format(table=table), partition_rows)
+                        self._write_rollups(conn, rows)
+                        conn.executemany(INSERT_ALERT_SQL, alerts)
+                        conn.executemany(INSERT_PATTERN_SQL, patterns)
+            except sqlite3.Error:
+                with self._buffer_lock:
+                    self._buffer[:0] = rows
+                    self._alert_buffer[:0] = alerts
+                    self._pattern_buffer[:0] = patterns
+                raise
+            return len(rows) + len(alerts) + len(patterns)
+        finally:
+            self._flush_lock.release()
+
+    def get_price_history(self, token_address: str, days: float = 1) -> pd.DataFrame:
+        """Price ticks for a token over the last ``days``, oldest first"""
+        self.flush(wait=False)
+        since_time = datetime.now() - timedelta(days=days)
+        since = format_timestamp(since_time)
+        # Each month is its own primary-key range scan; months arrive in order
+        tables = sorted(t for t in list(self._partitions) if partition_bounds(t)[1] > since_time)
+        rows = []
+        with self.connection() as conn:
+            for table in tables:
+                rows += conn.execute(f"""
+                    SELECT timestamp, price, volume, liquidity
+                    FROM {table}
+                    WHERE token_address = ? AND timestamp >= ?
+                    ORDER BY timestamp
+                """, (token_address, since)).fetchall()
+
+        columns = ['price', 'volume', 'liquidity']
+        if not rows:
+            return pd.DataFrame(columns=columns, dtype=float)
+        timestamps, *values = zip(*rows)
+        return pd.DataFrame(
+            dict(zip(columns, values)),
+            index=pd.to_datetime(timestamps, format='ISO8601')
+        )
+
+    @staticmethod
+    def pick_resolution(window: timedelta, max_points: int) -> str:
+        """Finest rollup whose bucket count for ``window`` fits in ``max_points``"""
+        seconds = window.total_seconds()
+        for name, width in ROLLUP_RESOLUTIONS.items():
+            if seconds / width <= max_points:
+                return name
+        return name
+
+    def get_ohlcv(self, token_address: str, days: float = 1,
+                  end: Optional[datetime] = None, max_points: int = 500,
+                  resolution: Optional[str] = None) -> pd.DataFrame:
+        """OHLCV candles for a token read from the rollup tables
+
+        The resolution is chosen from the window and the point budget unless
+        given explicitly; a week with the default budget reads ~170 hourly rows.
+        ``volume`` is a rolling 24h volume; ``liquidity`` is NaN for buckets
+        known only from backfilled candles.
+        """
+        self.flush(wait=False)
+        end = end or datetime.now()
+        window = timedelta(days=days)
+        name = resolution or self.pick_resolution(window, max_points)
+        width = ROLLUP_RESOLUTIONS[name]
+        start_bucket = int((end - window).timestamp() // width) * width
+
+        with self.connection() as conn:
+            rows = conn.execute(f"""
+                SELECT bucket, open, high, low, close, volume, liquidity
+                FROM price_ohlcv_{name}
+                WHERE token_address = ? AND bucket >= ? AND bucket <= ?
+                ORDER BY bucket
+            """, (token_address, start_bucket, end.timestamp())).fetchall()
+
+        columns = ['open', 'high', 'low', 'close', 'volume', 'liquidity']
+        if not rows:
+            return pd.DataFrame(columns=columns, dtype=float)
+        values = np.array(rows, dtype=float)
+        return pd.DataFrame(values[:, 1:], index=epoch_to_local_index(values[:, 0]), columns=columns)
+
+    def store_ohlcv(self, token_address: str, resolution: str, candles: pd.DataFrame,
+                    from_launch: bool = False) -> int:
+        """Backfill a rollup table from externally fetched candles
+
+        Fetched ``volume`` is traded volume per candle, while locally built
+        buckets hold Dexscreener's rolling 24h volume. It is converted to the
+        same meaning: each candle stores the sum over the day of candles
+        ending with it. Candles without a full trailing day in ``candles``
+        are skipped, unless ``from_launch`` says the series starts at the
+        pair's launch (nothing traded before it). Backfilled buckets have
+        ``tick_count`` 0 and, without a ``liquidity`` column, a NULL
+        liquidity that reads back as NaN. Returns the number of rows written.
+        """
+        if candles.empty:
+            return 0
+        width = ROLLUP_RESOLUTIONS[resolution]
+        epochs = local_index_to_epoch(candles.index).to_numpy()
+        traded = np.concatenate(([0.0], np.cumsum(candles['volume'].to_numpy(dtype=float))))
+        day_start = np.searchsorted(epochs, epochs - DAY_SECONDS + width, side='left')
+        day_volume = traded[1:] - traded[day_start]
+        keep = np.ones(len(candles), dtype=bool) if from_launch else epochs - DAY_SECONDS + width >= epochs[0]
+        liquidity = (candles['liquidity'].astype(object).where(candles['liquidity'].notna(), None).tolist()
+                     if 'liquidity' in candles else [None] * len(candles))
+        rows = [
+            (token_address, int(epoch), o, h, l, c, v, liq, int(epoch), int(epoch), 0)
+            for epoch, o, h, l, c, v, liq, kept in zip(
+                epochs, candles['open'].tolist(), candles['high'].tolist(), candles['low'].tolist(),
+                candles['close'].tolist(), day_volume.tolist(), liquidity, keep
+            )
+            if kept
+        ]
+        with self.connection() as conn:
+            with conn:
+                conn.executemany(UPSERT_ROLLUP_SQL.format(name=resolution), rows)
+        return len(rows)
+
+    def apply_retention(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Drop expired month partitions and delete expired rollups, alerts and patterns
+
+        Each partition drop and each batch of ``delete_batch_size`` deletes
+        holds the flush lock on its own: flushes create partitions and write
+        rollups, but should wait at most one batch, not the whole pass.
+        """
+        now = now or datetime.now()
+        policy = self.retention
+        removed = {}
+        with self.connection() as conn:
+            if policy.raw_days is not None:
+                cutoff = now - timedelta(days=policy.raw_days)
+                expired = [t for t in list(self._partitions) if partition_bounds(t)[1] <= cutoff]
+                for table in expired:
+                    with self._flush_lock, conn:
+                        conn.execute(f"DROP TABLE IF EXISTS {table}")
+                        self._partitions.discard(table)
+                removed['partitions'] = len(expired)
+
+            for name, days in policy.rollup_days.items():
+                if days is None:
+                    continue
+                cutoff = (now - timedelta(days=days)).timestamp()
+                removed[f'ohlcv_{name}'] = self._delete_expired(
+                    conn, f'price_ohlcv_{name}', 'token_address, bucket', 'bucket', cutoff
+                )
+            for table, days in (('alert_history', policy.alert_days),
+                                ('pattern_history', policy.pattern_days)):
+                if days is None:
+                    continue
+                removed[table] = self._delete_expired(
+                    conn, table, 'rowid', 'timestamp', format_timestamp(now - timedelta(days=days))
+                )
+        return removed
+
+    def _delete_expired(self, conn: sqlite3.Connection, table: str, key: str, column: str,
+                        cutoff) -> int:
+        batch = self.retention.delete_batch_size
+        removed = 0
+        while not self._closed.is_set():
+            with self._flush_lock, conn:
+                count = conn.execute(f"""
+                    DELETE FROM {table} WHERE ({key}) IN (
+                        SELECT {key} FROM {table} WHERE {column} < ? LIMIT ?
+                    )
+                """, (cutoff, batch)).rowcount
+            removed += count
+            if count < batch:
+                break
+        return removed
+
+    def compact(self, full: bool = False):
+        """Return free pages to the OS without blocking readers
+
+        Runs ``incremental_vacuum`` in short steps so the write lock is only
+        held briefly, then a passive WAL checkpoint. ``full`` (or a database
+        created before auto_vacuum was enabled) runs a one-off VACUUM, which
+        blocks writers for its duration but still lets WAL readers proceed.
+        """
+        with self.connection() as conn:
+            if full or not self._incremental_vacuum:
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("VACUUM")
+                self._incremental_vacuum = True
+            else:
+                while conn.execute("PRAGMA freelist_count").fetchall()[0][0] > 0:
+                    if self._closed.is_set():
+                        break
+                    conn.execute(f"PRAGMA incremental_vacuum({self.retention.vacuum_pages_per_step})")
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def stats(self) -> Dict[str, int]:
+        with self._buffer_lock:
+            return {
+                'buffered_ticks': len(self._buffer),
+                'buffered_alerts': len(self._alert_buffer),
+                'buffered_patterns': len(self._pattern_buffer),
+                'partitions': len(self._partitions)
+            }
+
+    def close(self):
+        """Flush pending writes and close pooled connections"""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._flush_wanted.set()
+        self._flusher.join(timeout=self.flush_interval + 1)
+        self._maintenance.join(timeout=5)
+        self.flush()
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
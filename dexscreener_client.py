@@ -0,0 +1,181 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+
+DEXSCREENER_BASE_URL = "https://api.dexscreener.com/latest/dex"
+# The tokens endpoint accepts up to 30 comma-separated addresses per call
+MAX_TOKENS_PER_REQUEST = 30
+
+
+def most_liquid_pair(pairs: List[Dict]) -> Optional[Dict]:
+    """Pick the pair with the deepest USD liquidity"""
+    if not pairs:
+        return None
+    return max(pairs, key=lambda pair: float((pair.get('liquidity') or {}).get('usd') or 0))
+
+
+class DexscreenerClient:
+    """Shared async Dexscreener client with a pooled session and a per-URL TTL cache
+
+    All network work runs on a single event loop (``loop``), because an
+    aiohttp session is bound to the loop that created it. Streamlit code calls
+    the ``*_sync`` helpers, which hand the coroutine to that loop.
+    """
+
+    def __init__(self, base_url: str = DEXSCREENER_BASE_URL, ttl: float = 30.0,
+                 timeout: float = 10.0, max_connections: int = 20,
+                 max_entries: int = 5000,
+                 loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.base_url = base_url.rstrip('/')
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_entries = max_entries
+        self.loop = loop
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
+        self._session = None
+        # url -> (expires_at, fetched_at, data)
+        self._cache: Dict[str, Tuple[float, float, Any]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start a private event loop thread if no loop was supplied"""
+        with self._loop_lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self.loop.run_forever,
+                    name="dexscreener-client",
+                    daemon=True
+                )
+                self._loop_thread.start()
+            return self.loop
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    def url_for(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    async def get_json(self, path: str, max_age: Optional[float] = None) -> Any:
+        """GET a Dexscreener path, served from cache or a shared in-flight request
+
+        ``max_age`` tightens freshness below the client TTL for callers that
+        poll faster than it, such as the price feed.
+        """
+        url = self.url_for(path)
+        entry = self._cache.get(url)
+        now = time.monotonic()
+        if entry is not None and entry[0] > now and (max_age is None or now - entry[1] <= max_age):
+            self.hits += 1
+            return entry[2]
+
+        task = self._inflight.get(url)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.misses += 1
+        task = asyncio.ensure_future(self._fetch(url))
+        self._inflight[url] = task
+        task.add_done_callback(lambda _: self._inflight.pop(url, None))
+        return await asyncio.shield(task)
+
+    async def _fetch(self, url: str) -> Any:
+        session = await self._get_session()
+        async with session.get(url) as response:
+            response.raise_for_status()
+            data = await response.json()
+        self._store(url, data)
+        return data
+
+    def _store(self, url: str, data: Any):
+        now = time.monotonic()
+        if len(self._cache) >= self.max_entries:
+            self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+            while len(self._cache) >= self.max_entries:
+                self._cache.pop(next(iter(self._cache)))
+        self._cache[url] = (now + self.ttl, now, data)
+
+    async def get_token_pairs(self, addresses: Iterable[str],
+                              chunk_size: int = MAX_TOKENS_PER_REQUEST,
+                              concurrency: int = 4,
+                              max_age: Optional[float] = None) -> Dict[str, List[Dict]]:
+        """Fetch pairs for many tokens in concurrent, bounded chunks
+
+        Returns every requested address mapped to its pairs (empty when none
+        were found). A failed chunk leaves its addresses empty instead of
+        failing the whole batch.
+        """
+        unique = list(dict.fromkeys(a for a in addresses if a))
+        chunk_size = max(1, min(chunk_size, MAX_TOKENS_PER_REQUEST))
+        chunks = [unique[i:i + chunk_size] for i in range(0, len(unique), chunk_size)]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_chunk(chunk):
+            async with semaphore:
+                return await self.get_json(f"tokens/{','.join(chunk)}", max_age)
+
+        results = await asyncio.gather(*(fetch_chunk(c) for c in chunks), return_exceptions=True)
+
+        pairs_by_address = {address: [] for address in unique}
+        for result in results:
+            if isinstance(result, BaseException) or not result:
+                continue
+            for pair in result.get('pairs') or []:
+                for side in ('baseToken', 'quoteToken'):
+                    address = (pair.get(side) or {}).get('address')
+                    if address in pairs_by_address:
+                        pairs_by_address[address].append(pair)
+        return pairs_by_address
+
+    async def run_async(self, coro) -> Any:
+        """Await a client coroutine from any event loop, running it on the client loop"""
+        loop = self._ensure_loop()
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def run_sync(self, coro, timeout: Optional[float] = None) -> Any:
+        """Run a client coroutine on the client loop from a blocking caller"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+        return future.result(timeout or self.timeout + 5)
+
+    def get_json_sync(self, path: str, timeout: Optional[float] = None) -> Any:
+        """Blocking wrapper around ``get_json`` for the Streamlit script thread"""
+        return self.run_sync(self.get_json(path), timeout)
+
+    def invalidate(self, path: Optional[str] = None):
+        """Drop one cached path, or the whole cache"""
+        if path is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(self.url_for(path), None)
+
+    def stats(self) -> Dict[str, float]:
+        """Cache counters; every hit or coalesced call is an upstream request saved"""
+        total = self.hits + self.misses + self.coalesced
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'hit_rate': (self.hits + self.coalesced) / total if total else 0.0,
+            'cached_urls': len(self._cache)
+        }
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
@@ -0,0 +1,342 @@
+import asyncio
+import base64
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import base58
+
+from solana_rpc import LATENCY_BUCKETS_MS, LatencyHistogram, RpcError, SolanaRPC
+
+logger = logging.getLogger(__name__)
+
+# Builds a signed wire transaction for a given recent blockhash (base58)
+TransactionBuilder = Callable[[str], bytes]
+# getSignatureStatuses accepts at most 256 signatures per call
+MAX_STATUS_BATCH = 256
+# The local part of a trade should take well under a millisecond
+SUBMIT_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5) + LATENCY_BUCKETS_MS
+
+
+@dataclass
+class BlockhashInfo:
+    blockhash: str
+    last_valid_block_height: int
+    slot: int
+    fetched_at: float
+
+
+@dataclass
+class PreparedTransaction:
+    """A signed transaction ready to send: encoded payload and its signature"""
+    payload: str  # base64 wire transaction
+    signature: str
+    blockhash: BlockhashInfo
+
+
+def prepare(build: TransactionBuilder, blockhash: BlockhashInfo) -> PreparedTransaction:
+    wire = build(blockhash.blockhash)
+    # The first signature (the fee payer's) is the transaction id: after the
+    # shortvec signature count, 64 bytes
+    return PreparedTransaction(
+        base64.b64encode(wire).decode(), base58.b58encode(wire[1:65]).decode(), blockhash
+    )
+
+
+class BlockhashCache:
+    """Keeps a recent blockhash on hand so trades never wait for one
+
+    ``run`` refreshes it every ``refresh_interval`` seconds and notifies
+    listeners, which the pipeline uses to re-sign armed templates.
+    """
+
+    def __init__(self, rpc: SolanaRPC, refresh_interval: float = 2.0, max_age: float = 30.0,
+                 commitment: str = 'confirmed'):
+        self.rpc = rpc
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.commitment = commitment
+        self.listeners: List[Callable[[BlockhashInfo], None]] = []
+        self._latest: Optional[BlockhashInfo] = None
+        self.refreshes = 0
+
+    def latest(self) -> Optional[BlockhashInfo]:
+        """The cached blockhash if it is young enough to sign with, without any I/O"""
+        info = self._latest
+        if info is None or time.monotonic() - info.fetched_at > self.max_age:
+            return None
+        return info
+
+    async def refresh(self) -> BlockhashInfo:
+        result = await self.rpc.call('getLatestBlockhash', [{'commitment': self.commitment}])
+        info = BlockhashInfo(
+            result['value']['blockhash'], result['value']['lastValidBlockHeight'],
+            result['context']['slot'], time.monotonic()
+        )
+        changed = self._latest is None or self._latest.blockhash != info.blockhash
+        self._latest = info
+        self.refreshes += 1
+        if changed:
+            for listener in self.listeners:
+                listener(info)
+        return info
+
+    async def get(self) -> BlockhashInfo:
+        return self.latest() or await self.refresh()
+
+    async def run(self):
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Blockhash refresh failed: %s", e)
+            await asyncio.sleep(self.refresh_interval)
+
+
+@dataclass
+class _Pending:
+    future: asyncio.Future
+    last_valid_block_height: int
+    sent_at: float
+
+
+class ConfirmationTracker:
+    """Resolves sent signatures from batched ``getSignatureStatuses`` polls
+
+    Every pending signature is checked in one batched request per
+    ``poll_interval``, together with the block height, so a transaction
+    whose blockhash expired unconfirmed is reported instead of awaited
+    forever. The poll loop sleeps while nothing is pending.
+    """
+
+    def __init__(self, rpc: SolanaRPC, poll_interval: float = 0.5, commitment: str = 'confirmed'):
+        self.rpc = rpc
+        self.poll_interval = poll_interval
+        self.commitment = commitment
+        self._pending: Dict[str, _Pending] = {}
+        self._wake: Optional[asyncio.Event] = None
+        self.confirm_latency = LatencyHistogram()
+        self.outcomes: Dict[str, int] = {'confirmed': 0, 'failed': 0, 'expired': 0}
+
+    def track(self, signature: str, last_valid_block_height: int) -> asyncio.Future:
+        """Future resolving to ``{'status', 'signature', 'slot', 'err', 'seconds'}``"""
+        pending = self._pending.get(signature)
+        if pending is not None:
+            return pending.future
+        future = asyncio.get_running_loop().create_future()
+        self._pending[signature] = _Pending(future, last_valid_block_height, time.perf_counter())
+        if self._wake is not None:
+            self._wake.set()
+        return future
+
+    def _resolve(self, signature: str, status: str, slot: Optional[int] = None, err: Any = None):
+        pending = self._pending.pop(signature)
+        seconds = time.perf_counter() - pending.sent_at
+        self.outcomes[status] += 1
+        if status == 'confirmed':
+            self.confirm_latency.observe(seconds * 1e3)
+        if not pending.future.done():
+            pending.future.set_result({
+                'status': status, 'signature': signature, 'slot': slot, 'err': err, 'seconds': seconds
+            })
+
+    async def poll_once(self):
+        signatures = list(self._pending)
+        if not signatures:
+            return
+        chunks = [signatures[i:i + MAX_STATUS_BATCH] for i in range(0, len(signatures), MAX_STATUS_BATCH)]
+        results = await self.rpc.batch(
+            [('getSignatureStatuses', [chunk]) for chunk in chunks]
+            + [('getBlockHeight', [{'commitment': self.commitment}])]
+        )
+        height = results[-1] if not isinstance(results[-1], RpcError) else None
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, RpcError):
+                logger.warning("Signature status poll failed: %s", result)
+                continue
+            for signature, status in zip(chunk, result['value']):
+                if signature not in self._pending:
+                    continue
+                if status is None:
+                    if height is not None and height > self._pending[signature].last_valid_block_height:
+                        self._resolve(signature, 'expired')
+                elif status.get('err') is not None:
+                    self._resolve(signature, 'failed', status.get('slot'), status['err'])
+                elif status.get('confirmationStatus') in ('confirmed', 'finalized'):
+                    self._resolve(signature, 'confirmed', status.get('slot'))
+
+    async def run(self):
+        self._wake = asyncio.Event()
+        while True:
+            if not self._pending:
+                self._wake.clear()
+                await self._wake.wait()
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Signature status poll failed: %s", e)
+            await asyncio.sleep(self.poll_interval)
+
+    def __len__(self):
+        return len(self._pending)
+
+
+class ExecutionPipeline:
+    """Low-latency send path: prefetched blockhash, pre-signed templates, async confirmation
+
+    A trade that can be known in advance (an armed trigger level) is
+    ``arm``-ed with a builder. It is signed as soon as a blockhash is
+    cached and re-signed in a worker thread on every blockhash refresh, so
+    when the trigger fires ``submit`` only sends a ready payload; one still
+    on the previous blockhash is signed on demand instead. ``sendTransaction`` skips
+    preflight and returns once the node accepts the transaction;
+    confirmation is tracked by a separate polling task and reported through
+    the returned future.
+    """
+
+    def __init__(self, rpc: SolanaRPC, blockhashes: Optional[BlockhashCache] = None,
+                 tracker: Optional[ConfirmationTracker] = None, skip_preflight: bool = True,
+                 max_retries: Optional[int] = None):
+        self.rpc = rpc
+        self.blockhashes = blockhashes or BlockhashCache(rpc)
+        self.tracker = tracker or ConfirmationTracker(rpc)
+        self.send_options: Dict[str, Any] = {'encoding': 'base64', 'skipPreflight': skip_preflight}
+        if max_retries is not None:
+            self.send_options['maxRetries'] = max_retries
+        # Armed templates are touched from the Streamlit thread and the loop
+        self._lock = threading.Lock()
+        self._builders: Dict[Hashable, TransactionBuilder] = {}
+        self._prepared: Dict[Hashable, PreparedTransaction] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._resigning: Optional[asyncio.Task] = None
+        self._resign_to: Optional[BlockhashInfo] = None
+        self.blockhashes.listeners.append(self._resign)
+        self.prepare_latency = LatencyHistogram(SUBMIT_BUCKETS_MS)
+        self.submit_latency = LatencyHistogram(SUBMIT_BUCKETS_MS)
+        self.presigned_hits = 0
+        self.signed_on_demand = 0
+
+    def ensure_started(self):
+        """Start the blockhash and confirmation loops on the running loop if needed"""
+        if self._tasks and not any(task.done() for task in self._tasks):
+            return
+        for task in self._tasks:
+            task.cancel()
+        loop = asyncio.get_running_loop()
+        self._tasks = [
+            loop.create_task(self.blockhashes.run(), name="blockhash-cache"),
+            loop.create_task(self.tracker.run(), name="confirmation-tracker"),
+        ]
+
+    def _sign(self, key: Hashable, build: TransactionBuilder, blockhash: BlockhashInfo):
+        try:
+            prepared = prepare(build, blockhash)
+        except Exception as e:
+            logger.warning("Could not pre-sign %s: %s", key, e)
+            return
+        with self._lock:
+            current = self._prepared.get(key)
+            # A slow re-sign must not replace a template signed with a newer blockhash
+            if self._builders.get(key) is build and (
+                    current is None or current.blockhash.fetched_at <= blockhash.fetched_at):
+                self._prepared[key] = prepared
+
+    def _resign(self, blockhash: BlockhashInfo):
+        # Signing takes about a millisecond per template; done inline it would
+        # hold the loop, and any trigger firing meanwhile, for all of them
+        self._resign_to = blockhash
+        if self._resigning is None or self._resigning.done():
+            self._resigning = asyncio.get_running_loop().create_task(self._resign_latest())
+
+    async def _resign_latest(self):
+        loop = asyncio.get_running_loop()
+        # Refreshes that land during a pass coalesce into one pass on the newest
+        while self._resign_to is not None:
+            blockhash, self._resign_to = self._resign_to, None
+            with self._lock:
+                builders = list(self._builders.items())
+            await loop.run_in_executor(None, self._sign_all, builders, blockhash)
+
+    def _sign_all(self, builders: List[Tuple[Hashable, TransactionBuilder]], blockhash: BlockhashInfo):
+        for key, build in builders:
+            self._sign(key, build, blockhash)
+
+    def arm(self, key: Hashable, build: TransactionBuilder):
+        """Register a trade to keep pre-signed under ``key``"""
+        with self._lock:
+            self._builders[key] = build
+            self._prepared.pop(key, None)
+        blockhash = self.blockhashes.latest()
+        if blockhash is not None:
+            self._sign(key, build, blockhash)
+
+    def disarm(self, key: Hashable):
+        with self._lock:
+            self._builders.pop(key, None)
+            self._prepared.pop(key, None)
+
+    def is_armed(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._builders
+
+    def armed(self) -> int:
+        with self._lock:
+            return len(self._builders)
+
+    async def _ready(self, key: Optional[Hashable], build: Optional[TransactionBuilder]) -> PreparedTransaction:
+        latest = self.blockhashes.latest()
+        with self._lock:
+            prepared = self._prepared.pop(key, None) if key is not None else None
+            build = self._builders.pop(key, build) if key is not None else build
+        if prepared is not None and latest is not None and prepared.blockhash.blockhash == latest.blockhash:
+            self.presigned_hits += 1
+            return prepared
+        if build is None:
+            raise KeyError(f"No transaction armed for {key!r}")
+        self.signed_on_demand += 1
+        return prepare(build, latest or await self.blockhashes.get())
+
+    async def submit(self, key: Optional[Hashable] = None, build: Optional[TransactionBuilder] = None,
+                     trigger_time: Optional[float] = None) -> Tuple[str, asyncio.Future]:
+        """Send the armed transaction for ``key`` (or sign ``build`` now)
+
+        Returns the signature once the node accepted it, plus a future for
+        its confirmation. The template is consumed; re-arm it to trade again.
+        ``trigger_time`` (a ``time.perf_counter()`` value) is when the
+        trigger fired, for the trigger-to-submit latency stats.
+        """
+        self.ensure_started()
+        started = trigger_time or time.perf_counter()
+        prepared = await self._ready(key, build)
+        self.prepare_latency.observe((time.perf_counter() - started) * 1e3)
+        signature = await self.rpc.call('sendTransaction', [prepared.payload, self.send_options])
+        self.submit_latency.observe((time.perf_counter() - started) * 1e3)
+        return signature, self.tracker.track(signature, prepared.blockhash.last_valid_block_height)
+
+    def stats(self) -> Dict[str, Any]:
+        blockhash = self.blockhashes.latest()
+        return {
+            'armed': self.armed(),
+            'presigned_hits': self.presigned_hits,
+            'signed_on_demand': self.signed_on_demand,
+            'blockhash_age_s': round(time.monotonic() - blockhash.fetched_at, 1) if blockhash else None,
+            'pending_confirmations': len(self.tracker),
+            'outcomes': dict(self.tracker.outcomes),
+            'trigger_to_payload': self.prepare_latency.summary(),
+            'trigger_to_submit': self.submit_latency.summary(),
+            'confirmation': self.tracker.confirm_latency.summary()
+        }
+
+    async def stop(self):
+        tasks = self._tasks + ([self._resigning] if self._resigning is not None else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._resigning = None
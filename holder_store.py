@@ -0,0 +1,176 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+HOLDER_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS holder_snapshots (
+        mint TEXT PRIMARY KEY,
+        slot INTEGER,
+        fetched_at REAL,
+        decimals INTEGER
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS holder_accounts (
+        mint TEXT,
+        account BLOB,
+        owner BLOB,
+        amount INTEGER,
+        PRIMARY KEY (mint, account)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS holder_metrics (
+        mint TEXT,
+        timestamp REAL,
+        slot INTEGER,
+        holders INTEGER,
+        top10_share REAL,
+        gini REAL,
+        hhi REAL,
+        dev_wallet_percentage REAL,
+        PRIMARY KEY (mint, slot)
+    ) WITHOUT ROWID
+    """,
+]
+
+METRIC_COLUMNS = ['holders', 'top10_share', 'gini', 'hhi', 'dev_wallet_percentage']
+
+
+@dataclass
+class HolderSnapshot:
+    """Non-empty token accounts of a mint as read at ``slot``, sorted by account"""
+    mint: str
+    slot: int
+    fetched_at: float
+    decimals: int
+    accounts: np.ndarray  # S44
+    owners: np.ndarray  # S32
+    amounts: np.ndarray  # uint64, raw units
+
+
+def diff_accounts(old: Optional[HolderSnapshot], accounts: np.ndarray, owners: np.ndarray,
+                  amounts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Rows of the new account set that are new or changed, and old accounts now gone
+
+    ``accounts`` must be sorted; matching is one ``searchsorted`` against
+    the stored snapshot rather than a per-account lookup.
+    """
+    if old is None or len(old.accounts) == 0:
+        return np.arange(len(accounts)), np.empty(0, dtype=accounts.dtype)
+    pos = np.minimum(np.searchsorted(old.accounts, accounts), len(old.accounts) - 1)
+    changed = ((old.accounts[pos] != accounts) | (old.amounts[pos] != amounts)
+               | (old.owners[pos] != owners))
+    removed = old.accounts[~np.isin(old.accounts, accounts, assume_unique=True)]
+    return np.flatnonzero(changed), removed
+
+
+class HolderSnapshotStore:
+    """Per-mint holder snapshots and concentration history in the cache database
+
+    A snapshot keeps every non-empty token account of a mint with the slot
+    it was read at. Within ``min_refresh`` seconds the snapshot is served
+    without touching the chain. A refresh is diffed against it and only the
+    new, changed and emptied accounts are written. Each analysis appends a
+    row of concentration metrics so trends can be charted from the cache.
+    """
+
+    def __init__(self, db_path: str = "memecoin_cache.db", min_refresh: float = 300,
+                 history_retention_days: float = 90):
+        self.db_path = db_path
+        self.min_refresh = min_refresh
+        self.history_retention_days = history_retention_days
+        self.last_delta: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            for statement in HOLDER_SCHEMA:
+                self._conn.execute(statement)
+
+    def snapshot(self, mint: str) -> Optional[HolderSnapshot]:
+        with self._lock:
+            header = self._conn.execute(
+                "SELECT slot, fetched_at, decimals FROM holder_snapshots WHERE mint = ?", (mint,)
+            ).fetchone()
+            if header is None:
+                return None
+            rows = self._conn.execute(
+                "SELECT account, owner, amount FROM holder_accounts WHERE mint = ? ORDER BY account",
+                (mint,)
+            ).fetchall()
+        accounts, owners, amounts = zip(*rows) if rows else ((), (), ())
+        return HolderSnapshot(
+            mint, header[0], header[1], header[2],
+            np.array(accounts, dtype='S44'),
+            np.array(owners, dtype='S32'),
+            # Stored as the signed bit pattern: SQLite integers are 64-bit signed
+            np.array(amounts, dtype=np.int64).view(np.uint64)
+        )
+
+    def is_fresh(self, snapshot: Optional[HolderSnapshot], now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return snapshot is not None and now - snapshot.fetched_at < self.min_refresh
+
+    def apply(self, mint: str, slot: int, decimals: int, accounts: np.ndarray, owners: np.ndarray,
+              amounts: np.ndarray, previous: Optional[HolderSnapshot] = None,
+              now: Optional[float] = None) -> HolderSnapshot:
+        """Store a fresh account set as a delta against ``previous``"""
+        now = time.time() if now is None else now
+        order = np.argsort(accounts, kind='stable')
+        accounts, owners, amounts = accounts[order], owners[order], amounts[order]
+        changed, removed = diff_accounts(previous, accounts, owners, amounts)
+        signed = amounts.view(np.int64)
+        with self._lock, self._conn:
+            self._conn.execute("""
+                INSERT INTO holder_snapshots (mint, slot, fetched_at, decimals) VALUES (?, ?, ?, ?)
+                ON CONFLICT (mint) DO UPDATE SET
+                    slot = excluded.slot, fetched_at = excluded.fetched_at, decimals = excluded.decimals
+            """, (mint, slot, now, decimals))
+            self._conn.executemany(
+                "DELETE FROM holder_accounts WHERE mint = ? AND account = ?",
+                ((mint, account) for account in removed.tolist())
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO holder_accounts (mint, account, owner, amount) VALUES (?, ?, ?, ?)",
+                ((mint, accounts[i], owners[i:i + 1].tobytes(), int(signed[i])) for i in changed)
+            )
+        self.last_delta = {'changed': len(changed), 'removed': len(removed), 'accounts': len(accounts)}
+        return HolderSnapshot(mint, slot, now, decimals, accounts, owners, amounts)
+
+    def record_metrics(self, mint: str, slot: int, distribution: Dict[str, float],
+                       dev_wallet_percentage: float, now: Optional[float] = None):
+        """One history point per snapshot slot; re-analysing a cached snapshot updates it"""
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO holder_metrics VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (mint, now, slot, distribution['holders'], distribution['top10_share'],
+                 distribution['gini'], distribution['hhi'], dev_wallet_percentage)
+            )
+            self._conn.execute(
+                "DELETE FROM holder_metrics WHERE mint = ? AND timestamp < ?",
+                (mint, now - self.history_retention_days * 86400)
+            )
+
+    def metrics_history(self, mint: str, since: Optional[float] = None) -> pd.DataFrame:
+        """Concentration metrics over time, indexed by datetime"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT timestamp, {', '.join(METRIC_COLUMNS)} FROM holder_metrics "
+                "WHERE mint = ? AND timestamp >= ? ORDER BY timestamp",
+                (mint, since or 0)
+            ).fetchall()
+        history = pd.DataFrame(rows, columns=['timestamp'] + METRIC_COLUMNS)
+        history.index = pd.to_datetime(history.pop('timestamp'), unit='s')
+        return history
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
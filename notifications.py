@@ -0,0 +1,228 @@
+import asyncio
+import json
+import logging
+import smtplib
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from email.message import EmailMessage
+from typing import Dict, List, Optional, Sequence
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ALERT_LOG = "alerts.jsonl"
+# Email subjects name the most severe alert in the batch
+SEVERITY_RANK = {'LOW': 0, 'MEDIUM': 1, 'HIGH': 2, 'CRITICAL': 3}
+
+
+@dataclass
+class Notification:
+    token_address: str
+    alert_type: str
+    severity: str
+    message: str
+    timestamp: float = field(default_factory=time.time)
+
+    def summary(self) -> str:
+        return f"[{self.severity}] {self.token_address}: {self.message}"
+
+
+class NotificationSink(ABC):
+    """Delivers a batch of notifications; raise to have the batch retried"""
+
+    name = "sink"
+
+    @abstractmethod
+    async def send(self, batch: List[Notification]):
+        ...
+
+    async def close(self):
+        pass
+
+
+class FileSink(NotificationSink):
+    """Appends one JSON line per notification to a file"""
+
+    name = "file"
+
+    def __init__(self, path: str = DEFAULT_ALERT_LOG):
+        self.path = path
+
+    def _write(self, lines: str):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+
+    async def send(self, batch: List[Notification]):
+        lines = ''.join(json.dumps(asdict(n)) + '\n' for n in batch)
+        await asyncio.to_thread(self._write, lines)
+
+
+class WebhookSink(NotificationSink):
+    """POSTs each batch as JSON; ``text`` suits Slack/Discord-style incoming webhooks"""
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        self.url = url
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def send(self, batch: List[Notification]):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        payload = {
+            'text': '\n'.join(n.summary() for n in batch),
+            'alerts': [asdict(n) for n in batch]
+        }
+        async with self._session.post(self.url, json=payload) as response:
+            response.raise_for_status()
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
+class EmailSink(NotificationSink):
+    """Sends one email per batch over SMTP (smtplib, run in a worker thread)"""
+
+    name = "email"
+
+    def __init__(self, host: str, sender: str, recipients: Sequence[str], port: int = 587,
+                 username: Optional[str] = None, password: Optional[str] = None,
+                 starttls: bool = True, timeout: float = 30.0):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = list(recipients)
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+
+    def _send(self, message: EmailMessage):
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password or '')
+            smtp.send_message(message)
+
+    async def send(self, batch: List[Notification]):
+        message = EmailMessage()
+        worst = max((n.severity for n in batch), key=lambda severity: SEVERITY_RANK.get(severity, -1))
+        message['Subject'] = f"[{worst}] {len(batch)} token alert(s)"
+        message['From'] = self.sender
+        message['To'] = ', '.join(self.recipients)
+        message.set_content('\n'.join(n.summary() for n in batch))
+        await asyncio.to_thread(self._send, message)
+
+
+class _SinkWorker:
+    def __init__(self, sink: NotificationSink, maxsize: int):
+        self.sink = sink
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.retries = 0
+
+
+class NotificationDispatcher:
+    """Fans alerts out to sinks without letting a slow sink hold anything up
+
+    ``publish`` never waits: each sink has its own bounded queue and worker
+    task, and when a queue is full its oldest notification is dropped. A
+    worker sends up to ``batch_size`` notifications at once, waiting at most
+    ``batch_delay`` seconds to fill a batch, and retries a failed batch with
+    exponential backoff before giving up on it.
+    """
+
+    def __init__(self, sinks: Sequence[NotificationSink], maxsize: int = 1000,
+                 batch_size: int = 20, batch_delay: float = 1.0,
+                 max_retries: int = 3, backoff: float = 1.0, max_backoff: float = 30.0):
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._maxsize = maxsize
+        self._workers = [_SinkWorker(sink, maxsize) for sink in sinks]
+
+    def ensure_started(self):
+        """Start sink workers on the running loop if they are not running"""
+        loop = asyncio.get_running_loop()
+        for worker in self._workers:
+            if worker.task is None or worker.task.done():
+                # Queues bind to the loop that first waits on them
+                worker.queue = asyncio.Queue(maxsize=self._maxsize)
+                worker.task = loop.create_task(self._run(worker), name=f"notify-{worker.sink.name}")
+
+    def publish(self, notification: Notification):
+        """Queue a notification for every sink; must be called on the dispatcher's loop"""
+        self.ensure_started()
+        for worker in self._workers:
+            if worker.queue.full():
+                worker.queue.get_nowait()
+                worker.dropped += 1
+            worker.queue.put_nowait(notification)
+
+    async def _next_batch(self, worker: _SinkWorker) -> List[Notification]:
+        batch = [await worker.queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.batch_delay
+        while len(batch) < self.batch_size:
+            if not worker.queue.empty():
+                batch.append(worker.queue.get_nowait())
+                continue
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(worker.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self, worker: _SinkWorker):
+        while True:
+            batch = await self._next_batch(worker)
+            for attempt in range(self.max_retries + 1):
+                try:
+                    await worker.sink.send(batch)
+                    worker.sent += len(batch)
+                    break
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        worker.failed += len(batch)
+                        logger.warning("Dropping %d notification(s) for %s: %s",
+                                       len(batch), worker.sink.name, e)
+                        break
+                    worker.retries += 1
+                    await asyncio.sleep(min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    async def stop(self):
+        for worker in self._workers:
+            if worker.task is not None:
+                worker.task.cancel()
+                try:
+                    await worker.task
+                except asyncio.CancelledError:
+                    pass
+                worker.task = None
+            await worker.sink.close()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            worker.sink.name: {
+                'queued': worker.queue.qsize(),
+                'sent': worker.sent,
+                'failed': worker.failed,
+                'dropped': worker.dropped,
+                'retries': worker.retries
+            }
+            for worker in self._workers
+        }
@@ -0,0 +1,140 @@
+import time
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import find_peaks
+
+RUG_INDICATORS = {
+    'min_liquidity_age_days': 2,
+    'min_tx_count': 100,
+    'min_liquidity_usd': 10000,
+    'suspicious_buy_sell_ratio': 0.3,  # Very low sells compared to buys
+    'suspicious_holder_count': 10
+}
+
+# Risk added by each red flag, and the factor reported for it
+RISK_FLAGS = {
+    'new_pair': (0.3, "Very new token (high risk)"),
+    'low_tx_count': (0.2, "Low transaction count"),
+    'low_liquidity': (0.2, "Low liquidity"),
+    'suspicious_ratio': (0.2, "Suspicious buy/sell ratio"),
+    'sudden_drops': (0.3, "History of sudden price drops"),
+    'liquidity_removals': (0.4, "History of liquidity removals"),
+}
+
+
+def detect_drops(values, threshold: float, window: int) -> np.ndarray:
+    """Indices of local peaks followed by a fall of at least ``threshold`` within ``window`` samples
+
+    Peaks come from ``scipy.signal.find_peaks``; the lowest value in the
+    ``window`` samples after every point is taken in one strided pass, so
+    a series is checked without a per-sample Python loop. Non-finite
+    samples (missing liquidity on backfilled candles) are gaps: each run of
+    finite samples is checked on its own, so a fall is never measured
+    across one, and indices refer to positions in ``values``.
+    """
+    values = np.asarray(values, dtype=float)
+    finite = np.isfinite(values)
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], finite.view(np.int8), [0]))))
+    hits = [
+        start + _run_drops(values[start:end], threshold, window, from_first=start == 0)
+        for start, end in zip(edges[::2], edges[1::2])
+    ]
+    return np.concatenate(hits) if hits else np.empty(0, dtype=int)
+
+
+def _run_drops(values: np.ndarray, threshold: float, window: int, from_first: bool) -> np.ndarray:
+    if len(values) < 2:
+        return np.empty(0, dtype=int)
+    peaks, _ = find_peaks(values)
+    if from_first and values[0] > values[1]:
+        # A fall straight from the first sample (a pull right after launch) counts
+        # too; a run that starts after a gap has no launch in it
+        peaks = np.concatenate(([0], peaks))
+    peaks = peaks[values[peaks] > 0]
+    if len(peaks) == 0:
+        return peaks
+
+    padded = np.concatenate((values[1:], np.full(window, np.inf)))
+    forward_min = sliding_window_view(padded, window).min(axis=1)
+    drop = 1 - forward_min[peaks] / values[peaks]
+    return peaks[drop >= threshold]
+
+
+def _column(pairs: Sequence[Mapping], outer: str, inner: str, default=np.nan) -> np.ndarray:
+    out = np.full(len(pairs), default, dtype=float)
+    for i, pair in enumerate(pairs):
+        try:
+            out[i] = float(pair[outer][inner])
+        except (KeyError, TypeError, ValueError):
+            pass
+    return out
+
+
+def pairs_to_health_frame(pairs: Sequence[Mapping], index: Optional[Iterable] = None) -> pd.DataFrame:
+    """Columnar health inputs from Dexscreener pair dicts"""
+    created = np.array([p.get('pairCreatedAt') or np.nan for p in pairs], dtype=float)
+    buys = np.zeros(len(pairs))
+    sells = np.zeros(len(pairs))
+    for i, pair in enumerate(pairs):
+        txns = (pair.get('txns') or {}).get('h24') or {}
+        buys[i] = float(txns.get('buys', 0) or 0)
+        sells[i] = float(txns.get('sells', 0) or 0)
+    return pd.DataFrame({
+        'liquidity_usd': _column(pairs, 'liquidity', 'usd'),
+        'created_at': created,
+        'buys': buys,
+        'sells': sells,
+    }, index=index)
+
+
+def screen_pairs(frame: pd.DataFrame, sudden_drops=None, liquidity_removals=None,
+                 indicators: Optional[Dict] = None, now: Optional[float] = None) -> pd.DataFrame:
+    """Vectorized rug-risk screen, highest risk first
+
+    ``frame`` holds the ``pairs_to_health_frame`` columns. ``sudden_drops``
+    and ``liquidity_removals`` are optional per-row event counts from stored
+    history. Returns the metrics, one boolean column per red flag and a
+    ``risk_score`` capped at 1.0.
+    """
+    indicators = {**RUG_INDICATORS, **(indicators or {})}
+    now = time.time() if now is None else now
+    n = len(frame)
+
+    created = frame['created_at'].to_numpy(dtype=float)
+    # Dexscreener reports pairCreatedAt in milliseconds
+    created = np.where(created > 1e11, created / 1000, created)
+    age_days = (now - created) / 86400
+    buys = frame['buys'].to_numpy(dtype=float)
+    sells = frame['sells'].to_numpy(dtype=float)
+    liquidity = frame['liquidity_usd'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        buy_sell_ratio = np.where(sells > 0, buys / np.where(sells > 0, sells, 1), np.inf)
+    drops = np.zeros(n) if sudden_drops is None else np.asarray(sudden_drops, dtype=float)
+    removals = np.zeros(n) if liquidity_removals is None else np.asarray(liquidity_removals, dtype=float)
+
+    result = pd.DataFrame({
+        'liquidity_usd': liquidity,
+        'pair_age_days': np.floor(age_days),
+        'tx_count_24h': buys + sells,
+        'buy_sell_ratio': buy_sell_ratio,
+        'sudden_drops': drops,
+        'liquidity_removals': removals,
+        # Unknown age or liquidity counts against the pair, as it would on a rug
+        'new_pair': ~(age_days >= indicators['min_liquidity_age_days']),
+        'low_tx_count': buys + sells < indicators['min_tx_count'],
+        'low_liquidity': ~(liquidity >= indicators['min_liquidity_usd']),
+        'suspicious_ratio': buy_sell_ratio > 1 / indicators['suspicious_buy_sell_ratio'],
+    }, index=frame.index)
+    risk = np.zeros(n)
+    for flag, (weight, _) in RISK_FLAGS.items():
+        risk += weight * (result[flag].to_numpy() > 0)
+    result['risk_score'] = np.minimum(risk, 1.0)
+    return result.sort_values(['risk_score', 'liquidity_usd'], ascending=[False, True], kind='stable')
+
+
+def risk_factors(row: Mapping) -> List[str]:
+    """Human-readable red flags of one screened row"""
+    return [factor for flag, (_, factor) in RISK_FLAGS.items() if row[flag] > 0]
@@ -0,0 +1,303 @@
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import talib
+from scipy.signal import lfilter
+from talib import abstract
+
+# TA-Lib candlestick function -> pattern type stored in pattern_history
+CANDLESTICK_PATTERNS = {
+    'CDLHAMMER': 'hammer',
+    'CDLINVERTEDHAMMER': 'inverted_hammer',
+    'CDLSHOOTINGSTAR': 'shooting_star',
+    'CDLENGULFING': 'engulfing',
+    'CDLDOJI': 'doji',
+    'CDLMORNINGSTAR': 'morning_star',
+    'CDLEVENINGSTAR': 'evening_star',
+    'CDL3WHITESOLDIERS': 'three_white_soldiers',
+    'CDL3BLACKCROWS': 'three_black_crows',
+}
+# Candles TA-Lib needs before the first one it can score, for the longest pattern
+PATTERN_LOOKBACK = max(abstract.Function(name).lookback for name in CANDLESTICK_PATTERNS)
+
+INDICATOR_DESCRIPTIONS = {
+    'rsi_overbought': "RSI crossed above {rsi_high:g}",
+    'rsi_oversold': "RSI crossed below {rsi_low:g}",
+    'macd_bullish_cross': "MACD crossed above its signal line",
+    'macd_bearish_cross': "MACD crossed below its signal line",
+    'bollinger_breakout_up': "Close broke above the upper Bollinger band",
+    'bollinger_breakout_down': "Close broke below the lower Bollinger band",
+}
+
+
+def indicator_signals(prev: Dict, cur: Dict, rsi_high: float = 70, rsi_low: float = 30) -> Dict:
+    """Crossing events between two indicator snapshots
+
+    Works element-wise on arrays (a whole seeded history at once) as well as
+    on scalars (one incremental update), so both paths share one definition.
+    """
+    with np.errstate(invalid='ignore'):
+        return {
+            'rsi_overbought': (prev['rsi'] <= rsi_high) & (cur['rsi'] > rsi_high),
+            'rsi_oversold': (prev['rsi'] >= rsi_low) & (cur['rsi'] < rsi_low),
+            'macd_bullish_cross': (prev['macd_hist'] <= 0) & (cur['macd_hist'] > 0),
+            'macd_bearish_cross': (prev['macd_hist'] >= 0) & (cur['macd_hist'] < 0),
+            'bollinger_breakout_up': (prev['close'] <= prev['bb_upper']) & (cur['close'] > cur['bb_upper']),
+            'bollinger_breakout_down': (prev['close'] >= prev['bb_lower']) & (cur['close'] < cur['bb_lower']),
+        }
+
+
+def signal_confidence(signal: str, snapshot: Dict, rsi_high: float = 70, rsi_low: float = 30) -> float:
+    """RSI signals grow more confident the further past the level they close"""
+    if signal == 'rsi_overbought':
+        return min(1.0, 0.5 + float(snapshot['rsi'] - rsi_high) / 60)
+    if signal == 'rsi_oversold':
+        return min(1.0, 0.5 + float(rsi_low - snapshot['rsi']) / 60)
+    return 0.6
+
+
+def _wilder_average(values: np.ndarray, period: int) -> float:
+    """Last value of Wilder's moving average, seeded with the mean of the first period
+
+    This is the smoothing TA-Lib's RSI uses; as a first-order IIR filter it
+    runs over the whole series in one ``lfilter`` call.
+    """
+    seed = values[:period].mean()
+    if len(values) == period:
+        return float(seed)
+    smoothed, _ = lfilter([1 / period], [1, -(period - 1) / period], values[period:],
+                          zi=[(period - 1) / period * seed])
+    return float(smoothed[-1])
+
+
+class IndicatorState:
+    """RSI, MACD and Bollinger bands for one token, updated O(1) per closed candle
+
+    ``seed`` runs TA-Lib over the history once and keeps only what the
+    recurrences need: the two MACD EMAs and its signal EMA, Wilder's average
+    gain and loss, and the last ``bb_period`` closes with running sums.
+    """
+
+    def __init__(self, rsi_period: int = 14, macd_fast: int = 12, macd_slow: int = 26,
+                 macd_signal: int = 9, bb_period: int = 20, bb_dev: float = 2.0):
+        self.rsi_period = rsi_period
+        self.macd_fast = macd_fast
+        self.macd_slow = macd_slow
+        self.macd_signal = macd_signal
+        self.bb_period = bb_period
+        self.bb_dev = bb_dev
+        self.ready = False
+
+    @property
+    def min_candles(self) -> int:
+        return max(self.macd_slow + self.macd_signal, self.rsi_period + 1, self.bb_period) + 1
+
+    def seed(self, close: np.ndarray) -> Dict[str, np.ndarray]:
+        """Initialise from a close series; returns the indicator series over it"""
+        close = np.asarray(close, dtype=float)
+        if len(close) < self.min_candles:
+            self.ready = False
+            return {}
+
+        fast = talib.EMA(close, self.macd_fast)
+        slow = talib.EMA(close, self.macd_slow)
+        macd = fast - slow
+        valid = ~np.isnan(macd)
+        signal = np.full_like(close, np.nan)
+        signal[valid] = talib.EMA(macd[valid], self.macd_signal)
+        rsi = talib.RSI(close, self.rsi_period)
+        bb_upper, bb_middle, bb_lower = talib.BBANDS(
+            close, self.bb_period, self.bb_dev, self.bb_dev
+        )
+
+        self._fast, self._slow, self._signal = float(fast[-1]), float(slow[-1]), float(signal[-1])
+        change = np.diff(close)
+        self._avg_gain = _wilder_average(np.clip(change, 0, None), self.rsi_period)
+        self._avg_loss = _wilder_average(np.clip(-change, 0, None), self.rsi_period)
+        self._window = deque(close[-self.bb_period:].tolist(), maxlen=self.bb_period)
+        self._sum = float(np.sum(self._window))
+        self._sumsq = float(np.sum(np.square(self._window)))
+        self._close = float(close[-1])
+        self.ready = True
+
+        return {
+            'close': close, 'rsi': rsi, 'macd': macd, 'macd_signal': signal,
+            'macd_hist': macd - signal, 'bb_upper': bb_upper,
+            'bb_middle': bb_middle, 'bb_lower': bb_lower,
+        }
+
+    def update(self, close: float) -> Dict[str, float]:
+        """Fold in one closed candle and return the new snapshot"""
+        close = float(close)
+        self._fast += (close - self._fast) * 2 / (self.macd_fast + 1)
+        self._slow += (close - self._slow) * 2 / (self.macd_slow + 1)
+        self._signal += (self._fast - self._slow - self._signal) * 2 / (self.macd_signal + 1)
+
+        p = self.rsi_period
+        change = close - self._close
+        self._avg_gain = (self._avg_gain * (p - 1) + max(change, 0.0)) / p
+        self._avg_loss = (self._avg_loss * (p - 1) + max(-change, 0.0)) / p
+
+        oldest = self._window[0]
+        self._window.append(close)
+        self._sum += close - oldest
+        self._sumsq += close * close - oldest * oldest
+        self._close = close
+        return self.snapshot()
+
+    def snapshot(self) -> Dict[str, float]:
+        if not self.ready:
+            return {}
+        total = self._avg_gain + self._avg_loss
+        mean = self._sum / self.bb_period
+        std = math.sqrt(max(self._sumsq / self.bb_period - mean * mean, 0.0))
+        macd = self._fast - self._slow
+        return {
+            'close': self._close,
+            'rsi': 100 * self._avg_gain / total if total > 0 else 50.0,
+            'macd': macd,
+            'macd_signal': self._signal,
+            'macd_hist': macd - self._signal,
+            'bb_upper': mean + self.bb_dev * std,
+            'bb_middle': mean,
+            'bb_lower': mean - self.bb_dev * std,
+        }
+
+
+@dataclass
+class _TokenPatterns:
+    indicators: IndicatorState
+    resolution: pd.Timedelta
+    last_candle: pd.Timestamp
+    # Trailing candles kept so TA-Lib has the context for new ones
+    tail: pd.DataFrame
+    hits: deque = field(default_factory=lambda: deque(maxlen=1000))
+
+
+class PatternDetector:
+    """Candlestick patterns and indicator signals per token, computed incrementally
+
+    The first call for a token runs TA-Lib over its whole history. Later
+    calls only look at candles closed since the previous call: candlestick
+    functions run over those plus ``PATTERN_LOOKBACK`` trailing candles, and
+    indicators advance through ``IndicatorState.update``. The still-forming
+    last candle is never scored. New detections are buffered in the cache and
+    written to pattern_history with its next flush.
+    """
+
+    def __init__(self, cache=None, rsi_high: float = 70, rsi_low: float = 30, **indicator_params):
+        self.cache = cache
+        self.rsi_high = rsi_high
+        self.rsi_low = rsi_low
+        self.indicator_params = indicator_params
+        self._tokens: Dict[str, _TokenPatterns] = {}
+
+    @staticmethod
+    def _resolution(index: pd.DatetimeIndex) -> pd.Timedelta:
+        return pd.Series(index[-10:]).diff().median()
+
+    def _candle_hits(self, candles: pd.DataFrame, start: int) -> List[Tuple]:
+        """Candlestick hits among ``candles[start:]``, as (type, timestamp, confidence, description)"""
+        o, h, l, c = (candles[col].to_numpy(dtype=float) for col in ('open', 'high', 'low', 'close'))
+        hits = []
+        for function, pattern_type in CANDLESTICK_PATTERNS.items():
+            values = getattr(talib, function)(o, h, l, c)[start:]
+            for i in np.flatnonzero(values):
+                value = int(values[i])
+                direction = 'Bullish' if value > 0 else 'Bearish'
+                # TA-Lib scores 100 for a pattern and 200 when it is confirmed
+                confidence = 0.9 if abs(value) >= 200 else 0.7
+                hits.append((pattern_type, candles.index[start + i], confidence,
+                             f"{direction} {pattern_type.replace('_', ' ')}"))
+        return hits
+
+    def _signal_hits(self, index, prev: Dict, cur: Dict) -> List[Tuple]:
+        index = pd.DatetimeIndex(index)
+        hits = []
+        for signal, fired in indicator_signals(prev, cur, self.rsi_high, self.rsi_low).items():
+            description = INDICATOR_DESCRIPTIONS[signal].format(rsi_high=self.rsi_high, rsi_low=self.rsi_low)
+            for i in np.flatnonzero(np.atleast_1d(fired)):
+                snapshot = {k: np.atleast_1d(v)[i] for k, v in cur.items()}
+                hits.append((signal, index[i],
+                             signal_confidence(signal, snapshot, self.rsi_high, self.rsi_low),
+                             description))
+        return hits
+
+    def _seed(self, token_address: str, candles: pd.DataFrame) -> Optional[List[Tuple]]:
+        indicators = IndicatorState(**self.indicator_params)
+        series = indicators.seed(candles['close'].to_numpy())
+        if not indicators.ready:
+            return None
+        hits = self._candle_hits(candles, 0)
+        prev = {k: v[:-1] for k, v in series.items()}
+        cur = {k: v[1:] for k, v in series.items()}
+        hits += self._signal_hits(candles.index[1:], prev, cur)
+        self._tokens[token_address] = _TokenPatterns(
+            indicators=indicators,
+            resolution=self._resolution(candles.index),
+            last_candle=candles.index[-1],
+            tail=candles.iloc[-PATTERN_LOOKBACK:]
+        )
+        return hits
+
+    def _advance(self, state: _TokenPatterns, new: pd.DataFrame) -> List[Tuple]:
+        context = pd.concat([state.tail, new])
+        hits = self._candle_hits(context, len(state.tail))
+        prev = state.indicators.snapshot()
+        for timestamp, close in zip(new.index, new['close'].to_numpy()):
+            cur = state.indicators.update(close)
+            hits += self._signal_hits([timestamp], prev, cur)
+            prev = cur
+        state.tail = context.iloc[-PATTERN_LOOKBACK:]
+        state.last_candle = new.index[-1]
+        return hits
+
+    def update(self, token_address: str, price_data: pd.DataFrame) -> List[Tuple]:
+        """Process candles closed since the last call; returns the new detections"""
+        closed = price_data.iloc[:-1].dropna(subset=['open', 'high', 'low', 'close'])
+        if len(closed) < 2:
+            return []
+        state = self._tokens.get(token_address)
+        if state is None or self._resolution(closed.index) != state.resolution:
+            hits = self._seed(token_address, closed)
+        else:
+            new = closed[closed.index > state.last_candle]
+            hits = self._advance(state, new) if len(new) else []
+        if not hits:
+            return []
+
+        self._tokens[token_address].hits.extend(hits)
+        if self.cache is not None:
+            self.cache.record_patterns(token_address, hits)
+        return hits
+
+    def detect_patterns(self, token_address: str, price_data: pd.DataFrame) -> Dict[str, Dict]:
+        """Patterns seen within ``price_data``'s time range, keyed by pattern type"""
+        if price_data is None or price_data.empty:
+            return {}
+        self.update(token_address, price_data)
+        state = self._tokens.get(token_address)
+        if state is None:
+            return {}
+
+        start = price_data.index[0]
+        patterns: Dict[str, Dict] = {}
+        for pattern_type, timestamp, confidence, description in state.hits:
+            if timestamp < start:
+                continue
+            entry = patterns.setdefault(pattern_type, {
+                'confidence': 0.0, 'locations': [], 'description': description
+            })
+            entry['confidence'] = max(entry['confidence'], confidence)
+            entry['locations'].append(timestamp)
+            entry['description'] = description
+        return patterns
+
+    def indicators(self, token_address: str) -> Dict[str, float]:
+        """Latest RSI/MACD/Bollinger values for a token seen by ``detect_patterns``"""
+        state = self._tokens.get(token_address)
+        return state.indicators.snapshot() if state else {}
@@ -0,0 +1,229 @@
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Set
+
+from dexscreener_client import MAX_TOKENS_PER_REQUEST, most_liquid_pair
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PriceUpdate:
+    token_address: str
+    price: float
+    timestamp: float
+    pair: Dict = field(repr=False, default_factory=dict)
+
+
+@dataclass
+class _TokenState:
+    subscribers: Set['PriceSubscription'] = field(default_factory=set)
+    price: Optional[float] = None
+    # EWMA of absolute log returns between polls
+    volatility: float = 0.0
+    interval: float = 5.0
+    next_poll: float = 0.0
+    # Last pair seen, replayed to new subscribers with the price
+    pair: Dict = field(default_factory=dict)
+
+
+class PriceSubscription:
+    """Async iterator over price updates for a set of tokens
+
+    Each subscription has its own small queue. When a consumer falls behind,
+    the oldest update is dropped, because only the latest price matters for
+    triggers.
+    """
+
+    def __init__(self, feed: 'PriceFeed', tokens: Iterable[str], maxsize: int = 1):
+        self.feed = feed
+        self.tokens = set(tokens)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.closed = False
+
+    def _publish(self, update: PriceUpdate):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(update)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> PriceUpdate:
+        if self.closed and self.queue.empty():
+            raise StopAsyncIteration
+        update = await self.queue.get()
+        if update is None:
+            raise StopAsyncIteration
+        return update
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.feed.unsubscribe(self)
+            # Wakes a consumer blocked in __anext__
+            self._publish(None)
+
+
+class PriceFeed:
+    """One polling task for every subscribed token, fanned out to subscribers
+
+    Due tokens are fetched together through the Dexscreener batch endpoint
+    (30 per request). Each token's poll interval shrinks when its price moves
+    and stretches while it is quiet, staying between ``min_interval`` and
+    ``max_interval`` seconds.
+    """
+
+    def __init__(self, dex_client, cache=None, base_interval: float = 5.0,
+                 min_interval: float = 2.0, max_interval: float = 60.0,
+                 target_move: float = 0.005, concurrency: int = 4):
+        self.dex_client = dex_client
+        self.cache = cache
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        # Per-poll move (as a log return) at which a token is polled at base_interval
+        self.target_move = target_move
+        self.concurrency = concurrency
+        self._tokens: Dict[str, _TokenState] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.polls = 0
+        self.requests = 0
+
+    def ensure_started(self):
+        """Start the polling task on the running loop if it is not already running"""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="price-feed")
+        return self._task
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def subscribe(self, *tokens: str, maxsize: int = 1) -> PriceSubscription:
+        """Subscribe to updates for ``tokens``; must be called on the feed's loop"""
+        self.ensure_started()
+        subscription = PriceSubscription(self, tokens, maxsize)
+        for token in subscription.tokens:
+            state = self._tokens.setdefault(token, _TokenState(
+                volatility=self.target_move, interval=self.base_interval
+            ))
+            state.subscribers.add(subscription)
+            if state.price is not None:
+                subscription._publish(PriceUpdate(token, state.price, time.time(), state.pair))
+        self._wakeup.set()
+        return subscription
+
+    def unsubscribe(self, subscription: PriceSubscription):
+        for token in subscription.tokens:
+            state = self._tokens.get(token)
+            if state is None:
+                continue
+            state.subscribers.discard(subscription)
+            if not state.subscribers:
+                del self._tokens[token]
+
+    def latest(self, token_address: str) -> Optional[float]:
+        state = self._tokens.get(token_address)
+        return state.price if state else None
+
+    def _next_interval(self, state: _TokenState) -> float:
+        scale = self.target_move / max(state.volatility, 1e-9)
+        return min(self.max_interval, max(self.min_interval, self.base_interval * scale))
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Pull in tokens that are almost due so they share this poll's requests
+            horizon = loop.time() + self.min_interval / 2
+            due = [t for t, s in self._tokens.items() if s.next_poll <= horizon]
+            if due:
+                try:
+                    await self._poll(due, loop)
+                except Exception:
+                    # Subscribers only get updates from this task; it must outlive a bad poll
+                    logger.exception("Price feed poll of %d tokens failed", len(due))
+                    for token in due:
+                        state = self._tokens.get(token)
+                        if state is not None and state.next_poll <= horizon:
+                            state.next_poll = loop.time() + state.interval
+
+            if self._tokens:
+                wait = min(s.next_poll for s in self._tokens.values()) - loop.time()
+            else:
+                wait = self.max_interval
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(wait, 0.05))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self, tokens, loop):
+        self.polls += 1
+        self.requests += math.ceil(len(tokens) / MAX_TOKENS_PER_REQUEST)
+        try:
+            pairs_by_address = await self.dex_client.run_async(self.dex_client.get_token_pairs(
+                tokens, concurrency=self.concurrency, max_age=self.min_interval / 2
+            ))
+        except Exception as e:
+            logger.warning("Price feed poll failed: %s", e)
+            pairs_by_address = {}
+
+        now = loop.time()
+        for token in tokens:
+            state = self._tokens.get(token)
+            if state is None:
+                continue
+            pair = most_liquid_pair(pairs_by_address.get(token) or [])
+            try:
+                price = float(pair['priceUsd'])
+            except (TypeError, KeyError, ValueError):
+                state.next_poll = now + self.max_interval
+                continue
+
+            if state.price and price > 0:
+                move = abs(math.log(price / state.price))
+                state.volatility = 0.7 * state.volatility + 0.3 * move
+            state.price = price
+            state.pair = pair
+            state.interval = self._next_interval(state)
+            state.next_poll = now + state.interval
+
+            if self.cache is not None:
+                try:
+                    self.cache.cache_price_data(token, {
+                        'price': price,
+                        'volume': float((pair.get('volume') or {}).get('h24') or 0),
+                        'liquidity': float((pair.get('liquidity') or {}).get('usd') or 0)
+                    })
+                except Exception as e:
+                    logger.warning("Could not cache price of %s: %s", token, e)
+
+            update = PriceUpdate(token, price, time.time(), pair)
+            for subscription in list(state.subscribers):
+                subscription._publish(update)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'tokens': len(self._tokens),
+            'subscriptions': len({s for st in self._tokens.values() for s in st.subscribers}),
+            'polls': self.polls,
+            'requests': self.requests,
+            'requests_per_poll': self.requests / self.polls if self.polls else 0.0
+        }
@@ -0,0 +1,111 @@
+from typing import Dict, Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Weight of each sub-score in the 0-100 risk score; terms where a higher
+# sub-score means *less* risk are applied as (1 - score)
+RISK_WEIGHTS = {
+    'liquidity_score': 30,
+    'volume_score': 20,
+    'price_volatility': 25,
+    'sentiment_risk': 15,
+    'social_volume': 10,
+}
+METRIC_COLUMNS = list(RISK_WEIGHTS)
+INPUT_COLUMNS = ['liquidity', 'volume', 'price_change', 'sentiment_volatility', 'total_tweets']
+
+
+def _nested_float(pair: Mapping, outer: str, inner: str, default=np.nan) -> float:
+    try:
+        value = pair[outer][inner]
+    except (KeyError, TypeError):
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def pairs_to_frame(pairs: Sequence[Mapping], sentiments: Optional[Sequence[Mapping]] = None,
+                   index: Optional[Iterable] = None) -> pd.DataFrame:
+    """Columnar risk inputs from Dexscreener pair dicts (and optional sentiment dicts)
+
+    Missing or malformed liquidity, volume or sentiment fields become NaN,
+    which the scorer treats as unscoreable (risk 100, as the single-pair
+    scorer always returned when a key was missing); only a missing price
+    change counts as 0.
+    """
+    sentiments = sentiments if sentiments is not None else [{}] * len(pairs)
+    return pd.DataFrame({
+        'liquidity': [_nested_float(p, 'liquidity', 'usd') for p in pairs],
+        'volume': [_nested_float(p, 'volume', 'h24') for p in pairs],
+        'price_change': [_nested_float(p, 'priceChange', 'h24', 0.0) for p in pairs],
+        'sentiment_volatility': [_float(s.get('sentiment_volatility')) for s in sentiments],
+        'total_tweets': [_float(s.get('total_tweets')) for s in sentiments],
+    }, index=index)
+
+
+def score_risk(table) -> pd.DataFrame:
+    """Vectorized risk sub-scores and weighted risk score for many pairs
+
+    ``table`` is a DataFrame (or mapping of equal-length arrays) with the
+    ``INPUT_COLUMNS``. Returns the sub-score columns plus ``risk_score``
+    and ``valid``; rows that cannot be scored get a risk score of 100,
+    matching the single-pair fallback.
+    """
+    frame = table if isinstance(table, pd.DataFrame) else pd.DataFrame(table)
+    liquidity = frame['liquidity'].to_numpy(dtype=float)
+    volume = frame['volume'].to_numpy(dtype=float)
+    price_change = frame['price_change'].to_numpy(dtype=float)
+    sentiment_volatility = frame['sentiment_volatility'].to_numpy(dtype=float)
+    total_tweets = frame['total_tweets'].to_numpy(dtype=float)
+
+    metrics = {
+        'liquidity_score': np.minimum(liquidity / 1_000_000, 1),
+        'volume_score': np.minimum(volume / 100_000, 1),
+        'price_volatility': np.abs(price_change) / 100,
+        'sentiment_risk': np.abs(sentiment_volatility),
+        'social_volume': np.minimum(total_tweets / 1000, 1),
+    }
+    risk_score = (
+        (1 - metrics['liquidity_score']) * RISK_WEIGHTS['liquidity_score'] +
+        (1 - metrics['volume_score']) * RISK_WEIGHTS['volume_score'] +
+        metrics['price_volatility'] * RISK_WEIGHTS['price_volatility'] +
+        metrics['sentiment_risk'] * RISK_WEIGHTS['sentiment_risk'] +
+        (1 - metrics['social_volume']) * RISK_WEIGHTS['social_volume']
+    )
+    valid = np.isfinite(risk_score)
+
+    result = pd.DataFrame(metrics, index=frame.index)
+    result['risk_score'] = np.where(valid, risk_score, 100.0)
+    result['valid'] = valid
+    return result
+
+
+def score_pairs(pairs_by_address: Mapping[str, Mapping],
+                sentiment_by_address: Optional[Mapping[str, Mapping]] = None) -> pd.DataFrame:
+    """Score one pair per token address; the result is indexed by address
+
+    A token missing from ``sentiment_by_address`` is unscoreable (risk 100).
+    """
+    sentiment_by_address = sentiment_by_address or {}
+    addresses = list(pairs_by_address)
+    frame = pairs_to_frame(
+        [pairs_by_address[a] for a in addresses],
+        [sentiment_by_address.get(a, {}) for a in addresses],
+        index=pd.Index(addresses, name='token_address')
+    )
+    return score_risk(frame)
+
+
+def metrics_dict(row: Mapping) -> Dict[str, float]:
+    """Sub-scores of one scored row as the dict ``calculate_risk_metrics`` returns"""
+    return {name: float(row[name]) for name in METRIC_COLUMNS}
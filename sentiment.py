@@ -0,0 +1,241 @@
+import hashlib
+import multiprocessing
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+
+class SentimentScorer(ABC):
+    """Maps texts to polarity in [-1, 1]
+
+    Scorers are sent to worker processes, so they must be picklable and
+    should load heavy resources lazily inside ``score_batch``.
+    """
+
+    name = "scorer"
+
+    @abstractmethod
+    def score_batch(self, texts: Sequence[str]) -> List[float]:
+        ...
+
+
+class TextBlobScorer(SentimentScorer):
+    """TextBlob's pattern-based polarity, the scorer the app has always used"""
+
+    name = "textblob"
+
+    def score_batch(self, texts: Sequence[str]) -> List[float]:
+        from textblob import TextBlob
+        return [float(TextBlob(text).sentiment.polarity) for text in texts]
+
+
+# Word -> polarity for crypto/social slang, on TextBlob's [-1, 1] scale
+DEFAULT_LEXICON = {
+    'moon': 0.8, 'mooning': 0.9, 'bullish': 0.8, 'pump': 0.4, 'pumping': 0.5,
+    'gem': 0.7, 'lfg': 0.8, 'wagmi': 0.7, 'hodl': 0.4, 'buy': 0.3, 'buying': 0.3,
+    'send': 0.4, 'sending': 0.5, 'ath': 0.6, 'breakout': 0.6, 'gains': 0.6,
+    'profit': 0.5, 'love': 0.6, 'great': 0.7, 'good': 0.5, 'amazing': 0.8,
+    'best': 0.8, 'strong': 0.5, 'up': 0.2, 'green': 0.4, 'rocket': 0.7, 'win': 0.6,
+    'bearish': -0.8, 'dump': -0.6, 'dumping': -0.7, 'rug': -1.0, 'rugged': -1.0,
+    'rugpull': -1.0, 'scam': -1.0, 'ngmi': -0.7, 'rekt': -0.8, 'sell': -0.3,
+    'selling': -0.4, 'crash': -0.8, 'crashing': -0.8, 'dead': -0.7, 'honeypot': -1.0,
+    'fud': -0.4, 'bad': -0.6, 'worst': -0.9, 'down': -0.2, 'red': -0.4, 'loss': -0.6,
+    'exit': -0.3, 'avoid': -0.6, 'fake': -0.8, 'bot': -0.3, 'hate': -0.7,
+}
+NEGATIONS = frozenset({'not', 'no', 'never', "don't", "isn't", "wasn't", "ain't", 'dont', 'isnt'})
+INTENSIFIERS = {'very': 1.3, 'super': 1.4, 'so': 1.2, 'extremely': 1.5, 'mega': 1.4}
+
+
+class LexiconScorer(SentimentScorer):
+    """Dictionary scorer: mean polarity of known words, with negation and intensifiers
+
+    Roughly two orders of magnitude faster than TextBlob, and tuned for
+    crypto slang TextBlob does not know (``rug``, ``lfg``, ``ngmi``...).
+    """
+
+    name = "lexicon"
+    _tokens = re.compile(r"[a-z']+")
+
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None):
+        self.lexicon = dict(DEFAULT_LEXICON if lexicon is None else lexicon)
+
+    def score(self, text: str) -> float:
+        total = 0.0
+        hits = 0
+        negate = False
+        boost = 1.0
+        for token in self._tokens.findall(text.lower()):
+            polarity = self.lexicon.get(token)
+            if polarity is None:
+                if token in NEGATIONS:
+                    negate = True
+                elif token in INTENSIFIERS:
+                    boost = INTENSIFIERS[token]
+                continue
+            polarity *= boost
+            total += -0.5 * polarity if negate else polarity
+            hits += 1
+            negate = False
+            boost = 1.0
+        if not hits:
+            return 0.0
+        return max(-1.0, min(1.0, total / hits))
+
+    def score_batch(self, texts: Sequence[str]) -> List[float]:
+        return [self.score(text) for text in texts]
+
+
+SCORERS = {
+    TextBlobScorer.name: TextBlobScorer,
+    LexiconScorer.name: LexiconScorer,
+}
+
+
+class SentimentService:
+    """Cached, batched sentiment scoring
+
+    Scores are keyed by a hash of the scorer name and the exact text, so a
+    tweet seen on an earlier rerun (or retweeted verbatim) is never scored
+    twice. Lookups go to an in-memory LRU first, then to an optional SQLite
+    table. Only the remaining unique texts are scored, split across a
+    process pool once a batch reaches ``min_parallel_batch``.
+    """
+
+    def __init__(self, scorer: Optional[SentimentScorer] = None, cache_size: int = 100_000,
+                 db_path: Optional[str] = None, processes: Optional[int] = None,
+                 min_parallel_batch: int = 2000, chunk_size: int = 500):
+        self.scorer = scorer or TextBlobScorer()
+        self.cache_size = cache_size
+        self.db_path = db_path
+        self.processes = processes if processes is not None else multiprocessing.cpu_count()
+        self.min_parallel_batch = min_parallel_batch
+        self.chunk_size = chunk_size
+        self._lru: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # score() runs in to_thread workers; two of them must not each start a pool
+        self._pool_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            with self._db:
+                self._db.execute("""
+                    CREATE TABLE IF NOT EXISTS sentiment_cache (
+                        key BLOB PRIMARY KEY,
+                        score REAL
+                    ) WITHOUT ROWID
+                """)
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.scored = 0
+        self.texts = 0
+        self.scoring_seconds = 0.0
+        self.total_seconds = 0.0
+
+    def _key(self, text: str) -> bytes:
+        return hashlib.blake2b(f"{self.scorer.name}\0{text}".encode('utf-8', 'replace'),
+                               digest_size=16).digest()
+
+    def _remember(self, items):
+        with self._lock:
+            for key, score in items:
+                self._lru[key] = score
+                self._lru.move_to_end(key)
+            while len(self._lru) > self.cache_size:
+                self._lru.popitem(last=False)
+
+    def _load(self, keys: List[bytes]) -> Dict[bytes, float]:
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                found.update(self._db.execute(
+                    f"SELECT key, score FROM sentiment_cache WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall())
+        return found
+
+    def _compute(self, texts: List[str]) -> List[float]:
+        if len(texts) < self.min_parallel_batch or self.processes <= 1:
+            return self.scorer.score_batch(texts)
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn, not fork: the app process has event-loop and SQLite threads
+                self._pool = ProcessPoolExecutor(
+                    self.processes, mp_context=multiprocessing.get_context('spawn')
+                )
+            pool = self._pool
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        return [score for part in pool.map(self.scorer.score_batch, chunks) for score in part]
+
+    def score(self, texts: Sequence[str]) -> List[float]:
+        """Polarity for each text, in order"""
+        started = time.perf_counter()
+        keys = [self._key(text) for text in texts]
+        scores: Dict[bytes, float] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._lru:
+                    scores[key] = self._lru[key]
+                    self._lru.move_to_end(key)
+        self.memory_hits += sum(1 for key in keys if key in scores)
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in scores:
+                missing.setdefault(key, text)
+        if missing and self._db is not None:
+            stored = self._load(list(missing))
+            self.disk_hits += len(stored)
+            scores.update(stored)
+            self._remember(stored.items())
+            for key in stored:
+                del missing[key]
+
+        if missing:
+            compute_started = time.perf_counter()
+            computed = dict(zip(missing, self._compute(list(missing.values()))))
+            self.scoring_seconds += time.perf_counter() - compute_started
+            self.scored += len(computed)
+            scores.update(computed)
+            self._remember(computed.items())
+            if self._db is not None:
+                with self._lock, self._db:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO sentiment_cache (key, score) VALUES (?, ?)",
+                        computed.items()
+                    )
+
+        self.texts += len(texts)
+        self.total_seconds += time.perf_counter() - started
+        return [scores[key] for key in keys]
+
+    def score_one(self, text: str) -> float:
+        return self.score([text])[0]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'scorer': self.scorer.name,
+            'texts': self.texts,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'scored': self.scored,
+            'cached': len(self._lru),
+            'tweets_per_second': self.texts / self.total_seconds if self.total_seconds else 0.0,
+            'scored_per_second': self.scored / self.scoring_seconds if self.scoring_seconds else 0.0
+        }
+
+    def close(self):
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Mapping, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def twitter_score(metrics: Mapping) -> float:
+    return metrics['sentiment'] * 0.6 + min(1, metrics['volume'] / 1000) * 0.4
+
+
+def tiktok_score(metrics: Mapping) -> float:
+    return min(1, metrics['total_views'] / 1000000) * 0.5 + metrics['engagement_rate'] * 0.5
+
+
+# Source name -> (weight in the combined score, metrics -> 0-1 score).
+# A new platform registers here alongside its SocialSource.
+SOURCE_SCORES: Dict[str, tuple] = {
+    'twitter': (0.6, twitter_score),
+    'tiktok': (0.4, tiktok_score),
+}
+
+
+def combined_social_score(social_metrics: Mapping) -> float:
+    """Weighted score over the platforms that actually returned data
+
+    Weights are renormalized across the sources that answered, so a timed
+    out platform does not count as zero activity. Without a ``sources``
+    status map every known platform present in ``social_metrics`` counts.
+    """
+    status = social_metrics.get('sources') or {}
+    total = weight_sum = 0.0
+    for name, (weight, score) in SOURCE_SCORES.items():
+        if name not in social_metrics or status.get(name, {}).get('status', 'ok') != 'ok':
+            continue
+        total += weight * score(social_metrics[name])
+        weight_sum += weight
+    return total / weight_sum if weight_sum else 0.0
+
+
+@dataclass
+class SocialSource:
+    """One platform: an async fetch that returns its metrics dict"""
+    name: str
+    fetch: Callable[[Dict], Awaitable[Dict]]
+    # Metrics reported when the source fails or times out
+    default: Dict = field(default_factory=dict)
+    timeout: float = 8.0
+
+
+class SocialAggregator:
+    """Fetches every social source concurrently with its own timeout
+
+    A slow or failing source never delays the others beyond its timeout;
+    its slot is filled with the source's default metrics, its status is
+    recorded under ``sources`` and the result is flagged ``partial``.
+    """
+
+    def __init__(self, sources: Sequence[SocialSource]):
+        self.sources = list(sources)
+
+    async def _run(self, source: SocialSource, ticker_formats: Dict):
+        started = time.perf_counter()
+        try:
+            metrics = await asyncio.wait_for(source.fetch(ticker_formats), source.timeout)
+            status = {'status': 'ok'}
+        except asyncio.TimeoutError:
+            metrics, status = dict(source.default), {'status': 'timeout'}
+        except Exception as e:
+            logger.warning("Social source %s failed: %s", source.name, e)
+            metrics, status = dict(source.default), {'status': 'error', 'error': str(e)}
+        status['latency_ms'] = round((time.perf_counter() - started) * 1e3, 1)
+        return metrics, status
+
+    async def collect(self, ticker_formats: Dict) -> Dict[str, Any]:
+        results = await asyncio.gather(*(self._run(s, ticker_formats) for s in self.sources))
+        social_metrics: Dict[str, Any] = {}
+        statuses = {}
+        for source, (metrics, status) in zip(self.sources, results):
+            social_metrics[source.name] = metrics
+            statuses[source.name] = status
+        social_metrics['sources'] = statuses
+        social_metrics['partial'] = any(s['status'] != 'ok' for s in statuses.values())
+        social_metrics['combined_score'] = combined_social_score(social_metrics)
+        return social_metrics
@@ -0,0 +1,189 @@
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+SOCIAL_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS social_cursors (
+        ticker TEXT,
+        source TEXT,
+        cursor TEXT,
+        fetched_at REAL,
+        PRIMARY KEY (ticker, source)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS social_buckets (
+        ticker TEXT,
+        source TEXT,
+        bucket INTEGER,
+        posts INTEGER,
+        weighted_sentiment REAL,
+        engagement REAL,
+        views REAL,
+        shares REAL,
+        PRIMARY KEY (ticker, source, bucket)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS social_posts (
+        ticker TEXT,
+        source TEXT,
+        post_id TEXT,
+        bucket INTEGER,
+        weighted_sentiment REAL,
+        engagement REAL,
+        views REAL,
+        shares REAL,
+        PRIMARY KEY (ticker, source, post_id)
+    ) WITHOUT ROWID
+    """,
+]
+
+UPSERT_BUCKET_SQL = """
+    INSERT INTO social_buckets (ticker, source, bucket, posts, weighted_sentiment, engagement, views, shares)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (ticker, source, bucket) DO UPDATE SET
+        posts = posts + excluded.posts,
+        weighted_sentiment = weighted_sentiment + excluded.weighted_sentiment,
+        engagement = engagement + excluded.engagement,
+        views = views + excluded.views,
+        shares = shares + excluded.shares
+"""
+
+UPSERT_POST_SQL = """
+    INSERT INTO social_posts (ticker, source, post_id, bucket, weighted_sentiment, engagement, views, shares)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (ticker, source, post_id) DO UPDATE SET
+        weighted_sentiment = excluded.weighted_sentiment,
+        engagement = excluded.engagement,
+        views = excluded.views,
+        shares = excluded.shares
+"""
+
+# (post id, created_at epoch, sentiment, engagement, views, shares)
+Post = Tuple[str, float, float, float, float, float]
+
+
+class SocialMetricsStore:
+    """Per-ticker social cursors and rolling per-bucket aggregates
+
+    Each source keeps a cursor (Twitter's ``since_id``, TikTok's newest
+    ``create_time``) so a refresh only ingests posts it has not seen. Posts
+    are folded into ``bucket_seconds`` buckets of running sums, and the
+    metrics the app shows are summed over the buckets inside ``window``
+    instead of being recomputed from raw posts. The latest metrics of every
+    post are kept too, so a post seen again (a video still in the hashtag
+    feed, a tweet in an overlapping page) moves its bucket by the change in
+    engagement, views and shares instead of being counted twice or frozen at
+    its first sighting. A source fetched less than
+    ``min_refresh`` seconds ago is not fetched again at all.
+    """
+
+    def __init__(self, db_path: str = "memecoin_cache.db", bucket_seconds: int = 3600,
+                 window: float = 86400, min_refresh: float = 120, retention_days: float = 30):
+        self.db_path = db_path
+        self.bucket_seconds = bucket_seconds
+        self.window = window
+        self.min_refresh = min_refresh
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            for statement in SOCIAL_SCHEMA:
+                self._conn.execute(statement)
+
+    def cursor(self, ticker: str, source: str) -> Tuple[Optional[str], float]:
+        """``(cursor, fetched_at)`` for a source; ``(None, 0.0)`` before the first fetch"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cursor, fetched_at FROM social_cursors WHERE ticker = ? AND source = ?",
+                (ticker, source)
+            ).fetchone()
+        return (row[0], row[1]) if row else (None, 0.0)
+
+    def is_fresh(self, ticker: str, source: str, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return now - self.cursor(ticker, source)[1] < self.min_refresh
+
+    def ingest(self, ticker: str, source: str, posts: Iterable[Post], cursor: Optional[str],
+               now: Optional[float] = None) -> int:
+        """Fold posts into their buckets and advance the cursor in one transaction
+
+        Returns the number of posts not seen before.
+        """
+        now = time.time() if now is None else now
+        latest: Dict[str, Tuple[int, float, float, float, float]] = {}
+        for post_id, created_at, sentiment, engagement, views, shares in posts:
+            bucket = int(created_at // self.bucket_seconds) * self.bucket_seconds
+            # Same engagement weighting analyze_tweet_sentiment applies
+            weighted = sentiment * (1 + min(engagement / 1000, 1))
+            latest[str(post_id)] = (bucket, weighted, engagement, views, shares)
+        cutoff = int(now - self.retention_days * 86400)
+        with self._lock, self._conn:
+            buckets: Dict[int, list] = {}
+            for post_id, (bucket, *values) in latest.items():
+                row = self._conn.execute("""
+                    SELECT bucket, weighted_sentiment, engagement, views, shares FROM social_posts
+                    WHERE ticker = ? AND source = ? AND post_id = ?
+                """, (ticker, source, post_id)).fetchone()
+                if row is None:
+                    previous = [0.0, 0.0, 0.0, 0.0]
+                else:
+                    bucket, previous = row[0], list(row[1:])
+                sums = buckets.setdefault(bucket, [0, 0.0, 0.0, 0.0, 0.0])
+                sums[0] += row is None
+                for i, (value, old) in enumerate(zip(values, previous), start=1):
+                    sums[i] += value - old
+                self._conn.execute(UPSERT_POST_SQL, (ticker, source, post_id, bucket, *values))
+            self._conn.executemany(UPSERT_BUCKET_SQL, [
+                (ticker, source, bucket, *sums) for bucket, sums in buckets.items()
+            ])
+            self._conn.execute("""
+                INSERT INTO social_cursors (ticker, source, cursor, fetched_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT (ticker, source) DO UPDATE SET
+                    cursor = COALESCE(excluded.cursor, cursor),
+                    fetched_at = excluded.fetched_at
+            """, (ticker, source, cursor, now))
+            for table in ('social_buckets', 'social_posts'):
+                self._conn.execute(
+                    f"DELETE FROM {table} WHERE ticker = ? AND source = ? AND bucket < ?",
+                    (ticker, source, cutoff)
+                )
+        return sum(sums[0] for sums in buckets.values())
+
+    def totals(self, ticker: str, source: str, window: Optional[float] = None,
+               now: Optional[float] = None) -> Tuple[int, float, float, float, float]:
+        """Summed ``(posts, weighted_sentiment, engagement, views, shares)`` over the window"""
+        now = time.time() if now is None else now
+        since = int((now - (window or self.window)) // self.bucket_seconds) * self.bucket_seconds
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT COALESCE(SUM(posts), 0), COALESCE(SUM(weighted_sentiment), 0),
+                       COALESCE(SUM(engagement), 0), COALESCE(SUM(views), 0), COALESCE(SUM(shares), 0)
+                FROM social_buckets WHERE ticker = ? AND source = ? AND bucket >= ?
+            """, (ticker, source, since)).fetchone()
+        return row
+
+    def metrics(self, ticker: str, window: Optional[float] = None) -> Dict[str, Dict]:
+        """Twitter and TikTok metrics over the window, in the shapes the analyzers return"""
+        tweets, weighted, tweet_engagement, _, _ = self.totals(ticker, 'twitter', window)
+        videos, _, video_engagement, views, shares = self.totals(ticker, 'tiktok', window)
+        return {
+            'twitter': {
+                'sentiment': weighted / tweets if tweets else 0,
+                'volume': tweets,
+                'engagement': tweet_engagement / tweets if tweets else 0
+            },
+            'tiktok': {
+                'total_views': views,
+                'engagement_rate': video_engagement / views if views else 0,
+                'trend_score': shares / videos if videos else 0
+            }
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
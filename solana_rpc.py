@@ -0,0 +1,353 @@
+import asyncio
+import bisect
+import itertools
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RPC_URL = "https://api.mainnet-beta.solana.com"
+TOKEN_PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+TOKEN_2022_PROGRAM_ID = "TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb"
+
+# JSON-RPC error codes that describe the node rather than the request:
+# node unhealthy / behind, and minContextSlot not reached yet
+NODE_ERROR_CODES = frozenset({-32005, -32016})
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class RpcError(Exception):
+    """A JSON-RPC error object returned by the node"""
+
+    def __init__(self, method: str, error: Any):
+        self.method = method
+        self.error = error
+        message = error.get('message') if isinstance(error, dict) else error
+        super().__init__(f"{method}: {message}")
+
+
+class RpcUnavailable(Exception):
+    """Every endpoint failed or is ejected"""
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` requests per second with bursts up to ``capacity``"""
+
+    def __init__(self, rate: Optional[float] = None, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate or 0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self.waited = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, cost: float = 1):
+        if not self.rate:
+            return
+        # A batch larger than the bucket waits for a full bucket instead of forever
+        cost = min(cost, self.capacity)
+        while True:
+            self._refill()
+            if self.tokens >= cost:
+                self.tokens -= cost
+                return
+            delay = (cost - self.tokens) / self.rate
+            self.waited += delay
+            await asyncio.sleep(delay)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with approximate percentiles"""
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def observe(self, ms: float):
+        self.counts[bisect.bisect_left(self.bounds, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total_ms / self.count, 2) if self.count else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99)
+        }
+
+
+@dataclass(eq=False)
+class RpcEndpoint:
+    """One RPC node, its selection weight and optional requests-per-second limit"""
+    url: str
+    weight: float = 1.0
+    rate: Optional[float] = None
+    burst: Optional[float] = None
+    healthy: bool = True
+    failures: int = 0
+    ejected_until: float = 0.0
+    last_error: Optional[str] = None
+    requests: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram, repr=False)
+    bucket: TokenBucket = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.bucket = TokenBucket(self.rate, self.burst)
+
+    def available(self, now: float) -> bool:
+        # An ejected endpoint is tried again once its cooldown has passed
+        return self.healthy or now >= self.ejected_until
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'url': self.url,
+            'weight': self.weight,
+            'healthy': self.healthy,
+            'failures': self.failures,
+            'requests': self.requests,
+            'rate_limited_s': round(self.bucket.waited, 2),
+            'last_error': self.last_error,
+            **self.latency.summary()
+        }
+
+
+def parse_endpoints(spec: str) -> List[RpcEndpoint]:
+    """Endpoints from ``url[|weight[|rps]]`` entries separated by commas"""
+    endpoints = []
+    for entry in filter(None, (part.strip() for part in spec.split(','))):
+        url, *rest = entry.split('|')
+        weight = float(rest[0]) if rest and rest[0] else 1.0
+        rate = float(rest[1]) if len(rest) > 1 and rest[1] else None
+        endpoints.append(RpcEndpoint(url, weight, rate))
+    return endpoints
+
+
+def _node_error(reply: Any) -> bool:
+    replies = reply if isinstance(reply, list) else [reply]
+    return any(
+        isinstance(r, dict) and isinstance(r.get('error'), dict)
+        and r['error'].get('code') in NODE_ERROR_CODES
+        for r in replies
+    )
+
+
+class SolanaRPC:
+    """Pooled async Solana JSON-RPC client over weighted endpoints
+
+    Requests go to a healthy endpoint picked at random by weight, through
+    that endpoint's token bucket. A transport error, timeout, 429/5xx or a
+    node-behind error fails over to the next endpoint. After
+    ``max_failures`` consecutive failures an endpoint is ejected for
+    ``cooldown`` seconds, or until ``check_health`` sees it answer again.
+    Latency is recorded per endpoint and per method.
+
+    The session is created lazily on the loop that first uses it, so an
+    instance must stay on one event loop (the background runtime's).
+    """
+
+    def __init__(self, endpoints: Union[str, Sequence[RpcEndpoint]] = DEFAULT_RPC_URL,
+                 timeout: float = 15.0, max_connections: int = 20,
+                 max_failures: int = 3, cooldown: float = 30.0):
+        if isinstance(endpoints, str):
+            endpoints = parse_endpoints(endpoints)
+        if not endpoints:
+            raise ValueError("at least one RPC endpoint is required")
+        self.endpoints = list(endpoints)
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.method_latency: Dict[str, LatencyHistogram] = {}
+        self.failovers = 0
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._ids = itertools.count(1)
+
+    @property
+    def url(self) -> str:
+        """The highest-weight endpoint, for clients that need a single URL"""
+        return max(self.endpoints, key=lambda e: e.weight).url
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            # One keep-alive pool shared by every endpoint
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    def _pick(self, exclude) -> Optional[RpcEndpoint]:
+        now = time.monotonic()
+        candidates = [e for e in self.endpoints if e not in exclude and e.available(now)]
+        if not candidates and not exclude:
+            # Everything is ejected: trying anyway beats failing outright
+            candidates = self.endpoints
+        if not candidates:
+            return None
+        return random.choices(candidates, weights=[e.weight for e in candidates])[0]
+
+    def _record_failure(self, endpoint: RpcEndpoint, error: Any):
+        endpoint.failures += 1
+        endpoint.last_error = str(error) or type(error).__name__
+        if endpoint.failures >= self.max_failures:
+            if endpoint.healthy:
+                logger.warning("Ejecting RPC endpoint %s: %s", endpoint.url, endpoint.last_error)
+            endpoint.healthy = False
+            endpoint.ejected_until = time.monotonic() + self.cooldown
+
+    @staticmethod
+    def _record_success(endpoint: RpcEndpoint):
+        endpoint.failures = 0
+        endpoint.healthy = True
+
+    async def _post(self, payload, timeout: Optional[float] = None, cost: int = 1):
+        session = await self._get_session()
+        kwargs = {'timeout': aiohttp.ClientTimeout(total=timeout)} if timeout else {}
+        tried = []
+        last_error: Any = None
+        while True:
+            endpoint = self._pick(tried)
+            if endpoint is None:
+                break
+            if tried:
+                self.failovers += 1
+            tried.append(endpoint)
+            await endpoint.bucket.acquire(cost)
+            started = time.perf_counter()
+            endpoint.requests += 1
+            try:
+                async with session.post(endpoint.url, json=payload, **kwargs) as response:
+                    if response.status == 429 or response.status >= 500:
+                        reply, error = None, f"HTTP {response.status}"
+                    else:
+                        # Any other error status is about the request, not the node
+                        response.raise_for_status()
+                        reply = await response.json(content_type=None)
+            except aiohttp.ClientResponseError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                reply, error = None, e
+            if reply is None:
+                self._record_failure(endpoint, error)
+                last_error = error
+                continue
+            endpoint.latency.observe((time.perf_counter() - started) * 1e3)
+            if _node_error(reply) and len(tried) < len(self.endpoints):
+                self._record_failure(endpoint, reply)
+                last_error = reply
+                continue
+            self._record_success(endpoint)
+            return reply
+        raise RpcUnavailable(f"no RPC endpoint answered: {last_error}")
+
+    def _observe(self, method: str, started: float):
+        histogram = self.method_latency.get(method)
+        if histogram is None:
+            histogram = self.method_latency[method] = LatencyHistogram()
+        histogram.observe((time.perf_counter() - started) * 1e3)
+
+    async def call(self, method: str, params: Optional[list] = None,
+                   timeout: Optional[float] = None) -> Any:
+        started = time.perf_counter()
+        reply = await self._post({
+            'jsonrpc': '2.0', 'id': next(self._ids), 'method': method, 'params': params or []
+        }, timeout)
+        self._observe(method, started)
+        if 'error' in reply:
+            raise RpcError(method, reply['error'])
+        return reply.get('result')
+
+    async def batch(self, calls: Sequence[Tuple[str, list]],
+                    timeout: Optional[float] = None) -> List[Any]:
+        """Send several calls in one HTTP request
+
+        Results come back in call order; a failed call yields an ``RpcError``
+        in its slot instead of failing the whole batch. ``timeout`` overrides
+        the client default for slow calls such as ``getProgramAccounts``.
+        Each call in the batch counts against the endpoint's rate limit.
+        """
+        if not calls:
+            return []
+        requests = [
+            {'jsonrpc': '2.0', 'id': next(self._ids), 'method': method, 'params': params}
+            for method, params in calls
+        ]
+        started = time.perf_counter()
+        replies = await self._post(requests, timeout, cost=len(requests))
+        for method in {method for method, _ in calls}:
+            self._observe(method, started)
+        if isinstance(replies, dict):
+            # Some nodes answer a rejected batch with a single error object
+            raise RpcError('batch', replies.get('error', replies))
+        by_id = {reply.get('id'): reply for reply in replies}
+        results = []
+        for request in requests:
+            reply = by_id.get(request['id'], {'error': {'message': 'missing reply'}})
+            if 'error' in reply:
+                results.append(RpcError(request['method'], reply['error']))
+            else:
+                results.append(reply.get('result'))
+        return results
+
+    async def _probe(self, endpoint: RpcEndpoint, session: aiohttp.ClientSession) -> bool:
+        try:
+            async with session.post(endpoint.url, json={
+                'jsonrpc': '2.0', 'id': next(self._ids), 'method': 'getHealth'
+            }, timeout=aiohttp.ClientTimeout(total=min(self.timeout, 5))) as response:
+                response.raise_for_status()
+                reply = await response.json(content_type=None)
+            if reply.get('result') != 'ok':
+                raise RpcError('getHealth', reply.get('error', reply))
+        except Exception as e:
+            self._record_failure(endpoint, e)
+            return False
+        self._record_success(endpoint)
+        return True
+
+    async def check_health(self) -> Dict[str, bool]:
+        """Probe every endpoint with ``getHealth``; healthy ones rejoin the rotation"""
+        session = await self._get_session()
+        results = await asyncio.gather(*(self._probe(e, session) for e in self.endpoints))
+        return {e.url: ok for e, ok in zip(self.endpoints, results)}
+
+    async def monitor_health(self, interval: float = 30.0):
+        while True:
+            await self.check_health()
+            await asyncio.sleep(interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'endpoints': [e.describe() for e in self.endpoints],
+            'failovers': self.failovers,
+            'methods': {m: h.summary() for m, h in sorted(self.method_latency.items())}
+        }
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
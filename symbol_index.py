@@ -0,0 +1,233 @@
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Substring lookups go through n-gram posting lists up to this length; longer
+# queries intersect their trigrams and verify the few surviving candidates
+MAX_GRAM = 3
+
+
+def _grams(symbol: str) -> Set[str]:
+    return {
+        symbol[i:i + n]
+        for n in range(1, MAX_GRAM + 1)
+        for i in range(len(symbol) - n + 1)
+    }
+
+
+def _pair_key(pair: Dict):
+    return pair.get('pairAddress') or id(pair)
+
+
+def _pair_symbol(pair: Dict) -> Optional[str]:
+    base_token = pair.get('baseToken')
+    if not isinstance(base_token, dict):
+        return None
+    symbol = base_token.get('symbol')
+    return symbol.upper() if isinstance(symbol, str) else None
+
+
+class SymbolIndex:
+    """In-memory index over pair base-token symbols
+
+    Supports exact, prefix and substring (n-gram) lookups. ``sync`` applies
+    only the difference between the indexed pairs and a fresh pair list, so a
+    refetch touches the pairs that changed rather than the whole index.
+    Results come back in the order pairs were first indexed, which after a
+    ``sync`` is not the order of the latest fetch: a pair keeps its place
+    for as long as it stays indexed, since re-ranking every pair would undo
+    the incremental update. Short substring queries read a posting list
+    kept in that order, so even a one-letter query matching a fifth of the
+    index does no sort.
+    """
+
+    def __init__(self, pairs: Optional[Iterable[Dict]] = None):
+        self._pairs: Dict[object, Dict] = {}
+        self._symbol_of: Dict[object, str] = {}
+        self._order: Dict[object, int] = {}
+        self._keys_by_symbol: Dict[str, Set[object]] = {}
+        self._sorted_symbols: List[str] = []
+        self._postings: Dict[str, Set[str]] = {}
+        # Per n-gram, the insertion rank of every pair whose symbol contains it,
+        # ascending; new pairs take the next rank, so most inserts are appends
+        self._ranked: Dict[str, List[int]] = {}
+        self._pair_at: Dict[int, Dict] = {}
+        self._seq = 0
+        if pairs:
+            self.update(pairs)
+
+    def __len__(self):
+        return len(self._pairs)
+
+    def _add_symbol(self, symbol: str):
+        postings = self._postings
+        for gram in _grams(symbol):
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = {symbol}
+            else:
+                posting.add(symbol)
+
+    def _remove_symbol(self, symbol: str):
+        for gram in _grams(symbol):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(symbol)
+                if not posting:
+                    del self._postings[gram]
+        i = bisect_left(self._sorted_symbols, symbol)
+        if i < len(self._sorted_symbols) and self._sorted_symbols[i] == symbol:
+            del self._sorted_symbols[i]
+
+    def _rerank(self, moved: Dict[int, Tuple[Optional[str], Optional[str]]]):
+        """Move ranks between posting lists for ``{rank: (old symbol, new symbol)}``
+
+        Changes are batched so each touched list is rebuilt once: per-entry
+        ``insort``/``del`` on the single-letter lists (a fifth of the index
+        each) would shift the whole list for every changed pair.
+        """
+        added, dropped = defaultdict(list), defaultdict(list)
+        for seq, (old, new) in moved.items():
+            old_grams = _grams(old) if old else set()
+            new_grams = _grams(new) if new else set()
+            for gram in old_grams - new_grams:
+                dropped[gram].append(seq)
+            for gram in new_grams - old_grams:
+                added[gram].append(seq)
+        ranked = self._ranked
+        for gram in added.keys() | dropped.keys():
+            posting = ranked.get(gram, [])
+            gone = dropped.get(gram)
+            if gone:
+                # Copy the runs between dropped entries rather than test every entry
+                kept, prev = [], 0
+                for seq in sorted(gone):
+                    i = bisect_left(posting, seq, prev)
+                    kept += posting[prev:i]
+                    prev = i + 1
+                kept += posting[prev:]
+                posting = kept
+            new = added.get(gram)
+            if new:
+                last = posting[-1] if posting else -1
+                new.sort()
+                posting.extend(new)
+                if new[0] < last:
+                    # Two sorted runs; timsort merges them in linear time
+                    posting.sort()
+            if posting:
+                ranked[gram] = posting
+            else:
+                ranked.pop(gram, None)
+
+    def _unlink(self, key):
+        symbol = self._symbol_of.pop(key)
+        keys = self._keys_by_symbol[symbol]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_symbol[symbol]
+            self._remove_symbol(symbol)
+
+    def update(self, pairs: Iterable[Dict]):
+        """Add new pairs and replace already indexed ones with the same pair address"""
+        new_symbols = []
+        moved: Dict[int, Tuple[Optional[str], Optional[str]]] = {}
+        for pair in pairs:
+            if not isinstance(pair, dict):
+                continue
+            symbol = _pair_symbol(pair)
+            if symbol is None:
+                continue
+            key = _pair_key(pair)
+            old_symbol = self._symbol_of.get(key)
+            self._pairs[key] = pair
+            if key not in self._order:
+                self._order[key] = self._seq
+                self._seq += 1
+            seq = self._order[key]
+            self._pair_at[seq] = pair
+            if old_symbol == symbol:
+                continue
+            if old_symbol is not None:
+                self._unlink(key)
+            self._symbol_of[key] = symbol
+            # A pair renamed twice in one batch still moves from its first symbol
+            moved[seq] = (moved[seq][0] if seq in moved else old_symbol, symbol)
+            keys = self._keys_by_symbol.get(symbol)
+            if keys is None:
+                self._keys_by_symbol[symbol] = {key}
+                self._add_symbol(symbol)
+                new_symbols.append(symbol)
+            else:
+                keys.add(key)
+        self._rerank(moved)
+
+        if len(new_symbols) < 64:
+            for symbol in new_symbols:
+                insort(self._sorted_symbols, symbol)
+        elif new_symbols:
+            # Two sorted runs; timsort merges them in linear time
+            self._sorted_symbols.extend(sorted(new_symbols))
+            self._sorted_symbols.sort()
+
+    def remove(self, keys: Iterable):
+        """Drop pairs by pair address"""
+        moved: Dict[int, Tuple[Optional[str], Optional[str]]] = {}
+        for key in keys:
+            if self._pairs.pop(key, None) is not None:
+                seq = self._order.pop(key)
+                moved[seq] = (self._symbol_of[key], None)
+                self._unlink(key)
+                del self._pair_at[seq]
+        self._rerank(moved)
+
+    def sync(self, pairs: List[Dict]):
+        """Make the index hold exactly ``pairs``, touching only what changed
+
+        Pairs already indexed keep their result position; new ones go last.
+        """
+        current = {_pair_key(p) for p in pairs if isinstance(p, dict)}
+        self.remove([key for key in self._pairs if key not in current])
+        self.update(pairs)
+
+    def _collect(self, symbols: Iterable[str]) -> List[Dict]:
+        keys = [key for symbol in symbols for key in self._keys_by_symbol.get(symbol, ())]
+        keys.sort(key=self._order.__getitem__)
+        return [self._pairs[key] for key in keys]
+
+    def exact(self, ticker: str) -> List[Dict]:
+        """Pairs whose symbol equals ``ticker`` (case-insensitive)"""
+        return self._collect([ticker.upper()])
+
+    def prefix(self, ticker: str) -> List[Dict]:
+        """Pairs whose symbol starts with ``ticker`` (case-insensitive)"""
+        query = ticker.upper()
+        sorted_symbols = self._sorted_symbols
+        # Symbols sharing the prefix sort between query and query + max char
+        start = bisect_left(sorted_symbols, query)
+        end = bisect_left(sorted_symbols, query + '\U0010ffff', start)
+        return self._collect(sorted_symbols[start:end])
+
+    def search(self, ticker: str) -> List[Dict]:
+        """Pairs whose symbol contains ``ticker`` (case-insensitive)"""
+        query = ticker.upper()
+        if not query:
+            # Pairs enter and leave _pairs together with their rank, so its
+            # iteration order is already rank order
+            return list(self._pairs.values())
+        if len(query) <= MAX_GRAM:
+            return list(map(self._pair_at.__getitem__, self._ranked.get(query, ())))
+        return self._search_long(query)
+
+    def _search_long(self, query: str) -> List[Dict]:
+        postings = sorted(
+            (self._postings.get(query[i:i + MAX_GRAM], set())
+             for i in range(len(query) - MAX_GRAM + 1)),
+            key=len
+        )
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+        return self._collect(s for s in candidates if query in s)
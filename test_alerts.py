@@ -0,0 +1,19 @@
+import math
+
+from alerts import AlertGate
+
+
+def test_nan_magnitude_never_fires():
+    gate = AlertGate(cooldown=0)
+    assert not gate.should_fire('token', 'LIQUIDITY_DROP', math.nan, 0.3, now=0)
+    assert not gate.should_fire('token', 'LIQUIDITY_DROP', math.inf, 0.3, now=1)
+
+
+def test_nan_magnitude_keeps_latched_gate_latched():
+    gate = AlertGate(cooldown=0)
+    assert gate.should_fire('token', 'LIQUIDITY_DROP', 0.5, 0.3, now=0)
+    assert not gate.should_fire('token', 'LIQUIDITY_DROP', math.nan, 0.3, now=1)
+    # Still latched: a NaN reading did not re-arm it
+    assert not gate.should_fire('token', 'LIQUIDITY_DROP', 0.5, 0.3, now=2)
+    assert not gate.should_fire('token', 'LIQUIDITY_DROP', 0.1, 0.3, now=3)
+    assert gate.should_fire('token', 'LIQUIDITY_DROP', 0.5, 0.3, now=4)
@@ -0,0 +1,122 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from data_cache import DataCache, RetentionPolicy, format_timestamp
+
+TOKEN = 'token'
+
+
+def make_cache(tmp_path, **kwargs):
+    # A long interval keeps the flusher thread idle so tests flush explicitly
+    return DataCache(str(tmp_path / 'cache.db'), pool_size=2, flush_interval=60, **kwargs)
+
+
+def minute_ago(minutes):
+    return datetime.now().replace(second=0, microsecond=0) - timedelta(minutes=minutes)
+
+
+def tick(cache, price, timestamp, volume=100.0, liquidity=1000.0):
+    cache.cache_price_data(TOKEN, {'price': price, 'volume': volume, 'liquidity': liquidity}, timestamp)
+
+
+def test_flush_writes_buffered_rows_once(tmp_path):
+    cache = make_cache(tmp_path)
+    start = minute_ago(5)
+    tick(cache, 1.0, start)
+    tick(cache, 2.0, start + timedelta(seconds=1))
+    cache.record_alert(TOKEN, 'PRICE_DROP', 'high', 'dropped', start)
+    assert cache.flush() == 3
+    assert cache.flush() == 0
+    history = cache.get_price_history(TOKEN)
+    assert history['price'].tolist() == [1.0, 2.0]
+    assert list(history.index) == [pd.Timestamp(start), pd.Timestamp(start + timedelta(seconds=1))]
+    cache.close()
+
+
+def test_rollup_merges_batches_in_tick_order(tmp_path):
+    cache = make_cache(tmp_path)
+    bucket = minute_ago(5)
+    tick(cache, 2.0, bucket + timedelta(seconds=20), volume=200.0)
+    tick(cache, 5.0, bucket + timedelta(seconds=30), volume=300.0)
+    cache.flush()
+    # A late batch carries both the earliest and the latest tick of the minute
+    tick(cache, 1.0, bucket + timedelta(seconds=50), volume=500.0)
+    tick(cache, 3.0, bucket + timedelta(seconds=10), volume=100.0)
+    cache.flush()
+    candles = cache.get_ohlcv(TOKEN, days=1 / 24, resolution='1m')
+    assert candles.loc[pd.Timestamp(bucket)].tolist() == [3.0, 5.0, 1.0, 1.0, 500.0, 1000.0]
+    with cache.connection() as conn:
+        assert conn.execute("SELECT tick_count FROM price_ohlcv_1m").fetchall() == [(4,)]
+    cache.close()
+
+
+def test_legacy_ticks_move_to_partitions_and_rollups(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    first, second = datetime(2024, 3, 31, 23, 59, 0), datetime(2024, 4, 1, 0, 0, 30)
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("""
+            CREATE TABLE price_history (token_address TEXT, timestamp DATETIME, price REAL,
+                                        volume REAL, liquidity REAL, PRIMARY KEY (token_address, timestamp))
+        """)
+        conn.executemany("INSERT INTO price_history VALUES (?, ?, ?, ?, ?)", [
+            (TOKEN, format_timestamp(first), 1.0, 10.0, 100.0),
+            (TOKEN, format_timestamp(second), 2.0, 20.0, 200.0),
+        ])
+    conn.close()
+
+    cache = DataCache(path, pool_size=2, flush_interval=60)
+    assert cache.stats()['partitions'] == 2
+    with cache.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM price_history").fetchall() == [(0,)]
+        assert conn.execute("SELECT price FROM price_history_2024_03").fetchall() == [(1.0,)]
+        assert conn.execute("SELECT price FROM price_history_2024_04").fetchall() == [(2.0,)]
+        assert conn.execute(
+            "SELECT open, close, tick_count FROM price_ohlcv_1d ORDER BY bucket"
+        ).fetchall() == [(1.0, 1.0, 1), (2.0, 2.0, 1)]
+    cache.close()
+
+
+def test_retention_drops_expired_rows_in_batches(tmp_path):
+    cache = make_cache(tmp_path, retention=RetentionPolicy(
+        raw_days=7, rollup_days={'1m': 1, '5m': None, '1h': None, '1d': None},
+        alert_days=1, pattern_days=None, delete_batch_size=2
+    ))
+    now = minute_ago(0)
+    for days in (40, 3, 2):
+        tick(cache, 1.0, now - timedelta(days=days, minutes=1))
+        cache.record_alert(TOKEN, 'PRICE_DROP', 'high', f'{days}d', now - timedelta(days=days))
+    tick(cache, 1.0, now - timedelta(minutes=1))
+    cache.record_alert(TOKEN, 'PRICE_DROP', 'high', 'today', now - timedelta(minutes=1))
+    cache.flush()
+    partitions = cache.stats()['partitions']
+
+    removed = cache.apply_retention(now)
+    expired_months = partitions - cache.stats()['partitions']
+    assert removed == {'partitions': expired_months, 'ohlcv_1m': 3, 'alert_history': 3}
+    assert expired_months >= 1
+    with cache.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM price_ohlcv_1m").fetchall() == [(1,)]
+        assert conn.execute("SELECT COUNT(*) FROM price_ohlcv_5m").fetchall() == [(4,)]
+        assert conn.execute("SELECT message FROM alert_history").fetchall() == [('today',)]
+    cache.close()
+
+
+def test_store_ohlcv_keeps_trailing_day_volume(tmp_path):
+    cache = make_cache(tmp_path)
+    start = datetime.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=30)
+    index = pd.date_range(start, periods=30, freq='h')
+    candles = pd.DataFrame({'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5, 'volume': 10.0}, index=index)
+
+    assert cache.store_ohlcv(TOKEN, '1h', candles) == 7
+    stored = cache.get_ohlcv(TOKEN, days=2, resolution='1h')
+    assert list(stored.index) == list(index[23:])
+    assert stored['volume'].tolist() == [240.0] * 7
+    assert stored['liquidity'].isna().all()
+
+    assert cache.store_ohlcv(TOKEN, '1h', candles.iloc[:3], from_launch=True) == 3
+    stored = cache.get_ohlcv(TOKEN, days=2, resolution='1h')
+    assert stored['volume'].tolist()[:3] == [10.0, 20.0, 30.0]
+    cache.close()
@@ -0,0 +1,103 @@
+import asyncio
+import base64
+import time
+
+import base58
+import pytest
+
+from execution import BlockhashInfo, ConfirmationTracker, ExecutionPipeline
+
+
+class FakeRPC:
+    def __init__(self, batch_results=None):
+        self.batch_results = batch_results
+        self.calls = []
+
+    async def call(self, method, params):
+        self.calls.append(method)
+        assert method == 'getLatestBlockhash'
+        return {'value': {'blockhash': 'fetched', 'lastValidBlockHeight': 300}, 'context': {'slot': 1}}
+
+    async def batch(self, requests):
+        self.calls.append([method for method, _ in requests])
+        return self.batch_results
+
+
+def builder(tag):
+    """Fake wire transaction: signature count, a 64-byte signature, then the blockhash"""
+    def build(blockhash):
+        return b'\x01' + tag.encode().ljust(64, b'\0') + blockhash.encode()
+    return build
+
+
+def blockhash(value):
+    return BlockhashInfo(value, 100, 1, time.monotonic())
+
+
+def signed_with(prepared):
+    return base64.b64decode(prepared.payload)[65:].decode()
+
+
+def test_ready_prefers_the_presigned_template():
+    async def main():
+        pipeline = ExecutionPipeline(FakeRPC())
+        pipeline.blockhashes._latest = blockhash('first')
+        pipeline.arm('buy', builder('buy'))
+        prepared = await pipeline._ready('buy', None)
+        assert signed_with(prepared) == 'first'
+        assert prepared.signature == base58.b58encode(b'buy'.ljust(64, b'\0')).decode()
+        assert (pipeline.presigned_hits, pipeline.signed_on_demand) == (1, 0)
+        # The template was consumed with the send
+        assert not pipeline.is_armed('buy')
+        with pytest.raises(KeyError):
+            await pipeline._ready('buy', None)
+    asyncio.run(main())
+
+
+def test_ready_re_signs_a_template_on_an_old_blockhash():
+    async def main():
+        pipeline = ExecutionPipeline(FakeRPC())
+        pipeline.blockhashes._latest = blockhash('first')
+        pipeline.arm('sell', builder('sell'))
+        pipeline.blockhashes._latest = blockhash('second')
+        assert signed_with(await pipeline._ready('sell', None)) == 'second'
+        assert (pipeline.presigned_hits, pipeline.signed_on_demand) == (0, 1)
+    asyncio.run(main())
+
+
+def test_ready_fetches_a_blockhash_when_none_is_cached():
+    async def main():
+        rpc = FakeRPC()
+        pipeline = ExecutionPipeline(rpc)
+        prepared = await pipeline._ready(None, builder('manual'))
+        assert signed_with(prepared) == 'fetched'
+        assert prepared.blockhash.last_valid_block_height == 300
+        assert rpc.calls == ['getLatestBlockhash']
+    asyncio.run(main())
+
+
+def test_tracker_resolves_confirmed_failed_and_expired():
+    async def main():
+        rpc = FakeRPC([
+            {'value': [
+                {'confirmationStatus': 'confirmed', 'slot': 5, 'err': None},
+                {'confirmationStatus': 'processed', 'slot': 6, 'err': {'InstructionError': [0, 1]}},
+                None,
+                None,
+                {'confirmationStatus': 'processed', 'slot': 7, 'err': None},
+            ]},
+            150
+        ])
+        tracker = ConfirmationTracker(rpc)
+        futures = [tracker.track(sig, height) for sig, height in
+                   (('ok', 100), ('bad', 100), ('old', 100), ('young', 200), ('slow', 100))]
+        await tracker.poll_once()
+        assert rpc.calls == [['getSignatureStatuses', 'getBlockHeight']]
+        results = [f.result() if f.done() else None for f in futures]
+        assert [(r['status'], r['slot'], r['err']) for r in results[:3]] == [
+            ('confirmed', 5, None), ('failed', 6, {'InstructionError': [0, 1]}), ('expired', None, None)
+        ]
+        assert results[3:] == [None, None]
+        assert len(tracker) == 2
+        assert tracker.outcomes == {'confirmed': 1, 'failed': 1, 'expired': 1}
+    asyncio.run(main())
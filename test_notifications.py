@@ -0,0 +1,60 @@
+import asyncio
+
+from notifications import Notification, NotificationDispatcher, NotificationSink
+
+
+class RecordingSink(NotificationSink):
+    name = "recording"
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.batches = []
+
+    async def send(self, batch):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("sink down")
+        self.batches.append([n.message for n in batch])
+
+
+def notification(message):
+    return Notification('token', 'PRICE_DROP', 'HIGH', message)
+
+
+def dispatch(sink, messages, **kwargs):
+    async def main():
+        dispatcher = NotificationDispatcher([sink], batch_delay=0.01, backoff=0.01, **kwargs)
+        for message in messages:
+            dispatcher.publish(notification(message))
+        await asyncio.sleep(0.2)
+        stats = dispatcher.stats()[sink.name]
+        await dispatcher.stop()
+        return stats
+    return asyncio.run(main())
+
+
+def test_full_queue_drops_oldest():
+    sink = RecordingSink()
+    stats = dispatch(sink, ['a', 'b', 'c', 'd'], maxsize=2)
+    assert sink.batches == [['c', 'd']]
+    assert stats == {'queued': 0, 'sent': 2, 'failed': 0, 'dropped': 2, 'retries': 0}
+
+
+def test_failed_batch_is_retried():
+    sink = RecordingSink(failures=2)
+    stats = dispatch(sink, ['a', 'b'])
+    assert sink.batches == [['a', 'b']]
+    assert stats == {'queued': 0, 'sent': 2, 'failed': 0, 'dropped': 0, 'retries': 2}
+
+
+def test_batch_is_dropped_after_max_retries():
+    sink = RecordingSink(failures=5)
+    stats = dispatch(sink, ['a'], max_retries=1)
+    assert sink.batches == []
+    assert stats == {'queued': 0, 'sent': 0, 'failed': 1, 'dropped': 0, 'retries': 1}
+
+
+def test_batches_are_capped_at_batch_size():
+    sink = RecordingSink()
+    dispatch(sink, ['a', 'b', 'c'], batch_size=2)
+    assert sink.batches == [['a', 'b'], ['c']]
@@ -0,0 +1,34 @@
+import math
+
+import numpy as np
+
+from pair_health import detect_drops
+
+nan = math.nan
+
+
+def test_detect_drops_finds_fall_after_peak():
+    assert detect_drops([1, 2, 10, 9, 4, 4], 0.5, 3).tolist() == [2]
+
+
+def test_detect_drops_ignores_fall_outside_window():
+    assert detect_drops([1, 10, 9, 8, 7, 6, 2], 0.5, 3).tolist() == []
+
+
+def test_detect_drops_counts_fall_from_first_sample():
+    assert detect_drops([10, 2, 2], 0.5, 3).tolist() == [0]
+
+
+def test_detect_drops_reports_positions_in_input_with_nan():
+    assert detect_drops([nan, nan, nan, 5, 10, 2, 2], 0.5, 12).tolist() == [4]
+
+
+def test_detect_drops_does_not_compare_across_gaps():
+    # 10 -> gap -> 2 is not a measured fall; the run after the gap still is
+    assert detect_drops([10, nan, 2], 0.5, 12).tolist() == []
+    assert detect_drops([5, 10, nan, 8, 9, 1], 0.5, 12).tolist() == [4]
+
+
+def test_detect_drops_empty_and_all_missing():
+    assert len(detect_drops(np.array([]), 0.5, 3)) == 0
+    assert len(detect_drops([nan, nan], 0.5, 3)) == 0
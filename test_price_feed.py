@@ -0,0 +1,67 @@
+import asyncio
+import math
+
+import pytest
+
+from price_feed import PriceFeed
+
+TOKEN = 'token'
+
+
+class FakeDexClient:
+    def __init__(self):
+        self.prices = []
+
+    async def run_async(self, coro):
+        return await coro
+
+    async def get_token_pairs(self, tokens, concurrency, max_age):
+        price = self.prices.pop(0)
+        return {TOKEN: [{'priceUsd': price, 'liquidity': {'usd': 1000}}]}
+
+
+class BrokenCache:
+    def cache_price_data(self, token_address, price_data):
+        raise RuntimeError("database is locked")
+
+
+def run_polls(prices, cache=None):
+    """Poll intervals after each of ``prices`` and the updates a subscriber saw"""
+    async def main():
+        client = FakeDexClient()
+        client.prices = list(prices)
+        feed = PriceFeed(client, cache=cache, base_interval=5.0, min_interval=2.0,
+                         max_interval=60.0, target_move=0.005)
+        subscription = feed.subscribe(TOKEN, maxsize=len(prices))
+        # Drive polls by hand instead of through the polling task
+        await feed.stop()
+        loop = asyncio.get_running_loop()
+        intervals = []
+        for _ in prices:
+            await feed._poll([TOKEN], loop)
+            state = feed._tokens[TOKEN]
+            intervals.append(state.next_poll - loop.time())
+        updates = [subscription.queue.get_nowait().price for _ in range(subscription.queue.qsize())]
+        return intervals, updates
+    return asyncio.run(main())
+
+
+def test_interval_shrinks_on_moves_and_stretches_when_quiet():
+    intervals, updates = run_polls(['1.0', '1.0', str(math.exp(0.1))] + ['1.105'] * 13)
+    assert intervals[0] == pytest.approx(5.0, abs=0.05)
+    assert intervals[1] == pytest.approx(5 / 0.7, abs=0.05)
+    assert intervals[2] == pytest.approx(2.0, abs=0.05)
+    assert intervals[-2] < 60.0
+    assert intervals[-1] == pytest.approx(60.0, abs=0.05)
+    assert len(updates) == 16
+
+
+def test_missing_price_backs_off_to_max_interval():
+    intervals, updates = run_polls(['1.0', None])
+    assert intervals[1] == pytest.approx(60.0, abs=0.05)
+    assert updates == [1.0]
+
+
+def test_cache_failure_still_publishes():
+    intervals, updates = run_polls(['1.0', '2.0'], cache=BrokenCache())
+    assert updates == [1.0, 2.0]
@@ -0,0 +1,31 @@
+import math
+
+from risk_scoring import pairs_to_frame, score_pairs, score_risk
+
+PAIR = {'liquidity': {'usd': 500_000}, 'volume': {'h24': 50_000}, 'priceChange': {'h24': -20}}
+SENTIMENT = {'sentiment_volatility': 0.2, 'total_tweets': 500}
+
+
+def test_scores_match_the_single_pair_formula():
+    row = score_risk(pairs_to_frame([PAIR], [SENTIMENT])).iloc[0]
+    expected = (1 - 0.5) * 30 + (1 - 0.5) * 20 + 0.2 * 25 + 0.2 * 15 + (1 - 0.5) * 10
+    assert row['valid']
+    assert math.isclose(row['risk_score'], expected)
+
+
+def test_missing_sentiment_falls_back_to_full_risk():
+    for sentiment in ({}, {'sentiment_volatility': 0.2}, {'total_tweets': 'n/a', 'sentiment_volatility': 0.2}):
+        row = score_risk(pairs_to_frame([PAIR], [sentiment])).iloc[0]
+        assert not row['valid']
+        assert row['risk_score'] == 100.0
+
+
+def test_missing_liquidity_falls_back_to_full_risk():
+    row = score_risk(pairs_to_frame([{'volume': {'h24': 1}}], [SENTIMENT])).iloc[0]
+    assert row['risk_score'] == 100.0
+
+
+def test_score_pairs_without_sentiment_for_a_token():
+    scored = score_pairs({'a': PAIR, 'b': PAIR}, {'a': SENTIMENT})
+    assert scored.loc['a', 'valid'] and not scored.loc['b', 'valid']
+    assert scored.loc['b', 'risk_score'] == 100.0
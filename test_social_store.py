@@ -0,0 +1,25 @@
+from social_store import SocialMetricsStore
+
+
+def make_store(tmp_path):
+    return SocialMetricsStore(str(tmp_path / "social.db"), bucket_seconds=3600, min_refresh=0)
+
+
+def test_seen_post_updates_metrics_without_recounting(tmp_path):
+    store = make_store(tmp_path)
+    now = 7200.0
+    assert store.ingest("PEPE", "tiktok", [("v1", 3700.0, 0.0, 10, 100, 1)], "3700", now=now) == 1
+    assert store.ingest("PEPE", "tiktok", [("v1", 3700.0, 0.0, 25, 400, 3),
+                                           ("v2", 3800.0, 0.0, 5, 50, 0)], "3800", now=now) == 1
+    assert store.totals("PEPE", "tiktok", now=now) == (2, 0.0, 30.0, 450.0, 3.0)
+    store.close()
+
+
+def test_reweights_sentiment_when_engagement_changes(tmp_path):
+    store = make_store(tmp_path)
+    now = 7200.0
+    store.ingest("PEPE", "twitter", [("1", 3700.0, 0.5, 0, 0, 0)], "1", now=now)
+    store.ingest("PEPE", "twitter", [("1", 3700.0, 0.5, 1000, 0, 0)], "1", now=now)
+    posts, weighted, engagement, _, _ = store.totals("PEPE", "twitter", now=now)
+    assert (posts, weighted, engagement) == (1, 1.0, 1000.0)
+    store.close()
@@ -0,0 +1,40 @@
+from symbol_index import SymbolIndex
+
+
+def pair(address, symbol):
+    return {'pairAddress': address, 'baseToken': {'symbol': symbol}}
+
+
+def addresses(pairs):
+    return [p['pairAddress'] for p in pairs]
+
+
+def test_lookups_return_pairs_in_index_order():
+    index = SymbolIndex([pair('a', 'PEPE'), pair('b', 'pepe2'), pair('c', 'BONK'), pair('d', 'APE')])
+    assert addresses(index.exact('pepe')) == ['a']
+    assert addresses(index.prefix('pe')) == ['a', 'b']
+    assert addresses(index.search('PE')) == ['a', 'b', 'd']
+    assert addresses(index.search('EPE2')) == ['b']
+    assert addresses(index.search('')) == ['a', 'b', 'c', 'd']
+
+
+def test_sync_renames_and_removes_pairs():
+    index = SymbolIndex([pair('a', 'PEPE'), pair('b', 'BONK'), pair('c', 'PEPECOIN')])
+    index.sync([pair('c', 'WIF'), pair('d', 'PEPE'), pair('a', 'PEPE')])
+    assert len(index) == 3
+    assert addresses(index.search('PEPE')) == ['a', 'd']
+    assert addresses(index.prefix('B')) == []
+    assert addresses(index.search('BONK')) == []
+    assert addresses(index.search('W')) == ['c']
+    assert addresses(index.search('')) == ['a', 'c', 'd']
+
+
+def test_rename_back_and_forth_keeps_postings_consistent():
+    index = SymbolIndex([pair('a', 'PEPE'), pair('b', 'PEPE')])
+    index.update([pair('a', 'DOGE'), pair('a', 'PEPE2')])
+    assert addresses(index.exact('PEPE')) == ['b']
+    assert addresses(index.search('OG')) == []
+    assert addresses(index.search('PE')) == ['a', 'b']
+    index.remove(['b'])
+    assert addresses(index.search('P')) == ['a']
+    assert index.exact('PEPE') == []
@@ -0,0 +1,48 @@
+from trigger_book import TriggerBook
+
+
+def prices(levels):
+    return [level.price for level in levels]
+
+
+def pop_both(book, price):
+    buys, sells = book.pop_crossed(price)
+    return prices(buys), prices(sells)
+
+
+def test_pop_crossed_returns_nearest_level_first():
+    book = TriggerBook.from_levels(
+        buy=[{'price': 0.9, 'amount': 1}, {'price': 0.6, 'amount': 2}, {'price': 0.8, 'amount': 1}],
+        sell=[{'price': 1.5, 'amount': 1}, {'price': 2.0, 'amount': 3}]
+    )
+    assert pop_both(book, 1.0) == ([], [])
+    assert pop_both(book, 0.8) == ([0.9, 0.8], [])
+    assert pop_both(book, 2.5) == ([], [1.5, 2.0])
+    assert prices(book.levels('buy')) == [0.6]
+    assert len(book) == 1
+
+
+def test_from_levels_skips_unset_levels():
+    book = TriggerBook.from_levels(buy=[{'price': 0, 'amount': 1}, {'price': 1, 'amount': 0}], sell=[])
+    assert len(book) == 0
+
+
+def test_restore_rearms_a_popped_level():
+    book = TriggerBook()
+    level = book.add('sell', 2.0, 1)
+    book.add('sell', 3.0, 1)
+    assert pop_both(book, 2.0) == ([], [2.0])
+    book.restore(level)
+    assert prices(book.levels('sell')) == [3.0, 2.0]
+    assert pop_both(book, 3.0) == ([], [2.0, 3.0])
+    assert len(book) == 0
+
+
+def test_cancel_removes_only_the_given_level():
+    book = TriggerBook()
+    first = book.add('buy', 1.0, 1)
+    second = book.add('buy', 1.0, 2)
+    assert book.cancel(first.level_id)
+    assert not book.cancel(first.level_id)
+    buys, _ = book.pop_crossed(0.5)
+    assert [level.level_id for level in buys] == [second.level_id]
@@ -0,0 +1,93 @@
+import itertools
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+_level_ids = itertools.count(1)
+
+
+@dataclass
+class TriggerLevel:
+    side: str  # 'buy' or 'sell'
+    price: float
+    amount: float
+    level_id: int = 0
+
+
+class TriggerBook:
+    """Buy/sell trigger levels for one token, checked in O(log n + k) per price
+
+    A buy fires when the price falls to or below its level; a sell fires when
+    the price rises to or above it. Each side is kept sorted on a key chosen
+    so that the levels a price crosses form one run at the tail of the list
+    (buys by price, sells by negated price). A crossing check is then one
+    bisect plus a slice delete. Crossed levels are removed before they are
+    returned, so the caller never mutates a list it is iterating.
+    """
+
+    def __init__(self):
+        self._keys: Dict[str, List[float]] = {'buy': [], 'sell': []}
+        self._levels: Dict[str, List[TriggerLevel]] = {'buy': [], 'sell': []}
+        self._by_id: Dict[int, TriggerLevel] = {}
+
+    def __len__(self):
+        return len(self._by_id)
+
+    @staticmethod
+    def _key(level: TriggerLevel) -> float:
+        return level.price if level.side == 'buy' else -level.price
+
+    def add(self, side: str, price: float, amount: float) -> TriggerLevel:
+        if side not in self._keys:
+            raise ValueError(f"Unknown side: {side}")
+        level = TriggerLevel(side, float(price), float(amount), next(_level_ids))
+        self.restore(level)
+        return level
+
+    def restore(self, level: TriggerLevel):
+        """Re-arm a level, e.g. after its trade failed"""
+        keys, levels = self._keys[level.side], self._levels[level.side]
+        key = self._key(level)
+        i = bisect_right(keys, key)
+        keys.insert(i, key)
+        levels.insert(i, level)
+        self._by_id[level.level_id] = level
+
+    def cancel(self, level_id: int) -> bool:
+        level = self._by_id.pop(level_id, None)
+        if level is None:
+            return False
+        keys, levels = self._keys[level.side], self._levels[level.side]
+        key = self._key(level)
+        i = bisect_left(keys, key)
+        while levels[i].level_id != level_id:
+            i += 1
+        del keys[i], levels[i]
+        return True
+
+    def pop_crossed(self, price: float) -> Tuple[List[TriggerLevel], List[TriggerLevel]]:
+        """Remove and return the (buys, sells) crossed by ``price``, nearest level first"""
+        crossed = []
+        for side, key in (('buy', price), ('sell', -price)):
+            keys, levels = self._keys[side], self._levels[side]
+            i = bisect_left(keys, key)
+            hit = levels[i:]
+            del keys[i:], levels[i:]
+            for level in hit:
+                del self._by_id[level.level_id]
+            crossed.append(hit[::-1])
+        return crossed[0], crossed[1]
+
+    def levels(self, side: str) -> List[TriggerLevel]:
+        """Armed levels on one side, furthest from triggering first"""
+        return list(self._levels[side])
+
+    @classmethod
+    def from_levels(cls, buy: Iterable[Dict], sell: Iterable[Dict]) -> 'TriggerBook':
+        """Build a book from ``{'price': ..., 'amount': ...}`` dicts, skipping unset levels"""
+        book = cls()
+        for side, entries in (('buy', buy), ('sell', sell)):
+            for entry in entries:
+                if entry['price'] > 0 and entry['amount'] > 0:
+                    book.add(side, entry['price'], entry['amount'])
+        return book